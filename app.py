@@ -5,10 +5,15 @@ Flask web application for dynamic AI crew generation
 
 import os
 import json
-from flask import Flask, render_template, request, jsonify, session
+import uuid
+from flask import Flask, Response, render_template, request, jsonify, session, stream_with_context
 from dotenv import load_dotenv
-from crew_generator import MetaCrewSpawner
+from crew_generator import MetaCrewSpawner, EXECUTION_MODES
 from llm_selector import LLMSelector
+from job_queue import create_job_manager, run_crew_job, FINISHED_STATES, JOB_DEADLINE_EXCEEDED
+from batch import read_tasks
+from cache import TTLCache
+import metrics
 
 # Load environment variables
 load_dotenv()
@@ -20,6 +25,62 @@ app.secret_key = os.getenv('SECRET_KEY', 'meta-crew-spawner-secret-key-change-in
 spawner = MetaCrewSpawner()
 llm_selector = LLMSelector()
 
+# In-process worker pool, or a durable queue served by `main.py worker` (JOB_BACKEND)
+jobs = create_job_manager(lambda job: run_crew_job(spawner, job))
+
+# Analyses from /api/task-analysis, reusable by /api/process-task
+analysis_store = TTLCache(
+    max_size=int(os.getenv('ANALYSIS_STORE_SIZE', 1000)),
+    ttl=int(os.getenv('ANALYSIS_STORE_TTL', 900))
+)
+
+def read_task_request(data: dict):
+    """Validate a /api/process-task body; returns (fields, error message)"""
+    if not isinstance(data, dict):
+        return None, 'Request body must be a JSON object'
+    
+    task = data.get('task')
+    if not isinstance(task, str) or not task.strip():
+        return None, 'Task description is required'
+    task = task.strip()
+    
+    execution_mode = data.get('execution_mode')
+    if execution_mode and execution_mode not in EXECUTION_MODES:
+        return None, f'Unsupported execution mode: {execution_mode}'
+    
+    # Optional per-request budgets that size the crew, and a hard deadline
+    limits = {}
+    for name in ('latency_budget', 'cost_budget', 'timeout'):
+        if data.get(name) is not None:
+            try:
+                limits[name] = float(data[name])
+            except (TypeError, ValueError):
+                limits[name] = -1
+            if limits[name] <= 0:
+                return None, f'{name} must be a positive number'
+    
+    # Reuse the analysis from /api/task-analysis when it matches this task
+    analysis = None
+    stored = analysis_store.get(data.get('analysis_id')) if data.get('analysis_id') else None
+    if stored and stored['task'] == task:
+        analysis = stored['analysis']
+    
+    return {
+        'task': task,
+        'llm_provider': data.get('llm_provider', 'openai'),
+        'model': data.get('model', ''),
+        'execution_mode': execution_mode,
+        'limits': limits,
+        'analysis': analysis
+    }, None
+
+def wait_requested(data: dict) -> bool:
+    """Whether a process-task body asks to block until the crew finishes
+    
+    "async": true, from before queueing became the default, still wins.
+    """
+    return bool(data.get('wait')) and not data.get('async')
+
 @app.route('/')
 def index():
     """Main page with task input interface"""
@@ -37,52 +98,264 @@ def get_providers():
 
 @app.route('/api/process-task', methods=['POST'])
 def process_task():
-    """Process a natural language task and generate crew"""
+    """Process a natural language task and generate crew
+    
+    Answers 202 with the job id and a status_url (/api/jobs/<job_id>) to
+    poll or stream. With "wait": true the request blocks until the crew
+    finishes instead, holding a server worker for the whole run; a run
+    that exceeds its "timeout" then answers 504 with the outputs of the
+    tasks that finished.
+    """
     try:
-        data = request.get_json()
-        task = data.get('task', '').strip()
-        llm_provider = data.get('llm_provider', 'openai')
-        model = data.get('model', '')
+        data = request.get_json(silent=True)
+        fields, error = read_task_request(data)
         
-        if not task:
-            return jsonify({'success': False, 'error': 'Task description is required'}), 400
+        if error:
+            return jsonify({'success': False, 'error': error}), 400
         
         # Set LLM configuration for this session
-        session['llm_provider'] = llm_provider
-        session['model'] = model
+        session['llm_provider'] = fields['llm_provider']
+        session['model'] = fields['model']
+        
+        # Queue the task on the bounded worker pool
+        job = jobs.submit(
+            fields['task'], fields['llm_provider'], fields['model'],
+            analysis=fields['analysis'],
+            bypass_cache=bool(data.get('bypass_cache')),
+            execution_mode=fields['execution_mode'],
+            stream=bool(data.get('stream')),
+            **fields['limits']
+        )
         
-        # Configure spawner with selected LLM
-        spawner.configure_llm(llm_provider, model)
+        if not wait_requested(data):
+            return jsonify({
+                'success': True,
+                'job_id': job.id,
+                'status': job.status,
+                'status_url': f'/api/jobs/{job.id}'
+            }), 202
         
-        # Process the task
-        result = spawner.process_task(task)
+        job = jobs.wait(job.id)
+        
+        if job.status == JOB_DEADLINE_EXCEEDED:
+            return jsonify({'success': False, **job.to_dict()}), 504
+        
+        if job.error:
+            raise Exception(job.error)
         
         return jsonify({
             'success': True,
-            'result': result,
-            'agents_created': spawner.get_last_agents_info(),
-            'execution_time': spawner.get_last_execution_time()
+            'job_id': job.id,
+            'result': job.result,
+            'agents_created': job.agents_created,
+            'execution_time': job.execution_time,
+            'timings': job.timings,
+            'metrics': job.metrics,
+            'plan': job.plan,
+            'cached': job.cached,
+            'wait_time': job.wait_time
         })
         
     except Exception as e:
         app.logger.error(f"Error processing task: {str(e)}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/batch', methods=['POST'])
+def process_batch():
+    """Run a batch of tasks, streaming JSONL records as each one completes
+    
+    The body is either JSON ({"tasks": [...], "concurrency": n}) with task
+    strings or objects, or JSONL with one task per line. Each task object
+    takes the /api/process-task fields; an invalid one gets a failed record.
+    Tasks go through the shared job queue, so MAX_CONCURRENT_CREWS still
+    applies.
+    """
+    if request.is_json:
+        data = request.get_json()
+        if not isinstance(data, dict) or not isinstance(data.get('tasks', []), list):
+            return jsonify({'success': False, 'error': 'Expected {"tasks": [...]}'}), 400
+        lines = [json.dumps(item) for item in data.get('tasks', [])]
+        concurrency = data.get('concurrency', jobs.max_workers)
+    else:
+        lines = request.get_data(as_text=True).splitlines()
+        concurrency = request.args.get('concurrency', jobs.max_workers)
+    
+    try:
+        concurrency = int(concurrency)
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'concurrency must be an integer'}), 400
+    
+    items = list(read_tasks(lines))
+    max_batch_size = int(os.getenv('MAX_BATCH_SIZE', 500))
+    
+    if not items:
+        return jsonify({'success': False, 'error': 'No tasks provided'}), 400
+    if len(items) > max_batch_size:
+        return jsonify({'success': False, 'error': f'Batch too large (max {max_batch_size} tasks)'}), 400
+    
+    concurrency = max(1, min(concurrency, jobs.max_workers))
+    
+    def record(item, job=None, error=None):
+        base = {'id': item['id'], 'task': item['task']}
+        if job is None:
+            return {**base, 'status': 'failed', 'error': error}
+        return {**base, **job.to_dict()}
+    
+    def generate():
+        pending = iter(items)
+        in_flight = {}
+        exhausted = False
+        
+        try:
+            while True:
+                # Keep at most `concurrency` jobs of this batch queued or running
+                while not exhausted and len(in_flight) < concurrency:
+                    item = next(pending, None)
+                    if item is None:
+                        exhausted = True
+                    else:
+                        # Items get the same checks and options as /api/process-task
+                        fields, error = (None, item['error']) if item.get('error') else read_task_request(item)
+                        if error:
+                            yield json.dumps(record(item, error=error)) + '\n'
+                            continue
+                        
+                        job = jobs.submit(
+                            fields['task'], fields['llm_provider'], fields['model'],
+                            analysis=fields['analysis'],
+                            bypass_cache=bool(item.get('bypass_cache')),
+                            execution_mode=fields['execution_mode'],
+                            **fields['limits']
+                        )
+                        in_flight[job.id] = item
+                
+                if not in_flight:
+                    return
+                
+                job = next(jobs.as_completed(list(in_flight)))
+                item = in_flight.pop(job.id)
+                yield json.dumps(record(item, job), default=str) + '\n'
+        
+        except GeneratorExit:
+            # Client went away: don't keep spending on the rest of the batch
+            for job_id in in_flight:
+                jobs.cancel(job_id)
+            raise
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """Get status and result of a queued job"""
+    job = jobs.get(job_id)
+    
+    if not job:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    
+    return jsonify({'success': True, **job.to_dict()})
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a job
+    
+    Queued jobs never start. A running crew stops before its next agent
+    step or LLM call, which frees its worker for the next job.
+    """
+    job = jobs.cancel(job_id)
+    
+    if not job:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    
+    return jsonify({'success': True, 'cancel_requested': job.cancel_event.is_set(), **job.to_dict()})
+
+@app.route('/api/jobs/<job_id>/events')
+def stream_job_events(job_id):
+    """Stream job progress as Server-Sent Events
+    
+    Events: job_started, analysis_complete, crew_built, task_started,
+    agent_step, token (when submitted with "stream": true), task_completed,
+    result (or deadline_exceeded) and job_finished. With ?cancel_on_disconnect=1 the crew is
+    cancelled when the client goes away.
+    """
+    job = jobs.get(job_id)
+    
+    if not job:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    
+    cancel_on_disconnect = request.args.get('cancel_on_disconnect', '').lower() in ('1', 'true')
+    # Resume after the last event the client saw; a malformed id replays from the start
+    try:
+        start = max(0, int(request.headers.get('Last-Event-ID', -1)) + 1)
+    except ValueError:
+        start = 0
+    
+    def generate():
+        try:
+            for event in job.events.iter_events(start=start):
+                if event is None:
+                    yield ': keep-alive\n\n'
+                    continue
+                yield f"id: {event['seq']}\nevent: {event['type']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+        except GeneratorExit:
+            if cancel_on_disconnect and job.status not in FINISHED_STATES:
+                jobs.cancel(job.id)
+            raise
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/stats')
+def get_stats():
+    """Get job queue, cache, LLM client and provider health statistics"""
+    return jsonify({
+        'success': True,
+        'jobs': jobs.get_stats(),
+        'llm_clients': spawner.llm_selector.get_client_cache_stats(),
+        'agent_pool': spawner.agent_pool.get_stats(),
+        'crew_blueprints': spawner.blueprints.get_stats(),
+        'agent_templates': spawner.agent_templates.registry.get_stats(),
+        'llm_providers': spawner.llm_selector.router.get_stats(),
+        'rate_limits': spawner.llm_selector.router.limiter.get_stats(),
+        'llm_memo': spawner.llm_selector.router.memo.get_stats(),
+        'analysis_store': analysis_store.get_stats(),
+        'analysis_cache': spawner.task_parser.cache.get_stats() if spawner.task_parser.cache else None,
+        'result_cache': spawner.result_cache.get_stats() if spawner.result_cache else None
+    })
+
+@app.route('/metrics')
+def get_metrics():
+    """Stage, agent and LLM latency, token and cost metrics in the Prometheus text format"""
+    return Response(metrics.registry.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/api/task-analysis', methods=['POST'])
 def analyze_task():
-    """Analyze task and suggest agent configuration"""
+    """Analyze task and suggest agent configuration
+    
+    With "details": true the LLM analysis (requirements, skills,
+    deliverables...) is always run and returned under "details".
+    """
     try:
         data = request.get_json()
         task = data.get('task', '').strip()
+        llm_provider = data.get('llm_provider')
+        model = data.get('model', '')
         
         if not task:
             return jsonify({'success': False, 'error': 'Task description is required'}), 400
         
-        analysis = spawner.analyze_task(task)
+        context = spawner.create_context(llm_provider, model) if llm_provider else None
+        analysis = spawner.analyze_task(task, context, details=bool(data.get('details')))
+        
+        analysis_id = uuid.uuid4().hex
+        analysis_store.set(analysis_id, {'task': task, 'analysis': analysis})
         
         return jsonify({
             'success': True,
-            'analysis': analysis
+            'analysis': analysis,
+            'analysis_id': analysis_id
         })
         
     except Exception as e:
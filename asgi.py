@@ -0,0 +1,189 @@
+"""
+Meta-Crew Spawner - ASGI Interface
+Serves crews and task analyses on the event loop; every other route runs the Flask app
+"""
+
+import os
+import json
+import time
+import uuid
+import asyncio
+from typing import Dict, Any, Optional, Tuple
+
+from asgiref.wsgi import WsgiToAsgi
+
+from app import app as flask_app, spawner, analysis_store, read_task_request, wait_requested
+from job_queue import get_max_concurrent_crews
+
+wsgi_app = WsgiToAsgi(flask_app)
+
+# Crews awaited on the event loop, capped by MAX_CONCURRENT_CREWS like the job queue's workers
+crew_slots = asyncio.Semaphore(get_max_concurrent_crews())
+
+async def app(scope: Dict[str, Any], receive, send):
+    """ASGI entry point (uvicorn asgi:app)
+    
+    POST /api/process-task with "wait": true and POST /api/task-analysis
+    await the spawner's async API, so waiting clients don't hold a
+    thread; at most MAX_CONCURRENT_CREWS of these crews run at once and
+    one whose client disconnects is cancelled. Everything else, including
+    queued and streamed process-task jobs and the job API, is handed to
+    Flask.
+    """
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    
+    route = (scope.get('method'), scope.get('path'))
+    if scope['type'] != 'http' or route not in NATIVE_ROUTES:
+        await wsgi_app(scope, receive, send)
+        return
+    
+    body = await _read_body(receive)
+    try:
+        data = json.loads(body or b'null')
+    except ValueError:
+        data = None
+    
+    if not isinstance(data, dict):
+        await _send_json(send, 400, {'success': False, 'error': 'Request body must be a JSON object'})
+        return
+    
+    if route == ('POST', '/api/process-task') and (not wait_requested(data) or data.get('stream')):
+        # Queued jobs stay on the Flask job API, as do streamed ones: tokens go to the job's event stream
+        await wsgi_app(scope, _replay(body, receive), send)
+        return
+    
+    status, payload = await _run_until_disconnect(NATIVE_ROUTES[route](data), receive)
+    if status is not None:
+        await _send_json(send, status, payload)
+
+async def process_task(data: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+    """Run a crew to completion; same body and response as the Flask route"""
+    fields, error = read_task_request(data)
+    if error:
+        return 400, {'success': False, 'error': error}
+    
+    submitted_at = time.time()
+    try:
+        async with crew_slots:
+            wait_time = time.time() - submitted_at
+            context = spawner.create_context(
+                fields['llm_provider'], fields['model'], fields['execution_mode'], **fields['limits']
+            )
+            crew_result = await spawner.aprocess_task(
+                fields['task'], context, analysis=fields['analysis'], use_cache=not data.get('bypass_cache')
+            )
+    except Exception as e:
+        flask_app.logger.error(f"Error processing task: {str(e)}")
+        return 500, {'success': False, 'error': str(e)}
+    
+    if crew_result.status != 'completed':
+        return 504, {'success': False, **crew_result.to_dict()}
+    
+    result = crew_result.to_dict()
+    return 200, {
+        'success': True,
+        'result': result['result'],
+        'agents_created': result['agents_created'],
+        'execution_time': result['execution_time'],
+        'timings': result['timings'],
+        'metrics': result['metrics'],
+        'plan': result['plan'],
+        'cached': result['cached'],
+        'wait_time': wait_time
+    }
+
+async def analyze_task(data: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+    """Analyze a task; same body and response as the Flask route"""
+    task = (data.get('task') or '').strip()
+    llm_provider = data.get('llm_provider')
+    
+    if not task:
+        return 400, {'success': False, 'error': 'Task description is required'}
+    
+    try:
+        context = spawner.create_context(llm_provider, data.get('model', '')) if llm_provider else None
+        analysis = await spawner.aanalyze_task(task, context, details=bool(data.get('details')))
+    except Exception as e:
+        return 500, {'success': False, 'error': str(e)}
+    
+    analysis_id = uuid.uuid4().hex
+    analysis_store.set(analysis_id, {'task': task, 'analysis': analysis})
+    
+    return 200, {'success': True, 'analysis': analysis, 'analysis_id': analysis_id}
+
+NATIVE_ROUTES = {
+    ('POST', '/api/process-task'): process_task,
+    ('POST', '/api/task-analysis'): analyze_task
+}
+
+async def _run_until_disconnect(handler, receive) -> Tuple[Optional[int], Optional[Dict[str, Any]]]:
+    """Await a handler, cancelling it if the client disconnects first"""
+    work = asyncio.ensure_future(handler)
+    disconnect = asyncio.ensure_future(_wait_for_disconnect(receive))
+    
+    try:
+        await asyncio.wait((work, disconnect), return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        disconnect.cancel()
+        if not work.done():
+            # aprocess_task stops the crew at its next agent step or LLM call
+            work.cancel()
+            await asyncio.wait((work,))
+    
+    if work.cancelled():
+        return None, None
+    return work.result()
+
+async def _wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            break
+    return b''.join(chunks)
+
+def _replay(body: bytes, receive):
+    """receive that yields an already-read body before the rest of the connection's messages"""
+    sent = False
+    
+    async def replay():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+        return await receive()
+    
+    return replay
+
+async def _send_json(send, status: int, payload: Dict[str, Any]):
+    body = json.dumps(payload, default=str).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+if __name__ == '__main__':
+    import uvicorn
+    
+    port = int(os.getenv('PORT', 5000))
+    uvicorn.run(app, host='0.0.0.0', port=port)
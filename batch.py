@@ -0,0 +1,124 @@
+"""
+Batch Runner - Bulk task execution
+Runs JSONL task batches with bounded concurrency and resumable output
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, Any, Iterable, Iterator, Optional, Set, TextIO
+
+def read_tasks(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Parse JSONL task lines
+    
+    Each line is either an object with a "task" key (plus optional "id",
+    "llm_provider", "model", "execution_mode", "latency_budget",
+    "cost_budget", "timeout") or a bare JSON string.
+    Tasks without an id are numbered by line.
+    """
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield {'id': str(line_number), 'task': '', 'error': f'Invalid JSON: {e}'}
+            continue
+        
+        if isinstance(item, str):
+            item = {'task': item}
+        if not isinstance(item, dict):
+            yield {'id': str(line_number), 'task': '', 'error': 'Expected a JSON object or string'}
+            continue
+        
+        item['id'] = str(item.get('id', line_number))
+        item['task'] = str(item.get('task', '')).strip()
+        yield item
+
+def load_completed_ids(output_file: TextIO) -> Set[str]:
+    """Ids of tasks that already completed in a previous (partial) output file"""
+    completed = set()
+    
+    for line in output_file:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            # A crash can leave a truncated last line; that task simply reruns
+            continue
+        if isinstance(record, dict) and record.get('status') == 'completed':
+            completed.add(str(record.get('id')))
+    
+    return completed
+
+class BatchRunner:
+    """Runs many tasks through one MetaCrewSpawner with bounded concurrency"""
+    
+    def __init__(self, spawner, concurrency: int = 4):
+        self.spawner = spawner
+        self.concurrency = max(1, concurrency)
+    
+    def run(self, tasks: Iterable[Dict[str, Any]], skip_ids: Optional[Set[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield one result record per task, in completion order
+        
+        Tasks are pulled lazily so large inputs are never fully loaded.
+        """
+        skip_ids = skip_ids or set()
+        task_iter = (item for item in tasks if item['id'] not in skip_ids)
+        
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='batch-worker') as executor:
+            in_flight = set()
+            
+            for item in task_iter:
+                in_flight.add(executor.submit(self.run_one, item))
+                
+                if len(in_flight) >= self.concurrency:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+    
+    def run_one(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Run a single task and turn the outcome into a record"""
+        record = {
+            'id': item['id'],
+            'task': item['task'],
+            'llm_provider': item.get('llm_provider'),
+            'model': item.get('model') or None
+        }
+        
+        if item.get('error') or not item['task']:
+            return {**record, 'status': 'failed', 'error': item.get('error') or 'Task description is required'}
+        
+        try:
+            record['llm_provider'] = record['llm_provider'] or self._default_provider()
+            
+            # Every task gets its own context; the spawner itself is shared
+            context = self.spawner.create_context(
+                record['llm_provider'], record['model'], item.get('execution_mode'),
+                latency_budget=item.get('latency_budget'), cost_budget=item.get('cost_budget'),
+                timeout=item.get('timeout')
+            )
+            crew_result = self.spawner.process_task(item['task'], context)
+            # status is "completed" or "deadline_exceeded"; only completed tasks are skipped on --resume
+            return {**record, **crew_result.to_dict()}
+        except Exception as e:
+            return {**record, 'status': 'failed', 'error': str(e)}
+    
+    def _default_provider(self) -> str:
+        return self.spawner.current_llm_provider or self.spawner.llm_selector.get_default_provider()
+
+def write_records(records: Iterable[Dict[str, Any]], output: TextIO) -> Dict[str, int]:
+    """Write records as JSONL, flushing each one; returns status counts"""
+    counts: Dict[str, int] = {}
+    
+    for record in records:
+        output.write(json.dumps(record, default=str) + '\n')
+        output.flush()
+        counts[record['status']] = counts.get(record['status'], 0) + 1
+    
+    return counts
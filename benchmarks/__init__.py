@@ -0,0 +1,4 @@
+"""
+Benchmarks - Performance checks for Meta-Crew Spawner
+Run from the repository root, e.g. python -m benchmarks.startup
+"""
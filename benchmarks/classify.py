@@ -0,0 +1,122 @@
+"""
+Classification Benchmark - Rule-based task classification throughput
+Compares the original substring scan with TaskParser.classify_many on a large corpus
+
+Usage: python -m benchmarks.classify [--tasks 100000] [--input FILE] [--repeat 3] [--output FILE]
+"""
+
+import sys
+import random
+import argparse
+from typing import Dict, Any, List
+
+from benchmarks.common import time_interleaved, emit_results
+from task_parser import TaskParser
+
+VERBS = ['research', 'write', 'analyze', 'plan', 'fix', 'design', 'evaluate', 'draft',
+         'investigate', 'optimize', 'brainstorm', 'compare', 'update', 'summarize', 'organize']
+SUBJECTS = ['marketing strategy', 'machine learning pipeline', 'AI assistant', 'data warehouse',
+            'wellness program', 'curriculum', 'sales forecast', 'software release', 'storytelling workshop',
+            'clinical study', 'finance dashboard', 'product launch', 'team schedule', 'art exhibition']
+QUALIFIERS = ['a quick', 'a detailed', 'an in-depth', 'a simple', 'a comprehensive', 'an advanced', 'a brief', 'the']
+TAILS = ['for our startup', 'for the next quarter', 'with clear recommendations',
+         'covering risks and opportunities', 'for a non-technical audience', 'and list the main challenges', '']
+FOLLOW_UPS = ['', '', 'Include a timeline and the key metrics to track.',
+              'Keep it practical and focus on what the team can do this month.',
+              'Compare at least three options and explain the trade-offs.',
+              'The audience is the executive team, so keep the language simple.']
+
+def generate_corpus(size: int, seed: int = 42) -> List[str]:
+    """Synthetic task descriptions shaped like real backlog entries"""
+    rng = random.Random(seed)
+    return [
+        f"{rng.choice(VERBS).capitalize()} {rng.choice(QUALIFIERS)} {rng.choice(SUBJECTS)} "
+        f"{rng.choice(TAILS)}. {rng.choice(FOLLOW_UPS)}".replace(' .', '.').strip()
+        for _ in range(size)
+    ]
+
+def legacy_classify(parser: TaskParser, task_description: str) -> Dict[str, Any]:
+    """The original first-match substring scan, kept here as the baseline and parity reference"""
+    task_lower = task_description.lower()
+    
+    task_type = 'general'
+    for t_type, keywords in parser.task_types.items():
+        if any(keyword in task_lower for keyword in keywords):
+            task_type = t_type
+            break
+    
+    complexity = 'medium'
+    for comp_level, indicators in parser.complexity_indicators.items():
+        if any(indicator in task_lower for indicator in indicators):
+            complexity = comp_level
+            break
+    
+    domain = 'general'
+    for dom, keywords in parser.domain_keywords.items():
+        if any(keyword in task_lower for keyword in keywords):
+            domain = dom
+            break
+    
+    word_count = len(task_description.split())
+    if complexity == 'simple' or word_count < 20:
+        estimated_time = '5-15 minutes'
+    elif complexity == 'complex' or word_count > 50:
+        estimated_time = '30-60 minutes'
+    else:
+        estimated_time = '15-30 minutes'
+    
+    return {
+        'task_type': task_type,
+        'complexity': complexity,
+        'domain': domain,
+        'estimated_time': estimated_time,
+        'word_count': word_count
+    }
+
+def changed_classifications(parser: TaskParser, corpus: List[str]) -> Dict[str, int]:
+    """Per field, how many tasks classify_many classifies differently from the legacy scan"""
+    changed = {'task_type': 0, 'complexity': 0, 'domain': 0}
+    for task, analysis in zip(corpus, parser.classify_many(corpus)):
+        baseline = legacy_classify(parser, task)
+        for field in changed:
+            if baseline[field] != analysis[field]:
+                changed[field] += 1
+    return changed
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Measure rule-based classification throughput')
+    parser.add_argument('--tasks', type=int, default=100000, help='Size of the synthetic corpus')
+    parser.add_argument('--input', help='Classify tasks from a file (one per line) instead')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per implementation')
+    parser.add_argument('--output', help='Also write the JSON report to this file')
+    args = parser.parse_args(argv)
+    
+    if args.input:
+        with open(args.input, 'r', encoding='utf-8') as f:
+            corpus = [line.strip() for line in f if line.strip()]
+    else:
+        corpus = generate_corpus(args.tasks)
+    
+    task_parser = TaskParser()
+    
+    timings = time_interleaved({
+        'legacy': lambda: [legacy_classify(task_parser, task) for task in corpus],
+        'classify_many': lambda: task_parser.classify_many(corpus)
+    }, args.repeat)
+    legacy, current = timings['legacy'], timings['classify_many']
+    changed = changed_classifications(task_parser, corpus)
+    
+    results: Dict[str, Any] = {
+        'tasks': len(corpus),
+        'legacy': {'seconds': legacy, 'tasks_per_second': len(corpus) / legacy['median']},
+        'classify_many': {'seconds': current, 'tasks_per_second': len(corpus) / current['median']},
+        'speedup': legacy['median'] / current['median'],
+        'changed_classifications': changed
+    }
+    
+    emit_results('classify', results, args.output)
+    # classify_many must classify exactly like the original rules
+    return 1 if any(changed.values()) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
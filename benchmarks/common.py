@@ -0,0 +1,73 @@
+"""
+Benchmark Helpers - Shared timing and reporting utilities
+Results are emitted as JSON so they can be tracked over time
+"""
+
+import os
+import json
+import time
+import platform
+import statistics
+import subprocess
+from typing import Dict, List, Any, Callable, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def environment_info() -> Dict[str, Any]:
+    """Describe the machine and code version a result was measured on"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'commit': commit,
+        'timestamp': time.time()
+    }
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Median, mean, min, max and p95 of timing samples (seconds)"""
+    ordered = sorted(samples)
+    return {
+        'median': statistics.median(ordered),
+        'mean': statistics.fmean(ordered),
+        'min': ordered[0],
+        'max': ordered[-1],
+        'p95': ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    }
+
+def time_call(func: Callable[[], Any], repeat: int = 5) -> Dict[str, float]:
+    """Run func repeatedly and summarize its wall-clock time"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+def time_interleaved(funcs: Dict[str, Callable[[], Any]], repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """time_call for several implementations, alternating runs so each sees the same machine load"""
+    samples: Dict[str, List[float]] = {name: [] for name in funcs}
+    for _ in range(repeat):
+        for name, func in funcs.items():
+            start = time.perf_counter()
+            func()
+            samples[name].append(time.perf_counter() - start)
+    return {name: summarize(values) for name, values in samples.items()}
+
+def emit_results(name: str, results: Dict[str, Any], output: Optional[str] = None):
+    """Print a benchmark report as JSON, optionally also writing it to a file"""
+    report = {'benchmark': name, 'environment': environment_info(), 'results': results}
+    text = json.dumps(report, indent=2, default=str)
+    
+    if output:
+        with open(output, 'w') as f:
+            f.write(text + '\n')
+    
+    print(text)
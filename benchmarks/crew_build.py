@@ -0,0 +1,113 @@
+"""
+Crew Build Benchmark - Per-request crew construction cost
+Compares building every Agent and Task from templates with precompiled blueprints and pooled agents
+
+Usage: python -m benchmarks.crew_build [--requests 200] [--repeat 3] [--output FILE]
+
+No API calls are made: crews are built around a fake chat model and never kicked off.
+"""
+
+import sys
+import argparse
+from typing import Dict, Any, List
+
+from benchmarks.common import time_call, emit_results
+from crew_generator import MetaCrewSpawner
+from execution_context import ExecutionContext
+
+TASKS = [
+    "Research the latest developments in quantum computing and analyze their impact on cybersecurity",
+    "Write a blog post about sustainable fashion trends for a non-technical audience",
+    "Create a comprehensive marketing strategy for a new eco-friendly product line",
+    "Analyze the sales data from last quarter and identify the main growth drivers",
+    "Plan a product launch for our mobile app including a timeline and key metrics",
+    "Brainstorm creative campaign ideas for a local art exhibition"
+]
+
+def legacy_build(spawner: MetaCrewSpawner, task_description: str, analysis: Dict[str, Any],
+                 context: ExecutionContext):
+    """The original per-request construction: template copies, new Agents and Tasks"""
+    from crewai import Agent, Task, Crew, Process
+    
+    agents = []
+    for agent_config in analysis.get('suggested_agents', []):
+        template = spawner.agent_templates.get_template(agent_config['type'])
+        agents.append(Agent(
+            role=template['role'],
+            goal=template['goal'],
+            backstory=template['backstory'],
+            llm=context.llm,
+            verbose=True,
+            allow_delegation=template.get('allow_delegation', False),
+            tools=spawner._get_agent_tools(agent_config['type']),
+            step_callback=spawner._step_callback(context, template['role'])
+        ))
+    
+    task_template = spawner.task_templates.get_template(analysis.get('task_type', 'general'))
+    subtasks = task_template['subtasks'][:len(agents)]
+    
+    tasks = []
+    for i, agent in enumerate(agents):
+        if i < len(subtasks):
+            description = f"{subtasks[i]['description']}\n\nOriginal request: {task_description}"
+            expected_output = subtasks[i]['expected_output']
+        else:
+            description = f"Support the team in completing: {task_description}"
+            expected_output = "A comprehensive contribution to the overall objective"
+        tasks.append(Task(description=description, expected_output=expected_output, agent=agent))
+    
+    return Crew(agents=agents, tasks=tasks, process=Process.sequential, verbose=True)
+
+def make_context(llm) -> ExecutionContext:
+    return ExecutionContext(provider='openai', model='gpt-4o', llm=llm)
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Measure per-request crew construction cost')
+    parser.add_argument('--requests', type=int, default=200, help='Crews built per timed run')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per implementation')
+    parser.add_argument('--output', help='Also write the JSON report to this file')
+    args = parser.parse_args(argv)
+    
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+    llm = FakeListChatModel(responses=['ok'])
+    
+    spawner = MetaCrewSpawner()
+    # Rule-based analysis only; the fake model can't answer the analysis prompt
+    spawner.task_parser.analysis_mode = 'rules'
+    requests: List[Any] = []
+    for i in range(args.requests):
+        task = TASKS[i % len(TASKS)]
+        analysis = spawner.analyze_task(task, make_context(llm))
+        requests.append((task, analysis))
+    
+    def run_legacy():
+        for task, analysis in requests:
+            legacy_build(spawner, task, analysis, make_context(llm))
+    
+    def run_blueprint():
+        for task, analysis in requests:
+            context = make_context(llm)
+            spawner.generate_crew(task, analysis, context)
+            spawner.release_crew(context)
+    
+    # Warm up imports and the blueprint/agent caches before timing
+    run_legacy()
+    run_blueprint()
+    
+    legacy = time_call(run_legacy, args.repeat)
+    blueprint = time_call(run_blueprint, args.repeat)
+    
+    results: Dict[str, Any] = {
+        'requests': args.requests,
+        'legacy': {'seconds': legacy, 'ms_per_request': legacy['median'] / args.requests * 1000},
+        'blueprint': {'seconds': blueprint, 'ms_per_request': blueprint['median'] / args.requests * 1000},
+        'speedup': legacy['median'] / blueprint['median'],
+        'agent_pool': spawner.agent_pool.get_stats(),
+        'crew_blueprints': spawner.blueprints.get_stats()
+    }
+    
+    emit_results('crew_build', results, args.output)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
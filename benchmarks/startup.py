@@ -0,0 +1,94 @@
+"""
+Startup Benchmark - Import-time budget for the entry points
+Imports each module in a fresh interpreter and fails when it exceeds its
+budget or eagerly loads CrewAI, LangChain or a provider SDK
+
+Usage: python -m benchmarks.startup [--repeat 5] [--budget app=800] [--output FILE]
+"""
+
+import sys
+import json
+import argparse
+import subprocess
+from typing import Dict, Any
+
+from benchmarks.common import REPO_ROOT, summarize, emit_results
+
+# Packages that must only load once a crew is built or an LLM is called
+HEAVY_PACKAGES = (
+    'crewai', 'langchain', 'langchain_core', 'langchain_openai', 'langchain_anthropic',
+    'langchain_groq', 'langchain_mistralai', 'openai', 'anthropic', 'groq', 'mistralai'
+)
+
+# Import-time budgets in milliseconds
+DEFAULT_BUDGETS_MS = {
+    'llm_selector': 100,
+    'task_parser': 150,
+    'crew_generator': 250,
+    'main': 400,
+    'app': 800
+}
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+heavy = sorted({{name.split('.')[0] for name in sys.modules}} & set({heavy!r}))
+print(json.dumps({{'seconds': elapsed, 'heavy': heavy}}))
+"""
+
+def measure_import(module: str, repeat: int) -> Dict[str, Any]:
+    """Import a module in fresh interpreters and collect timings"""
+    samples = []
+    heavy = []
+    
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY_PACKAGES)],
+            cwd=REPO_ROOT, capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else 'import failed'
+            return {'error': error}
+        
+        probe = json.loads(completed.stdout.strip().splitlines()[-1])
+        samples.append(probe['seconds'])
+        heavy = probe['heavy']
+    
+    return {'seconds': summarize(samples), 'heavy_imports': heavy}
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Check import time of the entry points against budgets')
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh interpreters per module')
+    parser.add_argument('--budget', action='append', default=[], metavar='MODULE=MS',
+                        help='Override a budget, e.g. --budget app=1000')
+    parser.add_argument('--output', help='Also write the JSON report to this file')
+    args = parser.parse_args(argv)
+    
+    budgets = dict(DEFAULT_BUDGETS_MS)
+    for override in args.budget:
+        module, _, ms = override.partition('=')
+        budgets[module] = float(ms)
+    
+    results = {}
+    failed = False
+    
+    for module, budget_ms in budgets.items():
+        result = measure_import(module, args.repeat)
+        result['budget_ms'] = budget_ms
+        
+        if 'error' in result:
+            result['ok'] = False
+        else:
+            result['median_ms'] = result['seconds']['median'] * 1000
+            result['ok'] = result['median_ms'] <= budget_ms and not result['heavy_imports']
+        
+        failed = failed or not result['ok']
+        results[module] = result
+    
+    emit_results('startup', results, args.output)
+    return 1 if failed else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,224 @@
+"""
+Benchmark Suite - End-to-end spawner benchmarks on the fake LLM provider
+Parser classification, agent suggestion, crew construction and process_task throughput (threads and asyncio)
+
+Usage: python -m benchmarks.suite [--only classify,suggest,crew_build,process_task,aprocess_task]
+           [--tasks 20000] [--requests 200] [--concurrency 1,4,8] [--latency 0.05]
+           [--min-classify-speedup 1.5] [--output FILE]
+
+No API keys are needed: ENABLE_FAKE_LLM is switched on and every crew runs
+against the deterministic fake provider. Sections whose dependencies are
+missing (CrewAI, LangChain) are reported as skipped. The classify section
+also times the legacy substring scan, and the suite exits with status 1
+when classify_many falls below --min-classify-speedup times its speed or
+classifies any task differently.
+"""
+
+import io
+import os
+import sys
+import time
+import asyncio
+import argparse
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List
+
+from benchmarks.common import summarize, time_call, time_interleaved, emit_results
+from benchmarks.classify import generate_corpus, legacy_classify, changed_classifications
+
+SECTIONS = ('classify', 'suggest', 'crew_build', 'process_task', 'aprocess_task')
+
+def bench_classify(spawner, args) -> Dict[str, Any]:
+    corpus = generate_corpus(args.tasks)
+    task_parser = spawner.task_parser
+    timings = time_interleaved({
+        'legacy': lambda: [legacy_classify(task_parser, task) for task in corpus],
+        'classify_many': lambda: task_parser.classify_many(corpus)
+    }, args.repeat)
+    
+    seconds = timings['classify_many']
+    speedup = timings['legacy']['min'] / seconds['min']
+    changed = changed_classifications(task_parser, corpus)
+    return {
+        'tasks': len(corpus),
+        'seconds': seconds,
+        'tasks_per_second': len(corpus) / seconds['median'],
+        'legacy_seconds': timings['legacy'],
+        'speedup_vs_legacy': speedup,
+        'min_speedup': args.min_classify_speedup,
+        'changed_classifications': changed,
+        'ok': speedup >= args.min_classify_speedup and not any(changed.values())
+    }
+
+def bench_suggest(spawner, args) -> Dict[str, Any]:
+    analyses = spawner.task_parser.classify_many(generate_corpus(args.tasks))
+    seconds = time_call(lambda: [spawner.agent_templates.suggest_agents(a) for a in analyses], args.repeat)
+    return {
+        'tasks': len(analyses),
+        'seconds': seconds,
+        'tasks_per_second': len(analyses) / seconds['median']
+    }
+
+def require_crew_dependencies():
+    """Raise ImportError early when CrewAI or LangChain is missing"""
+    import crewai
+    import fake_llm
+
+def bench_crew_build(spawner, args) -> Dict[str, Any]:
+    require_crew_dependencies()
+    tasks = generate_corpus(args.requests, seed=7)
+    analyses = spawner.task_parser.classify_many(tasks)
+    for analysis in analyses:
+        analysis['suggested_agents'] = spawner.agent_templates.suggest_agents(analysis)
+    
+    def build_all():
+        for task, analysis in zip(tasks, analyses):
+            context = spawner.create_context('fake')
+            spawner.generate_crew(task, analysis, context)
+            spawner.release_crew(context)
+    
+    with contextlib.redirect_stdout(io.StringIO()):
+        build_all()
+        seconds = time_call(build_all, args.repeat)
+    
+    return {
+        'requests': len(tasks),
+        'seconds': seconds,
+        'ms_per_request': seconds['median'] / len(tasks) * 1000,
+        'agent_pool': spawner.agent_pool.get_stats()
+    }
+
+def bench_process_task(spawner, args) -> Dict[str, Any]:
+    require_crew_dependencies()
+    results = {}
+    for concurrency in args.concurrency:
+        # Fresh tasks per level so the analysis cache doesn't flatter later runs
+        tasks = generate_corpus(args.requests, seed=100 + concurrency)
+        latencies: List[float] = []
+        errors = []
+        
+        def run(task):
+            start = time.perf_counter()
+            spawner.process_task(task, spawner.create_context('fake'))
+            return time.perf_counter() - start
+        
+        start_time = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = [executor.submit(run, task) for task in tasks]
+                for future in futures:
+                    try:
+                        latencies.append(future.result())
+                    except Exception as e:
+                        errors.append(str(e))
+        wall_time = time.perf_counter() - start_time
+        
+        results[str(concurrency)] = {
+            'requests': len(tasks),
+            'errors': len(errors),
+            'last_error': errors[-1] if errors else None,
+            'wall_seconds': wall_time,
+            'tasks_per_second': len(latencies) / wall_time if wall_time else 0,
+            'latency': summarize(latencies) if latencies else None
+        }
+    return results
+
+def bench_aprocess_task(spawner, args) -> Dict[str, Any]:
+    require_crew_dependencies()
+    results = {}
+    for concurrency in args.concurrency:
+        # One event loop; the level caps how many crews are in flight at once
+        tasks = generate_corpus(args.requests, seed=200 + concurrency)
+        latencies: List[float] = []
+        errors = []
+        
+        async def run_all():
+            slots = asyncio.Semaphore(concurrency)
+            
+            async def run(task):
+                async with slots:
+                    start = time.perf_counter()
+                    try:
+                        await spawner.aprocess_task(task, spawner.create_context('fake'))
+                        latencies.append(time.perf_counter() - start)
+                    except Exception as e:
+                        errors.append(str(e))
+            
+            await asyncio.gather(*(run(task) for task in tasks))
+        
+        start_time = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            asyncio.run(run_all())
+        wall_time = time.perf_counter() - start_time
+        
+        results[str(concurrency)] = {
+            'requests': len(tasks),
+            'errors': len(errors),
+            'last_error': errors[-1] if errors else None,
+            'wall_seconds': wall_time,
+            'tasks_per_second': len(latencies) / wall_time if wall_time else 0,
+            'latency': summarize(latencies) if latencies else None
+        }
+    return results
+
+BENCHMARKS = {
+    'classify': bench_classify,
+    'suggest': bench_suggest,
+    'crew_build': bench_crew_build,
+    'process_task': bench_process_task,
+    'aprocess_task': bench_aprocess_task
+}
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Run the spawner benchmark suite on the fake LLM provider')
+    parser.add_argument('--only', default=','.join(SECTIONS), help='Comma-separated sections to run')
+    parser.add_argument('--tasks', type=int, default=20000, help='Corpus size for classify and suggest')
+    parser.add_argument('--requests', type=int, default=50, help='Crews per crew_build run and concurrency level')
+    parser.add_argument('--concurrency', default='1,4,8', help='Comma-separated process_task/aprocess_task concurrency levels')
+    parser.add_argument('--latency', type=float, default=0.05, help='Fake LLM latency per call (seconds)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs for classify, suggest and crew_build')
+    parser.add_argument('--min-classify-speedup', type=float, default=1.5,
+                        help='Fail when classify_many is slower than this multiple of the legacy scan')
+    parser.add_argument('--output', help='Also write the JSON report to this file')
+    args = parser.parse_args(argv)
+    
+    sections = [section.strip() for section in args.only.split(',') if section.strip()]
+    unknown = [section for section in sections if section not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(unknown)}")
+    args.concurrency = [int(level) for level in args.concurrency.split(',')]
+    
+    os.environ['ENABLE_FAKE_LLM'] = 'True'
+    os.environ['FAKE_LLM_LATENCY'] = str(args.latency)
+    os.environ.setdefault('MAX_REQUESTS_PER_MINUTE', '0')
+    
+    from crew_generator import MetaCrewSpawner
+    spawner = MetaCrewSpawner()
+    
+    results: Dict[str, Any] = {
+        'settings': {
+            'latency': args.latency,
+            'jitter': float(os.getenv('FAKE_LLM_JITTER', 0)),
+            'tokens_per_second': float(os.getenv('FAKE_LLM_TOKENS_PER_SECOND', 0)),
+            'error_rate': float(os.getenv('FAKE_LLM_ERROR_RATE', 0)),
+            'analysis_mode': spawner.task_parser.analysis_mode
+        }
+    }
+    
+    for section in sections:
+        try:
+            results[section] = BENCHMARKS[section](spawner, args)
+        except ImportError as e:
+            results[section] = {'skipped': True, 'error': f'{type(e).__name__}: {e}'}
+    
+    emit_results('suite', results, args.output)
+    
+    failed = [section for section in sections if results[section].get('ok') is False]
+    if failed:
+        print(f"Regression in: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,235 @@
+"""
+Cache - Caching utilities
+Thread-safe in-memory and SQLite caches with per-entry expiry and hit/miss statistics
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Hashable
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a TTL"""
+    
+    def __init__(self, max_size: int = 1024, ttl: float = 3600):
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value, or the default if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            
+            if entry is None:
+                self._stats['misses'] += 1
+                return default
+            
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return default
+            
+            self._entries.move_to_end(key)
+            self._stats['hits'] += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value, evicting the least recently used entries if full"""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+    
+    def delete(self, key: Hashable):
+        """Remove a value if present"""
+        with self._lock:
+            self._entries.pop(key, None)
+    
+    def clear(self):
+        """Remove all values"""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get size and hit/miss statistics"""
+        with self._lock:
+            stats = dict(self._stats)
+            size = len(self._entries)
+        
+        lookups = stats['hits'] + stats['misses']
+        return {
+            **stats,
+            'size': size,
+            'max_size': self.max_size,
+            'ttl': self.ttl,
+            'hit_rate': stats['hits'] / lookups if lookups else 0,
+            'backend': 'memory'
+        }
+
+class SQLiteCache:
+    """Persistent cache stored in a SQLite file, survives restarts
+    
+    Values must be JSON-serializable. Several caches can share one file
+    by using different namespaces.
+    """
+    
+    def __init__(self, path: str, namespace: str = 'default', max_size: int = 10000, ttl: float = 3600):
+        self.path = path
+        self.namespace = namespace
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+        
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache_entries ('
+            'namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL, '
+            'expires_at REAL, accessed_at REAL NOT NULL, '
+            'PRIMARY KEY (namespace, key))'
+        )
+        self._conn.execute(
+            'CREATE INDEX IF NOT EXISTS cache_entries_accessed '
+            'ON cache_entries (namespace, accessed_at)'
+        )
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a value, or the default if missing or expired"""
+        now = time.time()
+        
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?',
+                (self.namespace, key)
+            ).fetchone()
+            
+            if row is None:
+                self._stats['misses'] += 1
+                return default
+            
+            value, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                self._conn.execute(
+                    'DELETE FROM cache_entries WHERE namespace = ? AND key = ?',
+                    (self.namespace, key)
+                )
+                self._stats['expirations'] += 1
+                self._stats['misses'] += 1
+                return default
+            
+            self._conn.execute(
+                'UPDATE cache_entries SET accessed_at = ? WHERE namespace = ? AND key = ?',
+                (now, self.namespace, key)
+            )
+            self._stats['hits'] += 1
+        
+        return json.loads(value)
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a value, evicting the least recently used entries if full"""
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        payload = json.dumps(value)
+        
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (self.namespace, key, payload, expires_at, now)
+            )
+            cursor = self._conn.execute(
+                'DELETE FROM cache_entries WHERE namespace = ? AND key IN ('
+                'SELECT key FROM cache_entries WHERE namespace = ? '
+                'ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+                (self.namespace, self.namespace, self.max_size)
+            )
+            self._stats['evictions'] += max(cursor.rowcount, 0)
+    
+    def delete(self, key: str):
+        """Remove a value if present"""
+        with self._lock:
+            self._conn.execute(
+                'DELETE FROM cache_entries WHERE namespace = ? AND key = ?',
+                (self.namespace, key)
+            )
+    
+    def clear(self):
+        """Remove all values in this namespace"""
+        with self._lock:
+            self._conn.execute('DELETE FROM cache_entries WHERE namespace = ?', (self.namespace,))
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                'SELECT COUNT(*) FROM cache_entries WHERE namespace = ?', (self.namespace,)
+            ).fetchone()[0]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get size and hit/miss statistics"""
+        with self._lock:
+            stats = dict(self._stats)
+        
+        lookups = stats['hits'] + stats['misses']
+        return {
+            **stats,
+            'size': len(self),
+            'max_size': self.max_size,
+            'ttl': self.ttl,
+            'hit_rate': stats['hits'] / lookups if lookups else 0,
+            'backend': 'sqlite',
+            'path': self.path
+        }
+
+def make_cache_key(*parts: Any) -> str:
+    """Build a stable cache key from JSON-serializable parts"""
+    raw = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+def cache_enabled() -> bool:
+    """Check the ENABLE_CACHE setting"""
+    return os.getenv('ENABLE_CACHE', 'True').lower() == 'true'
+
+def create_cache(namespace: str, ttl: float = None, max_size: int = None):
+    """Create a cache from the environment settings
+    
+    CACHE_BACKEND selects "memory" (default) or "sqlite"; CACHE_TTL,
+    CACHE_MAX_ENTRIES and CACHE_PATH configure it.
+    """
+    if ttl is None:
+        ttl = float(os.getenv('CACHE_TTL', 3600))
+    if max_size is None:
+        max_size = int(os.getenv('CACHE_MAX_ENTRIES', 1024))
+    
+    backend = os.getenv('CACHE_BACKEND', 'memory').lower()
+    
+    if backend == 'sqlite':
+        path = os.getenv('CACHE_PATH', 'meta_crew_cache.db')
+        return SQLiteCache(path, namespace=namespace, max_size=max_size, ttl=ttl)
+    
+    if backend != 'memory':
+        print(f"Warning: unknown CACHE_BACKEND {backend}, using memory")
+    
+    return TTLCache(max_size=max_size, ttl=ttl)
@@ -5,11 +5,17 @@ Provides templates for different types of AI agents
 
 from typing import Dict, List, Any
 
+from config.template_registry import TemplateRegistry
+
 class AgentTemplateManager:
-    """Manages agent templates for different use cases"""
+    """Manages agent templates for different use cases
+    
+    The built-in templates below can be extended or overridden with JSON
+    and YAML files (AGENT_TEMPLATE_DIRS), see TemplateRegistry.
+    """
     
-    def __init__(self):
-        self.templates = {
+    def __init__(self, template_dirs: List[str] = None):
+        builtin_templates = {
             'researcher': {
                 'role': 'Senior Research Analyst',
                 'goal': 'Conduct thorough research and gather comprehensive information on the given topic',
@@ -83,6 +89,8 @@ class AgentTemplateManager:
             }
         }
         
+        self.registry = TemplateRegistry(builtin_templates, template_dirs)
+        
         self.task_to_agents = {
             'research': ['researcher', 'analyst'],
             'content_creation': ['writer', 'creative'],
@@ -93,57 +101,63 @@ class AgentTemplateManager:
             'general': ['researcher', 'analyst']
         }
     
+    @property
+    def templates(self) -> Dict[str, Dict[str, Any]]:
+        """All agent templates, built-in and from files"""
+        return self.registry.snapshot.templates
+    
     def get_template(self, agent_type: str) -> Dict[str, Any]:
         """Get agent template by type"""
-        if agent_type not in self.templates:
+        templates = self.templates
+        if agent_type not in templates:
             raise ValueError(f"Unknown agent type: {agent_type}")
-        return self.templates[agent_type].copy()
+        return templates[agent_type].copy()
     
     def suggest_agents(self, task_analysis: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Suggest agents based on task analysis"""
+        """Suggest agents based on task analysis
+        
+        The task type's essential agents come first. Templates matching the
+        analysis's key_skills_needed (LLM analysis) or whose best_for names
+        the domain follow, then coordination and review for complex tasks.
+        """
         task_type = task_analysis.get('task_type', 'general')
         complexity = task_analysis.get('complexity', 'medium')
         domain = task_analysis.get('domain', 'general')
         
+        # Limit number of agents (max 4 for performance)
+        max_agents = 4 if complexity == 'complex' else 3
+        
         # Get base agents for task type
         base_agents = self.task_to_agents.get(task_type, ['researcher', 'analyst'])
+        available = self.templates
         
         suggested = []
+        chosen = set()
+        
+        def add(agent_type: str, priority: str, reason: str):
+            if agent_type not in chosen and agent_type in available:
+                chosen.add(agent_type)
+                suggested.append({'type': agent_type, 'priority': priority, 'reason': reason})
         
         # Add base agents
         for agent_type in base_agents:
-            suggested.append({
-                'type': agent_type,
-                'priority': 'high',
-                'reason': f'Essential for {task_type} tasks'
-            })
+            add(agent_type, 'high', f'Essential for {task_type} tasks')
+        
+        # Add the templates that best cover the skills the task needs
+        needed_skills = task_analysis.get('key_skills_needed')
+        if needed_skills:
+            for agent_type, _, matched in self.registry.rank_by_skills(needed_skills, max_agents, exclude=chosen):
+                add(agent_type, 'medium', f"Matches needed skills: {', '.join(matched)}")
         
         # Add domain-specific agents
-        if domain == 'creative' and 'creative' not in [a['type'] for a in suggested]:
-            suggested.append({
-                'type': 'creative',
-                'priority': 'medium',
-                'reason': 'Specialized for creative domain'
-            })
+        domain_agents = self.registry.best_for(domain)
+        for agent_type in sorted(domain_agents) if domain_agents else ():
+            add(agent_type, 'medium', f'Specialized for {domain} domain')
         
         # Add complexity-based agents
         if complexity == 'complex':
-            if 'coordinator' not in [a['type'] for a in suggested]:
-                suggested.append({
-                    'type': 'coordinator',
-                    'priority': 'medium',
-                    'reason': 'Needed for complex task coordination'
-                })
-            
-            if 'quality_assurance' not in [a['type'] for a in suggested]:
-                suggested.append({
-                    'type': 'quality_assurance',
-                    'priority': 'low',
-                    'reason': 'Quality validation for complex deliverables'
-                })
-        
-        # Limit number of agents (max 4 for performance)
-        max_agents = 4 if complexity == 'complex' else 3
+            add('coordinator', 'medium', 'Needed for complex task coordination')
+            add('quality_assurance', 'low', 'Quality validation for complex deliverables')
         
         # Sort by priority and take top agents
         priority_order = {'high': 3, 'medium': 2, 'low': 1}
@@ -166,10 +180,10 @@ class AgentTemplateManager:
         # Check for essential combinations
         if len(agent_types) > 1:
             # For multi-agent crews, ensure we have complementary skills
+            known_skills = self.registry.snapshot.skills
             skills = set()
             for agent_type in agent_types:
-                if agent_type in self.templates:
-                    skills.update(self.templates[agent_type]['skills'])
+                skills.update(known_skills.get(agent_type, ()))
             
             if len(skills) < 2:
                 return {
@@ -6,7 +6,12 @@ Provides templates for different types of tasks and workflows
 from typing import Dict, List, Any
 
 class TaskTemplateManager:
-    """Manages task templates for different use cases"""
+    """Manages task templates for different use cases
+    
+    Each subtask lists the indexes of the earlier subtasks it builds on in
+    'depends_on'. Parallel crews pass context only along these edges and
+    run independent subtasks concurrently.
+    """
     
     def __init__(self):
         self.templates = {
@@ -16,11 +21,13 @@ class TaskTemplateManager:
                 'subtasks': [
                     {
                         'description': 'Conduct comprehensive research on the given topic. Gather information from multiple reliable sources, verify facts, and compile findings.',
-                        'expected_output': 'A detailed research report with sources, key findings, and relevant data points'
+                        'expected_output': 'A detailed research report with sources, key findings, and relevant data points',
+                        'depends_on': []
                     },
                     {
                         'description': 'Analyze the research findings, identify patterns, trends, and key insights. Provide strategic recommendations based on the data.',
-                        'expected_output': 'An analytical summary with key insights, trends, and actionable recommendations'
+                        'expected_output': 'An analytical summary with key insights, trends, and actionable recommendations',
+                        'depends_on': [0]
                     }
                 ]
             },
@@ -31,11 +38,13 @@ class TaskTemplateManager:
                 'subtasks': [
                     {
                         'description': 'Research the topic and gather relevant information, examples, and supporting data for content creation.',
-                        'expected_output': 'Research brief with key information, target audience insights, and content requirements'
+                        'expected_output': 'Research brief with key information, target audience insights, and content requirements',
+                        'depends_on': []
                     },
                     {
                         'description': 'Create engaging, well-structured content based on the research. Ensure the content meets the specified requirements and resonates with the target audience.',
-                        'expected_output': 'High-quality content that meets all requirements and is ready for publication or use'
+                        'expected_output': 'High-quality content that meets all requirements and is ready for publication or use',
+                        'depends_on': [0]
                     }
                 ]
             },
@@ -46,11 +55,13 @@ class TaskTemplateManager:
                 'subtasks': [
                     {
                         'description': 'Gather and organize all relevant data, information, and materials needed for the analysis.',
-                        'expected_output': 'Organized dataset and information summary ready for analysis'
+                        'expected_output': 'Organized dataset and information summary ready for analysis',
+                        'depends_on': []
                     },
                     {
                         'description': 'Conduct thorough analysis, identify patterns, evaluate options, and provide evidence-based conclusions and recommendations.',
-                        'expected_output': 'Comprehensive analysis report with findings, conclusions, and actionable recommendations'
+                        'expected_output': 'Comprehensive analysis report with findings, conclusions, and actionable recommendations',
+                        'depends_on': [0]
                     }
                 ]
             },
@@ -61,15 +72,18 @@ class TaskTemplateManager:
                 'subtasks': [
                     {
                         'description': 'Analyze requirements, constraints, and objectives. Identify key stakeholders, resources, and success criteria.',
-                        'expected_output': 'Requirements analysis with clear objectives, constraints, and success criteria'
+                        'expected_output': 'Requirements analysis with clear objectives, constraints, and success criteria',
+                        'depends_on': []
                     },
                     {
                         'description': 'Develop a comprehensive strategic plan with timeline, milestones, resource allocation, and risk mitigation strategies.',
-                        'expected_output': 'Detailed strategic plan with timeline, milestones, resource requirements, and implementation roadmap'
+                        'expected_output': 'Detailed strategic plan with timeline, milestones, resource requirements, and implementation roadmap',
+                        'depends_on': [0]
                     },
                     {
                         'description': 'Coordinate plan implementation, monitor progress, and ensure all elements work together effectively.',
-                        'expected_output': 'Implementation framework with monitoring protocols and coordination guidelines'
+                        'expected_output': 'Implementation framework with monitoring protocols and coordination guidelines',
+                        'depends_on': [0]
                     }
                 ]
             },
@@ -80,11 +94,13 @@ class TaskTemplateManager:
                 'subtasks': [
                     {
                         'description': 'Analyze the problem, identify root causes, understand constraints, and define success criteria for solutions.',
-                        'expected_output': 'Problem analysis with root cause identification and solution requirements'
+                        'expected_output': 'Problem analysis with root cause identification and solution requirements',
+                        'depends_on': []
                     },
                     {
                         'description': 'Develop and evaluate multiple solution options. Select the best approach and create an implementation plan.',
-                        'expected_output': 'Solution recommendation with implementation plan, timeline, and expected outcomes'
+                        'expected_output': 'Solution recommendation with implementation plan, timeline, and expected outcomes',
+                        'depends_on': [0]
                     }
                 ]
             },
@@ -95,11 +111,13 @@ class TaskTemplateManager:
                 'subtasks': [
                     {
                         'description': 'Research inspiration, analyze requirements, and explore creative possibilities. Generate multiple creative concepts and ideas.',
-                        'expected_output': 'Creative brief with multiple concepts, inspiration sources, and initial ideas'
+                        'expected_output': 'Creative brief with multiple concepts, inspiration sources, and initial ideas',
+                        'depends_on': []
                     },
                     {
                         'description': 'Develop and refine the best creative concepts. Create detailed proposals with visual or written descriptions of the creative solution.',
-                        'expected_output': 'Refined creative solution with detailed descriptions, rationale, and implementation guidance'
+                        'expected_output': 'Refined creative solution with detailed descriptions, rationale, and implementation guidance',
+                        'depends_on': [0]
                     }
                 ]
             },
@@ -110,11 +128,13 @@ class TaskTemplateManager:
                 'subtasks': [
                     {
                         'description': 'Analyze the task requirements, gather necessary information, and plan the approach for completion.',
-                        'expected_output': 'Task analysis with clear understanding of requirements and planned approach'
+                        'expected_output': 'Task analysis with clear understanding of requirements and planned approach',
+                        'depends_on': []
                     },
                     {
                         'description': 'Execute the planned approach, complete the task objectives, and deliver the required outcomes.',
-                        'expected_output': 'Completed task deliverables that meet all specified requirements'
+                        'expected_output': 'Completed task deliverables that meet all specified requirements',
+                        'depends_on': [0]
                     }
                 ]
             }
@@ -159,8 +179,12 @@ class TaskTemplateManager:
                 return False
         
         # Check subtasks structure
-        for subtask in template['subtasks']:
+        for index, subtask in enumerate(template['subtasks']):
             if 'description' not in subtask or 'expected_output' not in subtask:
                 return False
+            
+            # Dependencies must point at earlier subtasks so the graph is acyclic
+            if any(not 0 <= dependency < index for dependency in subtask.get('depends_on', [])):
+                return False
         
         return True
@@ -0,0 +1,260 @@
+"""
+Template Registry - Agent templates loaded from files
+Indexes agent definitions by skill and best_for so agent selection stays fast with hundreds of templates
+"""
+
+import os
+import re
+import json
+import time
+import heapq
+import threading
+from functools import lru_cache
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Tuple, Callable, Iterable, FrozenSet
+
+TEMPLATE_EXTENSIONS = ('.json', '.yaml', '.yml')
+
+# Words too common to match skills on their own
+STOPWORDS = frozenset({'a', 'an', 'and', 'for', 'in', 'of', 'on', 'the', 'to', 'with'})
+
+@lru_cache(maxsize=4096)
+def normalize_term(term: str) -> str:
+    """Lowercase skill or best_for term with _ and - read as spaces"""
+    return ' '.join(re.sub(r'[_\-]+', ' ', str(term).lower()).split())
+
+def term_words(term: str) -> List[str]:
+    return [word for word in term.split() if word not in STOPWORDS and len(word) > 1]
+
+@dataclass(frozen=True)
+class TemplateSnapshot:
+    """Templates and their indexes as of one load; replaced as a whole on reload"""
+    templates: Dict[str, Dict[str, Any]]
+    skills: Dict[str, FrozenSet[str]]
+    skill_index: Dict[str, FrozenSet[str]]
+    skill_word_index: Dict[str, FrozenSet[str]]
+    best_for_index: Dict[str, FrozenSet[str]]
+    sources: Dict[str, str] = field(default_factory=dict)
+
+def build_snapshot(templates: Dict[str, Dict[str, Any]], sources: Dict[str, str] = None) -> TemplateSnapshot:
+    """Index templates by normalized skill, skill word and best_for term"""
+    skills = {}
+    skill_index = defaultdict(set)
+    skill_word_index = defaultdict(set)
+    best_for_index = defaultdict(set)
+    
+    for agent_type, template in templates.items():
+        terms = frozenset(normalize_term(skill) for skill in template.get('skills', []))
+        skills[agent_type] = terms
+        for term in terms:
+            skill_index[term].add(agent_type)
+            for word in term_words(term):
+                skill_word_index[word].add(agent_type)
+        for term in template.get('best_for', []):
+            best_for_index[normalize_term(term)].add(agent_type)
+    
+    return TemplateSnapshot(
+        templates=templates,
+        skills=skills,
+        skill_index={term: frozenset(types) for term, types in skill_index.items()},
+        skill_word_index={word: frozenset(types) for word, types in skill_word_index.items()},
+        best_for_index={term: frozenset(types) for term, types in best_for_index.items()},
+        sources=sources or {}
+    )
+
+def validate_template(agent_type: str, template: Any) -> Dict[str, Any]:
+    """Checked copy of a template definition; raises ValueError when it can't be used"""
+    if not isinstance(template, dict):
+        raise ValueError(f"Agent template {agent_type} must be a mapping")
+    
+    missing = [key for key in ('role', 'goal', 'backstory') if not template.get(key)]
+    if missing:
+        raise ValueError(f"Agent template {agent_type} is missing {', '.join(missing)}")
+    
+    for key in ('skills', 'best_for'):
+        values = template.get(key, [])
+        if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+            raise ValueError(f"Agent template {agent_type}: {key} must be a list of strings")
+    
+    return {
+        'role': str(template['role']),
+        'goal': str(template['goal']),
+        'backstory': str(template['backstory']),
+        'allow_delegation': bool(template.get('allow_delegation', False)),
+        'skills': list(template.get('skills', [])),
+        'best_for': list(template.get('best_for', []))
+    }
+
+def read_template_file(path: str) -> Dict[str, Dict[str, Any]]:
+    """Agent templates defined in one JSON or YAML file
+    
+    A file holds either a mapping of agent type to template, or a list of
+    templates that each name their agent type under "type".
+    """
+    with open(path, encoding='utf-8') as handle:
+        if path.endswith('.json'):
+            data = json.load(handle)
+        else:
+            import yaml
+            data = yaml.safe_load(handle)
+    
+    if isinstance(data, list):
+        entries = []
+        for template in data:
+            if not isinstance(template, dict) or not template.get('type'):
+                raise ValueError("Templates in a list need a \"type\"")
+            entries.append((str(template['type']), template))
+    elif isinstance(data, dict):
+        entries = [(str(agent_type), template) for agent_type, template in data.items()]
+    else:
+        raise ValueError("Expected a mapping or a list of agent templates")
+    
+    return {agent_type: validate_template(agent_type, template) for agent_type, template in entries}
+
+class TemplateRegistry:
+    """Built-in agent templates plus definitions from template directories
+    
+    AGENT_TEMPLATE_DIRS lists directories (os.pathsep-separated) of JSON
+    and YAML files, read in name order; file templates override built-ins
+    of the same type. Every load builds inverted indexes (skill, skill
+    word and best_for term to agent types), so ranking only touches
+    templates that share a term with the request. With
+    TEMPLATE_RELOAD_INTERVAL > 0 the directories are rechecked at most
+    that often on access and reloaded when a file changed; a file that
+    fails to load is skipped with a warning.
+    """
+    
+    def __init__(self, builtin_templates: Dict[str, Dict[str, Any]], template_dirs: Iterable[str] = None,
+                 reload_interval: float = None):
+        if template_dirs is None:
+            template_dirs = [path for path in os.getenv('AGENT_TEMPLATE_DIRS', '').split(os.pathsep) if path]
+        if reload_interval is None:
+            reload_interval = float(os.getenv('TEMPLATE_RELOAD_INTERVAL', 5))
+        
+        self.builtin_templates = {
+            agent_type: validate_template(agent_type, template)
+            for agent_type, template in builtin_templates.items()
+        }
+        self.template_dirs = list(template_dirs)
+        self.reload_interval = reload_interval
+        
+        for directory in self.template_dirs:
+            if not os.path.isdir(directory):
+                print(f"Warning: agent template directory {directory} not found")
+        
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[], None]] = []
+        self._signature: Tuple = ()
+        self._next_check = 0.0
+        self._stats = {'reloads': 0, 'errors': 0, 'loaded_at': 0.0}
+        self._snapshot = self._load()
+    
+    @property
+    def snapshot(self) -> TemplateSnapshot:
+        """Current templates and indexes, reloading first if a template file changed"""
+        if self.reload_interval > 0 and self.template_dirs and time.monotonic() >= self._next_check:
+            self.check_for_changes()
+        return self._snapshot
+    
+    def on_reload(self, listener: Callable[[], None]):
+        """Call listener after every reload, e.g. to drop crews compiled from old templates"""
+        self._listeners.append(listener)
+    
+    def check_for_changes(self) -> bool:
+        """Reload when template files were added, removed or modified; returns whether it reloaded"""
+        with self._lock:
+            self._next_check = time.monotonic() + self.reload_interval
+            if self._file_signature() == self._signature:
+                return False
+        self.reload()
+        return True
+    
+    def reload(self):
+        """Reread all template directories and swap in the new templates and indexes"""
+        snapshot = self._load()
+        with self._lock:
+            self._snapshot = snapshot
+            self._stats['reloads'] += 1
+        
+        for listener in self._listeners:
+            listener()
+    
+    def rank_by_skills(self, needed_skills: Iterable[str], limit: int,
+                       exclude: Iterable[str] = ()) -> List[Tuple[str, float, List[str]]]:
+        """Best limit agent types for the needed skills: (type, score, matched skills)
+        
+        An exact skill match scores 1 and a shared word (e.g. "data analysis"
+        and "analysis") 0.5; ties go to the agent type that sorts first.
+        """
+        snapshot = self.snapshot
+        excluded = set(exclude)
+        scores: Dict[str, float] = defaultdict(float)
+        matched: Dict[str, List[str]] = defaultdict(list)
+        
+        for skill in needed_skills:
+            term = normalize_term(skill)
+            exact = snapshot.skill_index.get(term, frozenset())
+            partial = set()
+            for word in term_words(term):
+                partial.update(snapshot.skill_word_index.get(word, ()))
+            
+            for agent_type in exact | partial:
+                if agent_type in excluded:
+                    continue
+                scores[agent_type] += 1.0 if agent_type in exact else 0.5
+                matched[agent_type].append(skill)
+        
+        best = heapq.nlargest(limit, sorted(scores.items()), key=lambda item: item[1])
+        return [(agent_type, score, matched[agent_type]) for agent_type, score in best]
+    
+    def best_for(self, term: str) -> FrozenSet[str]:
+        """Agent types whose best_for includes term"""
+        return self.snapshot.best_for_index.get(normalize_term(term), frozenset())
+    
+    def get_stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        with self._lock:
+            stats = dict(self._stats)
+        return {
+            **stats,
+            'templates': len(snapshot.templates),
+            'from_files': len(snapshot.sources),
+            'skills': len(snapshot.skill_index),
+            'best_for_terms': len(snapshot.best_for_index),
+            'template_dirs': self.template_dirs
+        }
+    
+    def _load(self) -> TemplateSnapshot:
+        templates = dict(self.builtin_templates)
+        sources = {}
+        signature = self._file_signature()
+        
+        for path, _ in signature:
+            try:
+                loaded = read_template_file(path)
+            except Exception as e:
+                print(f"Warning: skipping agent template file {path}: {e}")
+                with self._lock:
+                    self._stats['errors'] += 1
+                continue
+            
+            templates.update(loaded)
+            sources.update({agent_type: path for agent_type in loaded})
+        
+        with self._lock:
+            self._signature = signature
+            self._stats['loaded_at'] = time.time()
+        return build_snapshot(templates, sources)
+    
+    def _file_signature(self) -> Tuple:
+        """(path, mtime) of every template file, in load order"""
+        files = []
+        for directory in self.template_dirs:
+            if not os.path.isdir(directory):
+                continue
+            for name in sorted(os.listdir(directory)):
+                path = os.path.join(directory, name)
+                if name.endswith(TEMPLATE_EXTENSIONS) and os.path.isfile(path):
+                    files.append((path, os.path.getmtime(path)))
+        return tuple(files)
@@ -0,0 +1,126 @@
+"""
+Context Compactor - Prompt budget for task outputs handed between agents
+Trims or summarizes earlier task outputs so later prompts stop growing with every step
+"""
+
+import os
+import re
+from typing import List, Tuple
+
+from rate_limiter import estimate_tokens
+
+# off: hand outputs on unchanged; extractive: keep lead sentences; summary: cheap-model summary
+COMPACTION_MODES = ('off', 'extractive', 'summary')
+
+SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+')
+
+def extractive_trim(text: str, budget_tokens: int) -> str:
+    """Keep the most informative sentences of text within budget_tokens
+    
+    The first sentence of every line (headings, bullets, paragraph leads)
+    is kept first, earliest lines winning, then the remaining sentences in
+    document order. Kept sentences stay in their original order and
+    dropped stretches are marked with [...].
+    """
+    if estimate_tokens(text) <= budget_tokens:
+        return text
+    
+    lines = [line.strip() for line in text.splitlines()]
+    footer = f"\n[Condensed from about {estimate_tokens(text)} tokens]"
+    budget_chars = budget_tokens * 4 - len(footer)
+    
+    # Markers and line breaks aren't known up front; shrink until the result fits
+    while budget_chars > 0:
+        trimmed = _select_sentences(lines, budget_chars) + footer
+        if estimate_tokens(trimmed) <= budget_tokens:
+            return trimmed
+        budget_chars = int(budget_chars * 0.9)
+    
+    return footer.strip()
+
+def _select_sentences(lines: List[str], budget_chars: int) -> str:
+    units: List[Tuple[int, int, int, str]] = []
+    for line_index, line in enumerate(lines):
+        for sentence_index, sentence in enumerate(s for s in SENTENCE_BREAK.split(line) if s):
+            units.append((0 if sentence_index == 0 else 1, line_index, sentence_index, sentence))
+    
+    kept = set()
+    used = 0
+    for priority, line_index, sentence_index, sentence in sorted(units):
+        if used + len(sentence) + 1 <= budget_chars:
+            kept.add((line_index, sentence_index))
+            used += len(sentence) + 1
+    
+    out_lines = []
+    dropped = False
+    for line_index, line in enumerate(lines):
+        if not line:
+            if out_lines and out_lines[-1]:
+                out_lines.append('')
+            continue
+        
+        sentences = [s for s in SENTENCE_BREAK.split(line) if s]
+        parts = [s for i, s in enumerate(sentences) if (line_index, i) in kept]
+        if not parts:
+            dropped = True
+            continue
+        if dropped:
+            parts.insert(0, '[...]')
+        if len(parts) < len(sentences):
+            parts.append('[...]')
+        dropped = False
+        out_lines.append(' '.join(parts))
+    
+    return '\n'.join(out_lines).strip()
+
+class ContextCompactor:
+    """Caps how many tokens of earlier task outputs a task receives
+    
+    budget_tokens (CONTEXT_BUDGET_TOKENS) is the context budget of one
+    task; a task depending on several outputs splits it between them.
+    Compaction is opt-in: CONTEXT_COMPACTION (default off) picks
+    extractive trimming or a summary from the provider's cheap analysis
+    model, falling back to trimming on errors.
+    """
+    
+    def __init__(self, mode: str = None, budget_tokens: int = None):
+        mode = (mode or os.getenv('CONTEXT_COMPACTION', 'off')).lower()
+        if mode not in COMPACTION_MODES:
+            raise ValueError(f"Unsupported CONTEXT_COMPACTION: {mode}")
+        if budget_tokens is None:
+            budget_tokens = int(os.getenv('CONTEXT_BUDGET_TOKENS', 2000))
+        
+        self.mode = mode if budget_tokens > 0 else 'off'
+        self.budget_tokens = budget_tokens
+    
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'off'
+    
+    def compact(self, text: str, budget_tokens: int, llm=None) -> str:
+        """text within budget_tokens, unchanged when it already fits"""
+        if not self.enabled or estimate_tokens(text) <= budget_tokens:
+            return text
+        
+        if self.mode == 'summary' and llm is not None:
+            try:
+                summary = self._summarize(text, budget_tokens, llm)
+                if estimate_tokens(summary) <= budget_tokens:
+                    return summary
+            except Exception as e:
+                print(f"Warning: context summary failed, trimming instead: {e}")
+        
+        return extractive_trim(text, budget_tokens)
+    
+    def _summarize(self, text: str, budget_tokens: int, llm) -> str:
+        from langchain.schema import HumanMessage, SystemMessage
+        
+        words = max(20, int(budget_tokens * 0.6))
+        messages = [
+            SystemMessage(content=(
+                "You condense work handed from one AI agent to the next. Keep concrete facts, "
+                "numbers, names, decisions and recommendations; drop repetition and filler."
+            )),
+            HumanMessage(content=f"Condense this to at most {words} words:\n\n{text}")
+        ]
+        return llm.invoke(messages).content.strip()
@@ -0,0 +1,294 @@
+"""
+Crew Blueprint - Precompiled crew definitions
+Validates agent and task templates once and reuses built CrewAI agents across requests
+"""
+
+import os
+import time
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Any, Tuple, Callable
+
+@dataclass(frozen=True)
+class AgentSpec:
+    """Validated, immutable definition of one crew agent"""
+    agent_type: str
+    role: str
+    goal: str
+    backstory: str
+    allow_delegation: bool = False
+    tools: Tuple[Any, ...] = ()
+
+@dataclass(frozen=True)
+class TaskSpec:
+    """Validated task definition; only the request text is added per run"""
+    description: str
+    expected_output: str
+    depends_on: Tuple[int, ...] = ()
+    include_request: bool = True
+    
+    def render(self, task_description: str) -> str:
+        """Task description bound to the user's request"""
+        if self.include_request:
+            return f"{self.description}\n\nOriginal request: {task_description}"
+        return self.description.format(task_description=task_description)
+
+@dataclass(frozen=True)
+class CrewBlueprint:
+    """Agents, tasks and task dependencies for one crew shape
+    
+    A crew shape is the task type, the suggested agent types and the
+    execution mode. dependencies already reflects the mode: sequential
+    crews chain every task to the previous one.
+    """
+    task_type: str
+    execution_mode: str
+    agents: Tuple[AgentSpec, ...]
+    tasks: Tuple[TaskSpec, ...]
+    dependencies: Tuple[Tuple[int, ...], ...]
+    
+    @property
+    def roles(self) -> List[str]:
+        return [agent.role for agent in self.agents]
+
+def subtask_dependencies(subtask: Dict[str, Any], index: int) -> List[int]:
+    """Indexes of the subtasks a template subtask depends on (previous one by default)"""
+    if 'depends_on' in subtask:
+        return list(subtask['depends_on'])
+    return [index - 1] if index > 0 else []
+
+def compile_blueprint(agent_templates, task_templates, task_type: str, agent_types: List[str],
+                      execution_mode: str = 'sequential',
+                      tools_for: Callable[[str], List[Any]] = None) -> CrewBlueprint:
+    """Validate templates and build the blueprint for a crew shape"""
+    if not agent_types:
+        raise ValueError("A crew needs at least one agent")
+    
+    agents = []
+    for agent_type in agent_types:
+        template = agent_templates.get_template(agent_type)
+        missing = [key for key in ('role', 'goal', 'backstory') if not template.get(key)]
+        if missing:
+            raise ValueError(f"Agent template {agent_type} is missing {', '.join(missing)}")
+        
+        agents.append(AgentSpec(
+            agent_type=agent_type,
+            role=template['role'],
+            goal=template['goal'],
+            backstory=template['backstory'],
+            allow_delegation=template.get('allow_delegation', False),
+            tools=tuple(tools_for(agent_type)) if tools_for else ()
+        ))
+    
+    task_template = task_templates.get_template(task_type)
+    subtasks = task_template['subtasks'][:len(agents)]
+    
+    template_dependencies = []
+    for i, subtask in enumerate(subtasks):
+        if not subtask.get('description') or not subtask.get('expected_output'):
+            raise ValueError(f"Subtask {i} of task template {task_type} needs a description and expected_output")
+        
+        depends_on = subtask_dependencies(subtask, i)
+        # Dependencies must point backwards, which also rules out cycles
+        if any(not 0 <= d < i for d in depends_on):
+            raise ValueError(f"Subtask {i} of task template {task_type} has invalid depends_on {depends_on}")
+        template_dependencies.append(depends_on)
+    
+    # Template subtasks that nothing depends on; additional agents build on these
+    template_sinks = [
+        i for i in range(len(subtasks))
+        if not any(i in depends_on for depends_on in template_dependencies)
+    ]
+    
+    tasks = []
+    for i in range(len(agents)):
+        if i < len(subtasks):
+            tasks.append(TaskSpec(
+                description=subtasks[i]['description'],
+                expected_output=subtasks[i]['expected_output'],
+                depends_on=tuple(template_dependencies[i])
+            ))
+        else:
+            # Fallback task for additional agents
+            tasks.append(TaskSpec(
+                description="Support the team in completing: {task_description}",
+                expected_output="A comprehensive contribution to the overall objective",
+                depends_on=tuple(template_sinks),
+                include_request=False
+            ))
+    
+    # Sequential crews run strictly in order
+    if execution_mode == 'parallel':
+        dependencies = tuple(task.depends_on for task in tasks)
+    else:
+        dependencies = tuple((i - 1,) if i > 0 else () for i in range(len(tasks)))
+    
+    return CrewBlueprint(
+        task_type=task_type,
+        execution_mode=execution_mode,
+        agents=tuple(agents),
+        tasks=tuple(tasks),
+        dependencies=dependencies
+    )
+
+class BlueprintCache:
+    """Compiled blueprints keyed on crew shape
+    
+    A shape is compiled once; clear() after templates changed (the
+    spawner does so when the template registry reloads).
+    """
+    
+    def __init__(self, agent_templates, task_templates, tools_for: Callable[[str], List[Any]] = None):
+        self.agent_templates = agent_templates
+        self.task_templates = task_templates
+        self.tools_for = tools_for
+        self._blueprints: Dict[Tuple, CrewBlueprint] = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+    
+    def get(self, task_type: str, agent_types: List[str], execution_mode: str = 'sequential') -> CrewBlueprint:
+        """Blueprint for a crew shape, compiling it on first use"""
+        key = (task_type, tuple(agent_types), execution_mode)
+        
+        with self._lock:
+            blueprint = self._blueprints.get(key)
+            if blueprint is not None:
+                self._stats['hits'] += 1
+                return blueprint
+            self._stats['misses'] += 1
+        
+        blueprint = compile_blueprint(
+            self.agent_templates, self.task_templates, task_type, agent_types, execution_mode, self.tools_for
+        )
+        
+        with self._lock:
+            return self._blueprints.setdefault(key, blueprint)
+    
+    def clear(self):
+        """Drop compiled blueprints, e.g. after templates changed"""
+        with self._lock:
+            self._blueprints.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, 'size': len(self._blueprints)}
+
+class AgentPool:
+    """Idle CrewAI agents kept per (agent spec, provider, model)
+    
+    Building an Agent validates the pydantic model and constructs its
+    executor. An agent is lent to one request at a time: acquire() hands
+    out an idle one (or builds it) bound to the request's LLM and step
+    callback, and release() returns it once the crew has finished. Agents
+    from failed or cancelled runs are discarded, since CrewAI may still be
+    using them.
+    """
+    
+    def __init__(self, max_idle: int = None):
+        if max_idle is None:
+            max_idle = int(os.getenv('AGENT_POOL_SIZE', 8))
+        self.max_idle = max(0, max_idle)
+        self._idle: Dict[Tuple, List[Any]] = {}
+        self._leased: Dict[int, Tuple[Tuple, Any]] = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'constructions': 0,
+            'construction_time': 0.0,
+            'discarded': 0
+        }
+    
+    def acquire(self, spec: AgentSpec, provider: str, model: str, llm, step_callback=None):
+        """An agent for spec bound to this request's llm and step callback"""
+        key = (spec, provider, model)
+        
+        agent = None
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                agent = idle.pop()
+                self._stats['hits'] += 1
+            else:
+                self._stats['misses'] += 1
+        
+        if agent is None:
+            start_time = time.time()
+            agent = self._build(spec, llm, step_callback)
+            with self._lock:
+                self._stats['constructions'] += 1
+                self._stats['construction_time'] += time.time() - start_time
+        else:
+            # Crew.kickoff rebuilds the agent executor, which picks these up
+            agent.llm = llm
+            agent.step_callback = step_callback
+        
+        with self._lock:
+            self._leased[id(agent)] = (key, agent)
+        return agent
+    
+    def release(self, agents: List[Any]):
+        """Return agents from a finished crew for reuse"""
+        with self._lock:
+            for agent in agents:
+                leased = self._leased.pop(id(agent), None)
+                if leased is None:
+                    continue
+                
+                key = leased[0]
+                idle = self._idle.setdefault(key, [])
+                if len(idle) >= self.max_idle:
+                    self._stats['discarded'] += 1
+                    continue
+                
+                # Don't keep the finished request's LLM, callbacks and crew alive
+                agent.llm = None
+                agent.step_callback = None
+                agent.crew = None
+                idle.append(agent)
+    
+    def discard(self, agents: List[Any]):
+        """Forget agents that must not be reused"""
+        with self._lock:
+            for agent in agents:
+                if self._leased.pop(id(agent), None) is not None:
+                    self._stats['discarded'] += 1
+    
+    def clear(self):
+        """Drop all idle agents"""
+        with self._lock:
+            self._idle.clear()
+    
+    def _build(self, spec: AgentSpec, llm, step_callback=None):
+        from crewai import Agent
+        
+        return Agent(
+            role=spec.role,
+            goal=spec.goal,
+            backstory=spec.backstory,
+            llm=llm,
+            verbose=True,
+            allow_delegation=spec.allow_delegation,
+            tools=list(spec.tools),
+            step_callback=step_callback
+        )
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Idle and leased counts, hit rate and agent construction cost"""
+        with self._lock:
+            stats = dict(self._stats)
+            idle = sum(len(agents) for agents in self._idle.values())
+            leased = len(self._leased)
+        
+        lookups = stats['hits'] + stats['misses']
+        constructions = stats['constructions']
+        construction_time = stats.pop('construction_time')
+        
+        return {
+            **stats,
+            'idle': idle,
+            'leased': leased,
+            'max_idle_per_key': self.max_idle,
+            'hit_rate': stats['hits'] / lookups if lookups else 0,
+            'avg_construction_ms': construction_time / constructions * 1000 if constructions else 0
+        }
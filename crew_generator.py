@@ -1,21 +1,164 @@
 """
 Crew Generator - Dynamic CrewAI crew creation
 Analyzes tasks and generates appropriate multi-agent teams
+
+CrewAI and LangChain are imported only when a crew is actually built, so
+importing this module (and the web app) stays fast.
 """
 
+import os
 import time
 import json
-from typing import Dict, List, Any, Optional
-from crewai import Agent, Task, Crew, Process
-from langchain.tools import BaseTool
+import asyncio
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple, TYPE_CHECKING
 
+import metrics
 from llm_selector import LLMSelector
-from task_parser import TaskParser
+from task_parser import TaskParser, LLM_ANALYSIS_FIELDS
+from execution_context import (
+    ExecutionContext, CrewResult, CrewCancelledError, CrewDeadlineExceeded, CrewExecutionError
+)
+from llm_router import LLMDeadlineExceeded
+from cache import create_cache, make_cache_key
+from crew_blueprint import CrewBlueprint, BlueprintCache, AgentPool
+from context_compactor import ContextCompactor
+from crew_planner import CrewPlanner
+from rate_limiter import estimate_tokens
 from config.agent_templates import AgentTemplateManager
 from config.task_templates import TaskTemplateManager
 
+if TYPE_CHECKING:
+    from crewai import Agent, Task, Crew
+    from langchain.tools import BaseTool
+
+EXECUTION_MODES = ('sequential', 'parallel')
+
+# Fields only the LLM analysis provides, returned by analyze_task(details=True)
+ANALYSIS_DETAIL_FIELDS = LLM_ANALYSIS_FIELDS + ('llm_analysis_error',)
+
+def task_output_text(output: Any) -> str:
+    """Raw text of a CrewAI task output"""
+    return getattr(output, 'raw_output', None) or getattr(output, 'raw', None) or str(output or '')
+
+class TaskProgressTracker:
+    """Emits task started/completed events as task dependencies finish
+    
+    With a compactor, each finished output is also cut down to its share
+    of the context budget before the tasks depending on it read it. The
+    full outputs are kept for partial results of runs that are cut short.
+    """
+    
+    def __init__(self, context: ExecutionContext, roles: List[str], dependencies: List[List[int]],
+                 compactor: ContextCompactor = None):
+        self.context = context
+        self.roles = roles
+        self.dependencies = dependencies
+        self.compactor = compactor if compactor is not None and compactor.enabled else None
+        self._started = set()
+        self._completed = set()
+        self._start_times: Dict[int, float] = {}
+        self._outputs: Dict[int, str] = {}
+        self._lock = threading.Lock()
+    
+    def start(self):
+        """Announce the tasks that can run immediately"""
+        self._start_ready()
+    
+    def callback_for(self, index: int):
+        """CrewAI task callback reporting completion of task index"""
+        def callback(output):
+            self.completed(index, output)
+        return callback
+    
+    def completed(self, index: int, output: Any):
+        """Record a finished task and announce newly unblocked ones"""
+        text = task_output_text(output)
+        with self._lock:
+            self._completed.add(index)
+            self._outputs[index] = text
+            completed_count = len(self._completed)
+            started_at = self._start_times.get(index)
+        
+        if started_at is not None:
+            seconds = time.time() - started_at
+            self.context.record_agent_time(index, self.roles[index], seconds)
+            metrics.agent_task_seconds.observe(seconds, agent=self.roles[index])
+        
+        self.context.emit(
+            'task_completed',
+            index=index,
+            agent=self.roles[index],
+            output=text,
+            completed=completed_count,
+            total=len(self.roles)
+        )
+        
+        if self.compactor:
+            self._compact(index, output)
+        self._start_ready()
+    
+    def _compact(self, index: int, output: Any):
+        """Shrink an output that later tasks receive as context"""
+        consumers = [i for i, depends_on in enumerate(self.dependencies) if index in depends_on]
+        if not consumers:
+            # Final outputs make up the crew result and are never shortened
+            return
+        
+        budget = self.compactor.budget_tokens // max(len(self.dependencies[i]) for i in consumers)
+        text = task_output_text(output)
+        compacted = self.compactor.compact(text, budget, llm=self.context.summary_llm)
+        if compacted == text:
+            return
+        
+        if hasattr(output, 'raw_output'):
+            output.raw_output = compacted
+        else:
+            output.raw = compacted
+        
+        tokens_before, tokens_after = estimate_tokens(text), estimate_tokens(compacted)
+        tokens_saved = (tokens_before - tokens_after) * len(consumers)
+        self.context.record_compaction(tokens_before, tokens_after, tokens_saved)
+        metrics.context_tokens_saved.inc(tokens_saved)
+        self.context.emit(
+            'context_compacted', index=index, agent=self.roles[index],
+            tokens_before=tokens_before, tokens_after=tokens_after
+        )
+    
+    def partial_output(self) -> str:
+        """Outputs of the finished tasks that no other finished task built on"""
+        with self._lock:
+            outputs = dict(self._outputs)
+        
+        consumed = {j for i in outputs for j in self.dependencies[i]}
+        frontier = [i for i in sorted(outputs) if i not in consumed]
+        if len(frontier) == 1:
+            return outputs[frontier[0]]
+        return "\n\n".join(f"## {self.roles[i]}\n\n{outputs[i]}" for i in frontier)
+    
+    def _start_ready(self):
+        with self._lock:
+            ready = [
+                i for i in range(len(self.roles))
+                if i not in self._started and all(d in self._completed for d in self.dependencies[i])
+            ]
+            self._started.update(ready)
+            now = time.time()
+            for i in ready:
+                self._start_times[i] = now
+        
+        for i in ready:
+            self.context.emit('task_started', index=i, agent=self.roles[i], total=len(self.roles))
+
 class MetaCrewSpawner:
-    """Main class for dynamic crew generation and execution"""
+    """Main class for dynamic crew generation and execution
+    
+    The template managers, task parser and LLM selector are shared and
+    read-only, so one spawner can serve many threads as long as each
+    request passes its own ExecutionContext.
+    """
     
     def __init__(self):
         self.llm_selector = LLMSelector()
@@ -23,61 +166,226 @@ class MetaCrewSpawner:
         self.agent_templates = AgentTemplateManager()
         self.task_templates = TaskTemplateManager()
         
-        # Current configuration
+        # Crew shapes are compiled once and built agents are reused across requests
+        self.blueprints = BlueprintCache(self.agent_templates, self.task_templates, self._get_agent_tools)
+        self.agent_pool = AgentPool()
+        self.agent_templates.registry.on_reload(self._templates_reloaded)
+        
+        # Caps the earlier task outputs each task receives as context
+        self.context_compactor = ContextCompactor()
+        
+        # Sizes each crew to its latency/cost budget from observed agent costs
+        self.planner = CrewPlanner(self.blueprints)
+        
+        # Threads running CrewAI's blocking kickoff for aprocess_task, created on first use
+        self._crew_executor = None
+        self._executor_lock = threading.Lock()
+        
+        # Opt-in cache of crew results keyed on the crew fingerprint
+        self.result_cache = None
+        if os.getenv('ENABLE_RESULT_CACHE', 'False').lower() == 'true':
+            self.result_cache = create_cache(
+                'results',
+                ttl=float(os.getenv('RESULT_CACHE_TTL', os.getenv('CACHE_TTL', 3600))),
+                max_size=int(os.getenv('RESULT_CACHE_SIZE', 256))
+            )
+        
+        # Default configuration, used when no context is passed
         self.current_llm_provider = None
         self.current_model = None
         self.current_llm = None
+        self.default_context = None
         
-        # Execution tracking
+        # Execution tracking for single-threaded callers (CLI)
         self.last_agents = []
         self.last_execution_time = 0
         
-        # Initialize with default LLM
+        # Pick the default provider now, but build its client on first use
         try:
-            default_provider = self.llm_selector.get_default_provider()
-            self.configure_llm(default_provider)
+            self.current_llm_provider = self.llm_selector.get_default_provider()
         except ValueError as e:
             print(f"Warning: {e}")
     
     def configure_llm(self, provider: str, model: str = None):
-        """Configure the LLM provider and model"""
+        """Configure the default LLM provider and model"""
+        self.default_context = self.create_context(provider, model)
         self.current_llm_provider = provider
         self.current_model = model
-        self.current_llm = self.llm_selector.create_llm_instance(provider, model)
+        self.current_llm = self.default_context.llm
+    
+    def create_context(self, provider: str, model: str = None, execution_mode: str = None,
+                       streaming: bool = False, latency_budget: float = None,
+                       cost_budget: float = None, timeout: float = None) -> ExecutionContext:
+        """Create a request-scoped context for the given provider and model
+        
+        execution_mode is "sequential" or "parallel" (defaults to CREW_EXECUTION_MODE).
+        streaming selects a client that emits token events. latency_budget
+        (seconds) and cost_budget (USD) size the crew; they default to
+        CREW_LATENCY_BUDGET and CREW_COST_BUDGET. timeout (seconds, default
+        CREW_TIMEOUT) is a hard deadline for each process_task run.
+        """
+        execution_mode = execution_mode or os.getenv('CREW_EXECUTION_MODE', 'sequential')
+        if execution_mode not in EXECUTION_MODES:
+            raise ValueError(f"Unsupported execution mode: {execution_mode}")
+        
+        if latency_budget is None and os.getenv('CREW_LATENCY_BUDGET'):
+            latency_budget = float(os.getenv('CREW_LATENCY_BUDGET'))
+        if cost_budget is None and os.getenv('CREW_COST_BUDGET'):
+            cost_budget = float(os.getenv('CREW_COST_BUDGET'))
+        if timeout is None and os.getenv('CREW_TIMEOUT'):
+            timeout = float(os.getenv('CREW_TIMEOUT'))
+        for name, budget in (('latency_budget', latency_budget), ('cost_budget', cost_budget), ('timeout', timeout)):
+            if budget is not None and budget <= 0:
+                raise ValueError(f"{name} must be positive")
+        
+        # Routed clients fail over to the other configured providers
+        llm = self.llm_selector.create_routed_llm(provider, model, streaming=streaming)
+        model = model or self.llm_selector.providers[provider]['default_model']
+        
+        # Task analysis runs on the provider's cheaper model; fall back to the crew model
+        analysis_llm, analysis_model = llm, model
+        try:
+            analysis_llm = self.llm_selector.create_routed_llm(provider, analysis=True)
+            analysis_model = self.llm_selector.get_analysis_model(provider)
+        except ValueError as e:
+            print(f"Warning: analysis model unavailable, using {model}: {e}")
+        
+        # Context summaries use the cheap model too, but as plain text rather than JSON
+        summary_llm = None
+        if self.context_compactor.mode == 'summary':
+            try:
+                summary_llm = self.llm_selector.create_routed_llm(provider, analysis_model)
+            except ValueError as e:
+                print(f"Warning: summary model unavailable, using {model}: {e}")
+                # A client of its own, so summary spend stays apart from the agents'
+                summary_llm = self.llm_selector.create_routed_llm(provider, model)
+        
+        context = ExecutionContext(
+            provider=provider,
+            model=model,
+            llm=llm,
+            temperature=getattr(llm, 'temperature', None),
+            execution_mode=execution_mode,
+            analysis_llm=analysis_llm,
+            analysis_model=analysis_model,
+            summary_llm=summary_llm,
+            latency_budget=latency_budget,
+            cost_budget=cost_budget,
+            timeout=timeout
+        )
+        
+        # Report rate limit waits, tokens and cost per request, and stop
+        # LLM calls of cancelled or expired requests
+        for client in {id(c): c for c in (llm, analysis_llm, summary_llm) if c is not None}.values():
+            if hasattr(client, 'wait_callback'):
+                client.wait_callback = context.record_rate_limit_wait
+                client.usage_callback = (
+                    context.record_llm_usage if client is llm else context.record_overhead_usage
+                )
+                client.abort_callback = context.check_cancelled
+                client.time_left_callback = context.time_remaining
+        
+        return context
     
-    def analyze_task(self, task_description: str) -> Dict[str, Any]:
-        """Analyze task and suggest agent configuration"""
-        if not self.current_llm:
+    def _resolve_context(self, context: Optional[ExecutionContext]) -> ExecutionContext:
+        """Fall back to the default context when none is given"""
+        if context is None and self.default_context is None and self.current_llm_provider:
+            self.configure_llm(self.current_llm_provider, self.current_model)
+        
+        context = context or self.default_context
+        if not context or not context.llm:
             raise ValueError("No LLM configured. Please configure an LLM provider first.")
+        return context
+    
+    def analyze_task(self, task_description: str, context: ExecutionContext = None,
+                     details: bool = False) -> Dict[str, Any]:
+        """Analyze task and suggest agent configuration
+        
+        Crew building only needs the rule-based fields, so the LLM analysis
+        is skipped when the rules are confident (ANALYSIS_MODE=auto).
+        details=True always fetches the LLM fields and returns them too.
+        """
+        context = self._resolve_context(context)
         
         # Parse task using task parser
-        analysis = self.task_parser.parse_task(task_description, self.current_llm)
+        analysis_llm = context.analysis_llm or context.llm
+        analysis_model = context.analysis_model or context.model
+        if details:
+            analysis = self.task_parser.enrich_analysis(
+                task_description, analysis_llm, provider=context.provider, model=analysis_model
+            )
+        else:
+            analysis = self.task_parser.parse_task(
+                task_description, analysis_llm, provider=context.provider, model=analysis_model
+            )
+        
+        return self._analysis_result(analysis, details)
+    
+    async def aanalyze_task(self, task_description: str, context: ExecutionContext = None,
+                            details: bool = False) -> Dict[str, Any]:
+        """Async analyze_task: the LLM analysis awaits the model's ainvoke"""
+        context = self._resolve_context(context)
         
+        analysis_llm = context.analysis_llm or context.llm
+        analysis_model = context.analysis_model or context.model
+        if details:
+            analysis = await self.task_parser.aenrich_analysis(
+                task_description, analysis_llm, provider=context.provider, model=analysis_model
+            )
+        else:
+            analysis = await self.task_parser.aparse_task(
+                task_description, analysis_llm, provider=context.provider, model=analysis_model
+            )
+        
+        return self._analysis_result(analysis, details)
+    
+    def _analysis_result(self, analysis: Dict[str, Any], details: bool) -> Dict[str, Any]:
+        """Public analysis fields plus the suggested agents"""
         # Get suggested agents based on analysis
         suggested_agents = self.agent_templates.suggest_agents(analysis)
         
-        return {
+        result = {
             'task_type': analysis.get('task_type'),
             'complexity': analysis.get('complexity'),
             'domain': analysis.get('domain'),
             'suggested_agents': suggested_agents,
             'estimated_time': analysis.get('estimated_time'),
-            'requirements': analysis.get('requirements', [])
+            'requirements': analysis.get('requirements', []),
+            'confidence': analysis.get('confidence'),
+            'analysis_source': analysis.get('analysis_source')
         }
+        
+        if details:
+            result['details'] = {key: value for key, value in analysis.items() if key in ANALYSIS_DETAIL_FIELDS}
+        
+        return result
     
-    def generate_crew(self, task_description: str, analysis: Dict[str, Any] = None) -> Crew:
-        """Generate a crew based on task analysis"""
-        if not self.current_llm:
-            raise ValueError("No LLM configured. Please configure an LLM provider first.")
+    def generate_crew(self, task_description: str, analysis: Dict[str, Any] = None,
+                      context: ExecutionContext = None) -> 'Crew':
+        """Generate a crew based on task analysis
+        
+        Agent and task definitions come from a precompiled blueprint and the
+        agents are leased from the agent pool, so only the task text and the
+        request's LLM are bound here. Call release_crew once it has run.
+        """
+        from crewai import Crew, Process
+        
+        context = self._resolve_context(context)
         
         if not analysis:
-            analysis = self.analyze_task(task_description)
+            analysis = self.analyze_task(task_description, context)
+        
+        blueprint = self.blueprints.get(
+            analysis.get('task_type', 'general'),
+            [agent_config['type'] for agent_config in analysis.get('suggested_agents', [])],
+            context.execution_mode
+        )
         
         # Generate agents
-        agents = self._create_agents(analysis)
+        agents = self._create_agents(blueprint, context)
         
         # Generate tasks
-        tasks = self._create_tasks(task_description, agents, analysis)
+        tasks = self._create_tasks(task_description, agents, blueprint, context)
         
         # Create crew
         crew = Crew(
@@ -88,7 +396,7 @@ class MetaCrewSpawner:
         )
         
         # Store agent info for tracking
-        self.last_agents = [
+        context.agents = [
             {
                 'role': agent.role,
                 'goal': agent.goal,
@@ -99,58 +407,96 @@ class MetaCrewSpawner:
         
         return crew
     
-    def _create_agents(self, analysis: Dict[str, Any]) -> List[Agent]:
-        """Create agents based on analysis"""
-        agents = []
-        suggested_agents = analysis.get('suggested_agents', [])
+    def _templates_reloaded(self):
+        """Drop crews compiled from, and agents built with, the previous templates"""
+        self.blueprints.clear()
+        self.agent_pool.clear()
+    
+    def release_crew(self, context: ExecutionContext, reusable: bool = True):
+        """Return the request's agents to the pool, or drop them after a failed run"""
+        agents, context.crew_agents = context.crew_agents, []
+        if reusable:
+            self.agent_pool.release(agents)
+        else:
+            self.agent_pool.discard(agents)
         
-        for agent_config in suggested_agents:
-            template = self.agent_templates.get_template(agent_config['type'])
-            
-            agent = Agent(
-                role=template['role'],
-                goal=template['goal'],
-                backstory=template['backstory'],
-                llm=self.current_llm,
-                verbose=True,
-                allow_delegation=template.get('allow_delegation', False),
-                tools=self._get_agent_tools(agent_config['type'])
+    def _create_agents(self, blueprint: CrewBlueprint, context: ExecutionContext) -> List['Agent']:
+        """Lease the blueprint's agents, bound to this request's LLM"""
+        agents = [
+            self.agent_pool.acquire(
+                spec, context.provider, context.model, context.llm,
+                step_callback=self._step_callback(context, spec.role)
             )
-            agents.append(agent)
-        
+            for spec in blueprint.agents
+        ]
+        context.crew_agents.extend(agents)
         return agents
     
-    def _create_tasks(self, task_description: str, agents: List[Agent], analysis: Dict[str, Any]) -> List[Task]:
-        """Create tasks for the crew"""
+    def _create_tasks(self, task_description: str, agents: List['Agent'], blueprint: CrewBlueprint,
+                      context: ExecutionContext = None) -> List['Task']:
+        """Create tasks for the crew
+        
+        In parallel mode each task receives only the outputs of the subtasks
+        it depends on, and every task except the last runs asynchronously, so
+        independent subtasks execute concurrently.
+        """
+        from crewai import Task
+        
+        dependencies = [list(depends_on) for depends_on in blueprint.dependencies]
+        
+        tracker = None
+        if context is not None:
+            tracker = TaskProgressTracker(context, blueprint.roles, dependencies, self.context_compactor)
+            context.progress = tracker
+        
         tasks = []
-        task_type = analysis.get('task_type', 'general')
-        
-        # Get task template
-        task_template = self.task_templates.get_template(task_type)
-        
-        # Create tasks based on template and agents
-        for i, agent in enumerate(agents):
-            if i < len(task_template['subtasks']):
-                subtask = task_template['subtasks'][i]
-                
-                task = Task(
-                    description=f"{subtask['description']}\n\nOriginal request: {task_description}",
-                    expected_output=subtask['expected_output'],
-                    agent=agent
-                )
-                tasks.append(task)
-            else:
-                # Fallback task for additional agents
-                task = Task(
-                    description=f"Support the team in completing: {task_description}",
-                    expected_output="A comprehensive contribution to the overall objective",
-                    agent=agent
-                )
-                tasks.append(task)
+        for i, (spec, agent) in enumerate(zip(blueprint.tasks, agents)):
+            task_kwargs = {
+                'description': spec.render(task_description),
+                'expected_output': spec.expected_output,
+                'agent': agent
+            }
+            
+            if tracker:
+                task_kwargs['callback'] = tracker.callback_for(i)
+            
+            # Explicit context makes CrewAI read the (possibly compacted) outputs of
+            # the dependencies; sequential crews depend on the previous task only
+            if dependencies[i]:
+                task_kwargs['context'] = [tasks[j] for j in dependencies[i]]
+            
+            if blueprint.execution_mode == 'parallel':
+                # The crew returns the output of the last task, which must run synchronously
+                task_kwargs['async_execution'] = i < len(agents) - 1
+            
+            tasks.append(Task(**task_kwargs))
         
         return tasks
     
-    def _get_agent_tools(self, agent_type: str) -> List[BaseTool]:
+    def _collect_parallel_output(self, crew: 'Crew', final_output: Any) -> str:
+        """Wait for asynchronous tasks and combine the outputs of all sink tasks"""
+        for task in crew.tasks:
+            thread = getattr(task, 'thread', None)
+            if thread is not None:
+                thread.join()
+        
+        upstream = {id(dependency) for task in crew.tasks for dependency in (task.context or [])}
+        sinks = [task for task in crew.tasks if id(task) not in upstream]
+        
+        if len(sinks) <= 1:
+            return str(final_output)
+        
+        sections = [f"## {task.agent.role}\n\n{task_output_text(task.output)}" for task in sinks]
+        return "\n\n".join(sections)
+        
+    def _step_callback(self, context: ExecutionContext, role: str):
+        """Agent step callback that reports progress and stops cancelled runs"""
+        def callback(step):
+            context.emit('agent_step', agent=role)
+            context.check_cancelled()
+        return callback
+    
+    def _get_agent_tools(self, agent_type: str) -> List['BaseTool']:
         """Get tools for specific agent types"""
         # Basic implementation - can be extended with custom tools
         tools = []
@@ -168,34 +514,271 @@ class MetaCrewSpawner:
         
         return tools
     
-    def process_task(self, task_description: str) -> str:
-        """Complete process: analyze, generate crew, and execute"""
-        start_time = time.time()
+    def process_task(self, task_description: str, context: ExecutionContext = None,
+                     analysis: Dict[str, Any] = None, use_cache: bool = True) -> CrewResult:
+        """Complete process: analyze, generate crew, and execute
+        
+        A precomputed analysis (from analyze_task) skips the analysis step.
+        With the result cache enabled, use_cache=False forces a fresh run.
+        When the context's timeout runs out the run stops at its next agent
+        step or LLM call and returns the finished task outputs with status
+        "deadline_exceeded".
+        """
+        context = self._resolve_context(context)
+        start_time = self._start_run(context)
         
         try:
-            # Analyze task
-            analysis = self.analyze_task(task_description)
-            
-            # Generate crew
-            crew = self.generate_crew(task_description, analysis)
-            
-            # Execute crew
-            result = crew.kickoff()
+            # Analyze task unless a previous analysis is reused
+            if not analysis:
+                analysis = self.analyze_task(task_description, context)
+            crew, cache_key, cached_result = self._prepare_crew(
+                task_description, analysis, context, start_time, use_cache
+            )
             
-            self.last_execution_time = time.time() - start_time
+            result = cached_result
+            if cached_result is None:
+                # Execute crew
+                stage_start = self._start_execution(context)
+                result = self._finish_execution(crew, crew.kickoff(), context, cache_key, stage_start)
+        
+        except Exception as e:
+            return self._handle_failure(context, start_time, e)
+        
+        return self._complete_run(result, context, start_time, cached=cached_result is not None)
+    
+    async def aprocess_task(self, task_description: str, context: ExecutionContext = None,
+                            analysis: Dict[str, Any] = None, use_cache: bool = True) -> CrewResult:
+        """Async process_task for event-loop servers
+        
+        The analysis awaits the LLM's async API. CrewAI has no async
+        kickoff, so the crew runs on the spawner's crew executor while the
+        event loop serves other requests; cancelling the awaiting task
+        stops the crew at its next agent step or LLM call.
+        """
+        context = self._resolve_context(context)
+        start_time = self._start_run(context)
+        
+        try:
+            if not analysis:
+                analysis = await self.aanalyze_task(task_description, context)
+            crew, cache_key, cached_result = self._prepare_crew(
+                task_description, analysis, context, start_time, use_cache
+            )
             
-            return str(result)
+            result = cached_result
+            if cached_result is None:
+                stage_start = self._start_execution(context)
+                result = self._finish_execution(crew, await self._akickoff(crew), context, cache_key, stage_start)
             
+        except asyncio.CancelledError:
+            # The caller went away; the crew thread can't be interrupted, only told to stop
+            context.cancel_event.set()
+            self.release_crew(context, reusable=False)
+            metrics.crew_requests.inc(status='cancelled')
+            raise
+        
         except Exception as e:
-            self.last_execution_time = time.time() - start_time
-            raise Exception(f"Error processing task: {str(e)}")
+            return self._handle_failure(context, start_time, e)
+        
+        return self._complete_run(result, context, start_time, cached=cached_result is not None)
+    
+    def _start_run(self, context: ExecutionContext) -> float:
+        """Reset the context's per-run state and start its deadline; returns the start time"""
+        context.reset_run()
+        start_time = time.time()
+        context.deadline = start_time + context.timeout if context.timeout else None
+        return start_time
+    
+    def _prepare_crew(self, task_description: str, analysis: Dict[str, Any], context: ExecutionContext,
+                      start_time: float, use_cache: bool) -> Tuple['Crew', Optional[str], Optional[str]]:
+        """Plan and build the crew; returns it with its result cache key and any cached result"""
+        context.timings['analysis'] = time.time() - start_time
+        
+        # Size the crew to the request's budget, less what this run's analysis already spent
+        plan = self.planner.plan(
+            analysis, context.provider, context.model, context.execution_mode,
+            latency_budget=context.latency_budget, cost_budget=context.cost_budget,
+            elapsed=context.timings['analysis'], spent=context.overhead_cost
+        )
+        analysis = {**analysis, 'suggested_agents': plan.pop('suggested_agents')}
+        context.plan = plan
+        context.emit(
+            'analysis_complete',
+            task_type=analysis.get('task_type'),
+            complexity=analysis.get('complexity'),
+            domain=analysis.get('domain'),
+            suggested_agents=analysis.get('suggested_agents', [])
+        )
+        context.check_cancelled()
+        
+        # Generate crew
+        context.stage = 'crew_build'
+        stage_start = time.time()
+        crew = self.generate_crew(task_description, analysis, context)
+        context.timings['crew_build'] = time.time() - stage_start
+        context.emit('crew_built', agents=context.agents, tasks=len(crew.tasks))
+        
+        # Serve identical crews from the result cache
+        cache_key = None
+        cached_result = None
+        if self.result_cache is not None:
+            cache_key = self._crew_fingerprint(crew, context)
+            if use_cache:
+                cached_result = self.result_cache.get(cache_key)
+        
+        if cached_result is not None:
+            context.timings['execution'] = 0
+        return crew, cache_key, cached_result
+    
+    def _start_execution(self, context: ExecutionContext) -> float:
+        """Enter the execution stage; returns its start time"""
+        context.check_cancelled()
+        context.stage = 'execution'
+        if context.progress:
+            context.progress.start()
+        return time.time()
+    
+    def _finish_execution(self, crew: 'Crew', output: Any, context: ExecutionContext,
+                          cache_key: Optional[str], stage_start: float) -> str:
+        """Final crew output as text, stored in the result cache"""
+        if context.execution_mode == 'parallel':
+            output = self._collect_parallel_output(crew, output)
+        result = str(output)
+        context.timings['execution'] = time.time() - stage_start
+        
+        if cache_key:
+            self.result_cache.set(cache_key, result)
+        return result
+    
+    async def _akickoff(self, crew: 'Crew') -> Any:
+        """crew.kickoff on the crew executor, keeping the caller's context variables"""
+        loop = asyncio.get_running_loop()
+        run = contextvars.copy_context().run
+        return await loop.run_in_executor(self._get_crew_executor(), run, crew.kickoff)
+    
+    def _get_crew_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._crew_executor is None:
+                self._crew_executor = ThreadPoolExecutor(
+                    max_workers=int(os.getenv('ASYNC_CREW_WORKERS', 256)), thread_name_prefix='crew-async'
+                )
+            return self._crew_executor
+    
+    def _complete_run(self, result: str, context: ExecutionContext, start_time: float,
+                      cached: bool) -> CrewResult:
+        """Release the crew, record metrics and build the result of a finished run"""
+        execution_time = time.time() - start_time
+        context.timings['total'] = execution_time
+        self.release_crew(context)
+    
+        self.last_agents = context.agents
+        self.last_execution_time = execution_time
+        
+        metrics.crew_requests.inc(status='cached' if cached else 'success')
+        for stage_name in ('analysis', 'crew_build', 'execution', 'total'):
+            if stage_name in context.timings:
+                metrics.stage_seconds.observe(context.timings[stage_name], stage=stage_name)
+        
+        context.emit('result', result=result, execution_time=execution_time, cached=cached)
+        
+        return self._build_result(result, context, execution_time, cached=cached)
+    
+    def _handle_failure(self, context: ExecutionContext, start_time: float, error: Exception) -> CrewResult:
+        """Partial result for a missed deadline; cancellations and errors are raised"""
+        # Agents may still be finishing a step in CrewAI's task threads
+        self.release_crew(context, reusable=False)
+        
+        if not isinstance(error, (CrewCancelledError, CrewDeadlineExceeded, LLMDeadlineExceeded)):
+            # CrewAI swallows an abort raised in an async task's thread, and a
+            # dependent task then fails with an unrelated error
+            try:
+                context.check_cancelled()
+            except (CrewCancelledError, CrewDeadlineExceeded) as abort:
+                error = abort
+        
+        if isinstance(error, (CrewDeadlineExceeded, LLMDeadlineExceeded)):
+            return self._deadline_result(context, start_time, error)
+        
+        self.last_execution_time = time.time() - start_time
+        if isinstance(error, CrewCancelledError):
+            metrics.crew_requests.inc(status='cancelled')
+            raise error
+        
+        metrics.crew_requests.inc(status='error')
+        raise CrewExecutionError(
+            f"Error processing task: {str(error)}", stage=context.stage, provider=context.provider
+        ) from error
+    
+    def _deadline_result(self, context: ExecutionContext, start_time: float, error: Exception) -> CrewResult:
+        """Partial result of a run stopped by its deadline"""
+        execution_time = time.time() - start_time
+        context.timings['total'] = execution_time
+        self.last_agents = context.agents
+        self.last_execution_time = execution_time
+        
+        partial = context.progress.partial_output() if context.progress else ''
+        message = f"Deadline exceeded during {context.stage}: {error}"
+        metrics.crew_requests.inc(status='deadline_exceeded')
+        context.emit(
+            'deadline_exceeded', stage=context.stage, error=message, result=partial, execution_time=execution_time
+        )
+        
+        return self._build_result(
+            partial, context, execution_time, status='deadline_exceeded', error=message
+        )
+    
+    def _build_result(self, result: str, context: ExecutionContext, execution_time: float,
+                      cached: bool = False, status: str = 'completed', error: str = None) -> CrewResult:
+        """CrewResult of a run, with the planner's estimate next to the actual time and cost"""
+        crew_result = CrewResult(
+            result=result,
+            agents=context.agents,
+            execution_time=execution_time,
+            timings=dict(context.timings),
+            provider=context.provider,
+            model=context.model,
+            cached=cached,
+            execution_mode=context.execution_mode,
+            usage={key: dict(value) for key, value in context.usage.items()},
+            overhead_cost=context.overhead_cost,
+            agent_timings=list(context.agent_timings),
+            compaction=dict(context.compaction),
+            status=status,
+            error=error
+        )
+        
+        actual = self.planner.record(context.provider, context.model, crew_result)
+        crew_result.plan = {
+            **context.plan,
+            **actual,
+            'within_budget': (
+                (context.latency_budget is None or actual['actual_seconds'] <= context.latency_budget)
+                and (context.cost_budget is None or actual['actual_cost_usd'] <= context.cost_budget)
+            )
+        }
+        return crew_result
+    
+    def _crew_fingerprint(self, crew: 'Crew', context: ExecutionContext) -> str:
+        """Fingerprint of the crew composition, task descriptions and model"""
+        agents = [
+            [agent.role, agent.goal, agent.backstory, agent.allow_delegation]
+            for agent in crew.agents
+        ]
+        tasks = [
+            [task.description, task.expected_output, task.agent.role if task.agent else None]
+            for task in crew.tasks
+        ]
+        return make_cache_key(
+            'crew', agents, tasks, context.execution_mode,
+            context.provider, context.model, context.temperature
+        )
     
     def get_last_agents_info(self) -> List[Dict[str, str]]:
-        """Get information about the last generated agents"""
+        """Get information about the last generated agents (not thread-safe, prefer CrewResult)"""
         return self.last_agents
     
     def get_last_execution_time(self) -> float:
-        """Get the execution time of the last task"""
+        """Get the execution time of the last task (not thread-safe, prefer CrewResult)"""
         return self.last_execution_time
     
     def get_available_providers(self) -> List[Dict[str, Any]]:
@@ -0,0 +1,150 @@
+"""
+Crew Planner - Budget-aware crew sizing
+Picks the agent set and subtasks that fit a request's latency or cost budget, from observed per-agent history
+"""
+
+import os
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+
+from metrics import estimate_cost
+
+class AgentCostHistory:
+    """Moving averages of one agent turn's duration and cost per provider/model
+    
+    Each finished crew updates an exponentially weighted average, so
+    estimates follow recent provider behavior. Until a provider/model has
+    history, the estimate falls back to PLANNER_DEFAULT_AGENT_SECONDS and
+    the model's price for a typical agent turn.
+    """
+    
+    # Tokens of a typical agent turn (prompt with context, answer), for the cost prior
+    DEFAULT_PROMPT_TOKENS = 4000
+    DEFAULT_COMPLETION_TOKENS = 1000
+    
+    def __init__(self, alpha: float = None, default_seconds: float = None):
+        self.alpha = alpha if alpha is not None else float(os.getenv('PLANNER_EWMA_ALPHA', 0.3))
+        self.default_seconds = (
+            default_seconds if default_seconds is not None
+            else float(os.getenv('PLANNER_DEFAULT_AGENT_SECONDS', 30))
+        )
+        self._estimates: Dict[Tuple[str, str], Dict[str, float]] = {}
+        self._lock = threading.Lock()
+    
+    def estimate(self, provider: str, model: str) -> Dict[str, Any]:
+        """Expected seconds and USD for one agent turn"""
+        with self._lock:
+            observed = self._estimates.get((provider, model))
+            if observed is not None:
+                return {**observed, 'source': 'history'}
+        
+        return {
+            'seconds': self.default_seconds,
+            'cost_usd': estimate_cost(model, self.DEFAULT_PROMPT_TOKENS, self.DEFAULT_COMPLETION_TOKENS),
+            'samples': 0,
+            'source': 'default'
+        }
+    
+    def record(self, provider: str, model: str, agent_seconds: List[float], cost_usd: float):
+        """Fold a finished crew's agent timings and total cost into the averages"""
+        if not agent_seconds:
+            return
+        
+        seconds = sum(agent_seconds) / len(agent_seconds)
+        cost = cost_usd / len(agent_seconds)
+        
+        with self._lock:
+            current = self._estimates.get((provider, model))
+            if current is None:
+                self._estimates[(provider, model)] = {'seconds': seconds, 'cost_usd': cost, 'samples': 1}
+                return
+            
+            current['seconds'] += self.alpha * (seconds - current['seconds'])
+            current['cost_usd'] += self.alpha * (cost - current['cost_usd'])
+            current['samples'] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {f'{provider}/{model}': dict(values) for (provider, model), values in self._estimates.items()}
+
+class CrewPlanner:
+    """Sizes crews to fit an optional latency and cost budget
+    
+    Without a budget the suggested agents are used as they are. With one,
+    agents are dropped from the back (lowest priority) one at a time until
+    the estimate fits; a single agent is the floor. Latency is estimated
+    along the crew's critical path, so parallel crews can keep more agents
+    within the same budget.
+    """
+    
+    def __init__(self, blueprints, history: AgentCostHistory = None):
+        self.blueprints = blueprints
+        self.history = history or AgentCostHistory()
+    
+    def plan(self, analysis: Dict[str, Any], provider: str, model: str, execution_mode: str = 'sequential',
+             latency_budget: Optional[float] = None, cost_budget: Optional[float] = None,
+             elapsed: float = 0.0, spent: float = 0.0) -> Dict[str, Any]:
+        """Choose the crew for a request; returns the agents and the estimate behind them
+        
+        elapsed and spent are the time and LLM cost already used by the
+        request (analysis), which count against the budgets.
+        """
+        suggested = analysis.get('suggested_agents', [])
+        task_type = analysis.get('task_type', 'general')
+        size = len(suggested)
+        
+        per_agent = self.history.estimate(provider, model)
+        remaining = latency_budget - elapsed if latency_budget is not None else None
+        remaining_cost = cost_budget - spent if cost_budget is not None else None
+        
+        while True:
+            agents = suggested[:size]
+            steps = self._critical_path([agent['type'] for agent in agents], task_type, execution_mode)
+            estimated_seconds = steps * per_agent['seconds']
+            estimated_cost = len(agents) * per_agent['cost_usd']
+            
+            fits = (
+                (remaining is None or estimated_seconds <= remaining)
+                and (remaining_cost is None or estimated_cost <= remaining_cost)
+            )
+            if fits or size <= 1:
+                break
+            size -= 1
+        
+        return {
+            'suggested_agents': agents,
+            'agents': len(agents),
+            'agents_suggested': len(suggested),
+            'estimated_seconds': elapsed + estimated_seconds,
+            'estimated_cost_usd': spent + estimated_cost,
+            'latency_budget': latency_budget,
+            'cost_budget': cost_budget,
+            'fits_budget': fits,
+            'estimate_source': per_agent['source']
+        }
+    
+    def _critical_path(self, agent_types: List[str], task_type: str, execution_mode: str) -> int:
+        """Agent turns on the longest dependency chain of the crew"""
+        if not agent_types:
+            return 0
+        
+        blueprint = self.blueprints.get(task_type, agent_types, execution_mode)
+        depth: List[int] = []
+        for depends_on in blueprint.dependencies:
+            depth.append(1 + max((depth[j] for j in depends_on), default=0))
+        return max(depth)
+    
+    def record(self, provider: str, model: str, result) -> Dict[str, Any]:
+        """Learn from a finished crew's CrewResult; returns its actual seconds and cost
+        
+        Only that run's figures are used. Its overhead_cost (task analysis,
+        context summaries) counts toward the actual cost but not the
+        per-agent history.
+        """
+        agent_seconds = [timing['seconds'] for timing in result.agent_timings]
+        cost = sum(usage['cost_usd'] for usage in result.usage.values())
+        
+        if not result.cached:
+            self.history.record(provider, model, agent_seconds, max(0.0, cost - result.overhead_cost))
+        
+        return {'actual_seconds': result.execution_time, 'actual_cost_usd': cost}
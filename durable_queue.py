@@ -0,0 +1,579 @@
+"""
+Durable Queue - SQLite-backed job queue shared by web and worker processes
+Jobs, worker leases, results and progress events live in one SQLite file, so crews can run in any number of processes
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import threading
+import contextlib
+from typing import Dict, List, Any, Optional, Callable, Iterator, Tuple
+
+from execution_context import CrewCancelledError
+from job_queue import (
+    Job, JOB_QUEUED, JOB_RUNNING, JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED, JOB_DEADLINE_EXCEEDED,
+    FINISHED_STATES, get_max_concurrent_crews
+)
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY, task TEXT NOT NULL, llm_provider TEXT NOT NULL, model TEXT NOT NULL,
+    options TEXT NOT NULL, status TEXT NOT NULL, outcome TEXT, error TEXT,
+    submitted_at REAL NOT NULL, started_at REAL, finished_at REAL,
+    worker_id TEXT, lease_expires_at REAL, attempts INTEGER NOT NULL DEFAULT 0,
+    cancel_requested INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, submitted_at);
+CREATE TABLE IF NOT EXISTS job_events (
+    job_id TEXT NOT NULL, seq INTEGER NOT NULL, type TEXT NOT NULL, time REAL NOT NULL, data TEXT NOT NULL,
+    PRIMARY KEY (job_id, seq)
+);
+'''
+
+class DurableJobStore:
+    """Jobs in a SQLite file, claimed by workers under time-limited leases
+    
+    A worker renews its leases while its crews run. When a worker dies its
+    leases run out (JOB_LEASE_SECONDS) and the next claim hands the job to
+    another worker, up to JOB_MAX_ATTEMPTS claims per job. Every process
+    opens the same JOB_STORE_PATH; workers on several hosts need it on a
+    filesystem with working file locks.
+    """
+    
+    def __init__(self, path: str = None, lease_seconds: float = None, max_attempts: int = None,
+                 max_retained: int = None):
+        self.path = path or os.getenv('JOB_STORE_PATH', 'meta_crew_jobs.db')
+        self.lease_seconds = lease_seconds or float(os.getenv('JOB_LEASE_SECONDS', 60))
+        self.max_attempts = max(1, max_attempts or int(os.getenv('JOB_MAX_ATTEMPTS', 3)))
+        self.max_retained = max_retained or int(os.getenv('JOB_STORE_RETAINED', 1000))
+        
+        self._lock = threading.Lock()
+        # Next event sequence number per job this process writes events for
+        self._next_seq: Dict[str, int] = {}
+        self._conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+    
+    def enqueue(self, task: str, llm_provider: str, model: str = '', options: Dict[str, Any] = None) -> str:
+        """Add a queued job; returns its id"""
+        job_id = uuid.uuid4().hex
+        
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO jobs (id, task, llm_provider, model, options, status, submitted_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (job_id, task, llm_provider, model or '', json.dumps(options or {}, default=str),
+                 JOB_QUEUED, time.time())
+            )
+            self._prune()
+        return job_id
+    
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """A job's row, or None when it is unknown or pruned"""
+        with self._lock:
+            row = self._conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return dict(row) if row else None
+    
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Lease the oldest queued job to worker_id; None when the queue is empty"""
+        now = time.time()
+        
+        with self._lock, self._transaction():
+            self._expire_leases(now)
+            row = self._conn.execute(
+                'SELECT id FROM jobs WHERE status = ? ORDER BY submitted_at LIMIT 1', (JOB_QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            
+            self._conn.execute(
+                'UPDATE jobs SET status = ?, worker_id = ?, lease_expires_at = ?, started_at = ?, '
+                'attempts = attempts + 1 WHERE id = ?',
+                (JOB_RUNNING, worker_id, now + self.lease_seconds, now, row['id'])
+            )
+            return dict(self._conn.execute('SELECT * FROM jobs WHERE id = ?', (row['id'],)).fetchone())
+    
+    def heartbeat(self, job_id: str, worker_id: str) -> Optional[bool]:
+        """Renew a lease; returns whether cancellation was requested, None once the lease is lost"""
+        with self._lock:
+            cursor = self._conn.execute(
+                'UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND worker_id = ? AND status = ?',
+                (time.time() + self.lease_seconds, job_id, worker_id, JOB_RUNNING)
+            )
+            if cursor.rowcount == 0:
+                return None
+            row = self._conn.execute('SELECT cancel_requested FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return bool(row['cancel_requested'])
+    
+    def finish(self, job_id: str, worker_id: str, status: str, outcome: Dict[str, Any] = None,
+               error: str = None) -> bool:
+        """Record a job's final state and its job_finished event; False when worker_id no longer held its lease"""
+        with self._lock, self._transaction():
+            cursor = self._conn.execute(
+                'UPDATE jobs SET status = ?, outcome = ?, error = ?, finished_at = ?, lease_expires_at = NULL '
+                'WHERE id = ? AND worker_id = ? AND status = ?',
+                (status, json.dumps(outcome, default=str) if outcome is not None else None, error,
+                 time.time(), job_id, worker_id, JOB_RUNNING)
+            )
+            if cursor.rowcount > 0:
+                self._add_finished_event(job_id)
+        return cursor.rowcount > 0
+    
+    def release(self, job_id: str, worker_id: str):
+        """Put a leased job back in the queue without counting the attempt (worker shutting down)"""
+        with self._lock:
+            self._conn.execute(
+                'UPDATE jobs SET status = ?, worker_id = NULL, lease_expires_at = NULL, started_at = NULL, '
+                'attempts = attempts - 1 WHERE id = ? AND worker_id = ? AND status = ?',
+                (JOB_QUEUED, job_id, worker_id, JOB_RUNNING)
+            )
+    
+    def cancel(self, job_id: str) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Cancel a queued job, or flag a running one for its worker
+        
+        Returns the job's row and whether this call cancelled it outright.
+        """
+        with self._lock, self._transaction():
+            now = time.time()
+            cursor = self._conn.execute(
+                'UPDATE jobs SET status = ?, error = ?, finished_at = ?, cancel_requested = 1 '
+                'WHERE id = ? AND status = ?',
+                (JOB_CANCELLED, 'Job was cancelled before it started', now, job_id, JOB_QUEUED)
+            )
+            if cursor.rowcount > 0:
+                self._add_finished_event(job_id)
+            self._conn.execute(
+                'UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = ?', (job_id, JOB_RUNNING)
+            )
+            row = self._conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return (dict(row) if row else None), cursor.rowcount > 0
+    
+    def add_event(self, job_id: str, event_type: str, data: Dict[str, Any]):
+        """Append a progress event to a job"""
+        with self._lock:
+            self._append_event(job_id, event_type, data)
+    
+    def events_since(self, job_id: str, start: int = 0) -> List[Dict[str, Any]]:
+        """A job's events from sequence number start"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT seq, type, time, data FROM job_events WHERE job_id = ? AND seq >= ? ORDER BY seq',
+                (job_id, start)
+            ).fetchall()
+        return [
+            {'seq': row['seq'], 'type': row['type'], 'time': row['time'], 'data': json.loads(row['data'])}
+            for row in rows
+        ]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Job counts by status, queue wait times and active workers"""
+        now = time.time()
+        
+        with self._lock:
+            counts = dict(self._conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall())
+            oldest = self._conn.execute(
+                'SELECT MIN(submitted_at) FROM jobs WHERE status = ?', (JOB_QUEUED,)
+            ).fetchone()[0]
+            waits = [row[0] for row in self._conn.execute(
+                'SELECT started_at - submitted_at FROM jobs WHERE started_at IS NOT NULL '
+                'ORDER BY started_at DESC LIMIT 100'
+            ).fetchall()]
+            workers = self._conn.execute(
+                'SELECT COUNT(DISTINCT worker_id) FROM jobs WHERE status = ? AND lease_expires_at > ?',
+                (JOB_RUNNING, now)
+            ).fetchone()[0]
+            retried = self._conn.execute('SELECT COUNT(*) FROM jobs WHERE attempts > 1').fetchone()[0]
+        
+        return {
+            'path': self.path,
+            'queue_depth': counts.get(JOB_QUEUED, 0),
+            'running': counts.get(JOB_RUNNING, 0),
+            'completed': counts.get(JOB_COMPLETED, 0),
+            'failed': counts.get(JOB_FAILED, 0),
+            'cancelled': counts.get(JOB_CANCELLED, 0),
+            'deadline_exceeded': counts.get(JOB_DEADLINE_EXCEEDED, 0),
+            'active_workers': workers,
+            'retried': retried,
+            'oldest_queued_wait': now - oldest if oldest is not None else 0,
+            'avg_wait_time': sum(waits) / len(waits) if waits else 0,
+            'max_wait_time': max(waits, default=0)
+        }
+    
+    @contextlib.contextmanager
+    def _transaction(self):
+        """BEGIN IMMEDIATE ... COMMIT, so several processes can't claim the same job (lock held)"""
+        self._conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self._conn.execute('ROLLBACK')
+            raise
+        self._conn.execute('COMMIT')
+    
+    def _append_event(self, job_id: str, event_type: str, data: Dict[str, Any]):
+        """add_event with the lock held"""
+        for attempt in range(2):
+            seq = self._next_seq.get(job_id)
+            if seq is None:
+                seq = self._conn.execute(
+                    'SELECT COALESCE(MAX(seq), -1) + 1 FROM job_events WHERE job_id = ?', (job_id,)
+                ).fetchone()[0]
+            try:
+                self._conn.execute(
+                    'INSERT INTO job_events (job_id, seq, type, time, data) VALUES (?, ?, ?, ?, ?)',
+                    (job_id, seq, event_type, time.time(), json.dumps(data, default=str))
+                )
+                break
+            except sqlite3.IntegrityError:
+                # Another process appended to this job (e.g. a worker that lost its lease); resync
+                self._next_seq.pop(job_id, None)
+                if attempt:
+                    raise
+        
+        if event_type == 'job_finished':
+            self._next_seq.pop(job_id, None)
+        else:
+            self._next_seq[job_id] = seq + 1
+    
+    def _add_finished_event(self, job_id: str):
+        """Append job_finished with the job's final state (lock held, in the status update's transaction)
+        
+        Written together with the status, so a reader that sees the job
+        finished also finds this event.
+        """
+        row = self._conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        self._append_event(job_id, 'job_finished', job_from_row(self, dict(row)).to_dict())
+    
+    def _expire_leases(self, now: float):
+        """Requeue jobs whose worker stopped renewing their lease, failing them after max_attempts (lock held)"""
+        expired = 'WHERE status = ? AND lease_expires_at < ?'
+        ending = [row[0] for row in self._conn.execute(
+            f'SELECT id FROM jobs {expired} AND (cancel_requested = 1 OR attempts >= ?)',
+            (JOB_RUNNING, now, self.max_attempts)
+        ).fetchall()]
+        self._conn.execute(
+            f'UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_expires_at = NULL '
+            f'{expired} AND cancel_requested = 1',
+            (JOB_CANCELLED, 'Job was cancelled and its worker stopped responding', now, JOB_RUNNING, now)
+        )
+        self._conn.execute(
+            f'UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_expires_at = NULL '
+            f'{expired} AND attempts >= ?',
+            (JOB_FAILED, f'Worker lost the job {self.max_attempts} times (lease expired)', now,
+             JOB_RUNNING, now, self.max_attempts)
+        )
+        self._conn.execute(
+            'UPDATE jobs SET status = ?, worker_id = NULL, lease_expires_at = NULL '
+            'WHERE status = ? AND lease_expires_at < ?',
+            (JOB_QUEUED, JOB_RUNNING, now)
+        )
+        for job_id in ending:
+            self._add_finished_event(job_id)
+    
+    def _prune(self):
+        """Drop the oldest finished jobs and their events beyond max_retained (lock held)"""
+        placeholders = ', '.join('?' for _ in FINISHED_STATES)
+        stale = [row[0] for row in self._conn.execute(
+            f'SELECT id FROM jobs WHERE status IN ({placeholders}) '
+            f'ORDER BY finished_at DESC LIMIT -1 OFFSET ?',
+            (*FINISHED_STATES, self.max_retained)
+        ).fetchall()]
+        
+        for job_id in stale:
+            self._conn.execute('DELETE FROM job_events WHERE job_id = ?', (job_id,))
+            self._conn.execute('DELETE FROM jobs WHERE id = ?', (job_id,))
+            self._next_seq.pop(job_id, None)
+
+class DurableEventStream:
+    """EventStream counterpart that stores events with the job, readable from any process
+    
+    Streamed tokens are merged and written at most every
+    token_flush_interval seconds (or before the next other event), so a
+    streaming crew doesn't cost one write per token.
+    """
+    
+    def __init__(self, store: DurableJobStore, job_id: str, poll_interval: float = 0.5,
+                 token_flush_interval: float = 0.25):
+        self.store = store
+        self.job_id = job_id
+        self.poll_interval = poll_interval
+        self.token_flush_interval = token_flush_interval
+        self._tokens: List[str] = []
+        self._last_flush = time.time()
+        self._lock = threading.Lock()
+    
+    @property
+    def closed(self) -> bool:
+        job = self.store.get(self.job_id)
+        return job is None or job['status'] in FINISHED_STATES
+    
+    def emit(self, event_type: str, **data):
+        if event_type == 'token':
+            with self._lock:
+                self._tokens.append(str(data.get('token', '')))
+                if time.time() - self._last_flush < self.token_flush_interval:
+                    return
+        self.flush()
+        if event_type != 'token':
+            self.store.add_event(self.job_id, event_type, data)
+    
+    def flush(self):
+        """Write buffered tokens as one token event"""
+        with self._lock:
+            tokens, self._tokens = self._tokens, []
+            self._last_flush = time.time()
+        if tokens:
+            self.store.add_event(self.job_id, 'token', {'token': ''.join(tokens)})
+    
+    def close(self):
+        # The job's final status, written with job_finished, closes the stream for readers
+        self.flush()
+    
+    def iter_events(self, start: int = 0, keepalive: float = 15) -> Iterator[Optional[Dict[str, Any]]]:
+        """Yield events from sequence number start until the job has finished
+        
+        None is yielded after keepalive seconds without events so callers
+        can send a heartbeat.
+        """
+        position = start
+        last_event = time.time()
+        while True:
+            # Status before events: job_finished is committed with the final status, so it can't be missed
+            closed = self.closed
+            pending = self.store.events_since(self.job_id, position)
+            
+            if pending:
+                for event in pending:
+                    yield event
+                position = pending[-1]['seq'] + 1
+                last_event = time.time()
+            elif closed:
+                return
+            elif time.time() - last_event >= keepalive:
+                yield None
+                last_event = time.time()
+            else:
+                time.sleep(self.poll_interval)
+
+def get_poll_interval() -> float:
+    """Seconds between queue polls, from JOB_POLL_INTERVAL"""
+    return max(0.05, float(os.getenv('JOB_POLL_INTERVAL', 0.5)))
+
+def job_from_row(store: DurableJobStore, row: Dict[str, Any], poll_interval: float = 0.5) -> Job:
+    """Job view of a stored row, with its outcome unpacked"""
+    outcome = json.loads(row['outcome']) if row['outcome'] else {}
+    job = Job(
+        id=row['id'],
+        task=row['task'],
+        llm_provider=row['llm_provider'],
+        model=row['model'],
+        options=json.loads(row['options']),
+        status=row['status'],
+        result=outcome.get('result'),
+        error=row['error'],
+        agents_created=outcome.get('agents_created', []),
+        execution_time=outcome.get('execution_time', 0),
+        timings=outcome.get('timings', {}),
+        metrics=outcome.get('metrics', {}),
+        plan=outcome.get('plan', {}),
+        cached=outcome.get('cached', False),
+        submitted_at=row['submitted_at'],
+        started_at=row['started_at'],
+        finished_at=row['finished_at'],
+        events=DurableEventStream(store, row['id'], poll_interval)
+    )
+    if row['cancel_requested']:
+        job.cancel_event.set()
+    return job
+
+class DurableJobManager:
+    """JobManager interface over a DurableJobStore
+    
+    submit only enqueues; crews run in `python main.py worker` processes
+    on this or other hosts. Waiting and event streams poll the store every
+    JOB_POLL_INTERVAL seconds.
+    """
+    
+    def __init__(self, store: DurableJobStore = None, max_workers: int = None, poll_interval: float = None):
+        self.store = store or DurableJobStore()
+        # Only caps per-request fan-out (batch concurrency); workers set the real limit
+        self.max_workers = max_workers or get_max_concurrent_crews()
+        self.poll_interval = poll_interval or get_poll_interval()
+    
+    def submit(self, task: str, llm_provider: str, model: str = '', **options) -> Job:
+        """Queue a task and return its job immediately"""
+        job_id = self.store.enqueue(task, llm_provider, model, options)
+        return self.get(job_id)
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by id"""
+        row = self.store.get(job_id)
+        return job_from_row(self.store, row, self.poll_interval) if row else None
+    
+    def wait(self, job_id: str, timeout: float = None) -> Optional[Job]:
+        """Block until a job has finished (or the timeout expires)"""
+        deadline = time.time() + timeout if timeout is not None else None
+        while True:
+            job = self.get(job_id)
+            if job is None or job.status in FINISHED_STATES:
+                return job
+            if deadline is not None and time.time() >= deadline:
+                return job
+            time.sleep(self.poll_interval)
+    
+    def as_completed(self, job_ids: List[str]) -> Iterator[Job]:
+        """Yield the given jobs as they finish, in completion order"""
+        pending = list(job_ids)
+        while pending:
+            jobs = [(job_id, self.get(job_id)) for job_id in pending]
+            finished = [(job_id, job) for job_id, job in jobs if job is None or job.status in FINISHED_STATES]
+            if not finished:
+                time.sleep(self.poll_interval)
+                continue
+            
+            finished.sort(key=lambda item: (item[1].finished_at or 0) if item[1] else 0)
+            for job_id, job in finished:
+                pending.remove(job_id)
+                if job is not None:
+                    yield job
+    
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Request cancellation; queued jobs never start, running crews stop at their next step or LLM call"""
+        row, cancelled = self.store.cancel(job_id)
+        if row is None:
+            return None
+        
+        # A job cancelled here got its job_finished event from the store
+        return job_from_row(self.store, row, self.poll_interval)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, running count, wait time and worker statistics"""
+        return {'backend': 'durable', 'max_concurrent_crews': self.max_workers, **self.store.get_stats()}
+    
+    def shutdown(self, wait: bool = True):
+        """Nothing to stop: queued jobs stay in the store for the workers"""
+
+class DurableWorker:
+    """Runs jobs claimed from a DurableJobStore on a pool of threads
+    
+    Leases are renewed every few seconds while crews run, and a cancel
+    requested from any process reaches the crew on the next renewal.
+    stop() interrupts running crews and hands their jobs back to the queue
+    for another worker.
+    """
+    
+    def __init__(self, store: DurableJobStore, runner: Callable[[Job], Dict[str, Any]], concurrency: int = None,
+                 poll_interval: float = None, worker_id: str = None):
+        self.store = store
+        self.runner = runner
+        self.concurrency = max(1, concurrency or get_max_concurrent_crews())
+        self.poll_interval = poll_interval or get_poll_interval()
+        self.worker_id = worker_id or f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}'
+        
+        self._lock = threading.Lock()
+        self._active: Dict[str, Job] = {}
+        self._stopping = threading.Event()
+        self._stats = {'completed': 0, 'failed': 0, 'cancelled': 0, 'deadline_exceeded': 0, 'released': 0, 'lost': 0}
+    
+    def run(self):
+        """Serve jobs until stop() is called"""
+        threads = [
+            threading.Thread(target=self._work_loop, name=f'crew-worker-{i}', daemon=True)
+            for i in range(self.concurrency)
+        ]
+        threads.append(threading.Thread(target=self._heartbeat_loop, name='lease-heartbeat', daemon=True))
+        for thread in threads:
+            thread.start()
+        
+        try:
+            while not self._stopping.wait(1):
+                pass
+        except KeyboardInterrupt:
+            self.stop()
+        
+        for thread in threads:
+            thread.join()
+    
+    def stop(self):
+        """Stop claiming jobs and interrupt running crews, which go back to the queue"""
+        self._stopping.set()
+        with self._lock:
+            for job in self._active.values():
+                job.cancel_event.set()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'worker_id': self.worker_id, 'running': len(self._active), **self._stats}
+    
+    def _work_loop(self):
+        while not self._stopping.is_set():
+            row = self.store.claim(self.worker_id)
+            if row is None:
+                self._stopping.wait(self.poll_interval)
+                continue
+            self._execute(job_from_row(self.store, row, self.poll_interval), row['attempts'])
+    
+    def _heartbeat_loop(self):
+        interval = min(self.store.lease_seconds / 3, 5.0)
+        while not self._stopping.wait(interval):
+            with self._lock:
+                active = list(self._active.values())
+            
+            for job in active:
+                cancel_requested = self.store.heartbeat(job.id, self.worker_id)
+                if cancel_requested is None:
+                    # Lease expired and the job moved on; stop spending on it here
+                    if not job.cancel_event.is_set():
+                        self._count('lost')
+                    job.cancel_event.set()
+                elif cancel_requested:
+                    job.cancel_event.set()
+    
+    def _execute(self, job: Job, attempt: int):
+        """Run one claimed job and store its outcome"""
+        with self._lock:
+            self._active[job.id] = job
+        
+        job.events.emit('job_started', job_id=job.id, wait_time=job.wait_time, worker_id=self.worker_id,
+                        attempt=attempt)
+        
+        try:
+            outcome = self.runner(job)
+            # Buffered tokens go out before the final status closes the stream
+            job.events.close()
+            if outcome.get('status') == JOB_DEADLINE_EXCEEDED:
+                status = JOB_DEADLINE_EXCEEDED
+            else:
+                status = JOB_COMPLETED
+            finished = self.store.finish(job.id, self.worker_id, status, outcome=outcome, error=outcome.get('error'))
+        
+        except CrewCancelledError as e:
+            row = self.store.get(job.id)
+            if self._stopping.is_set() and row and not row['cancel_requested']:
+                self.store.release(job.id, self.worker_id)
+                self._count('released')
+                return
+            status = JOB_CANCELLED
+            job.events.close()
+            finished = self.store.finish(job.id, self.worker_id, status, error=str(e))
+        
+        except Exception as e:
+            status = JOB_FAILED
+            job.events.close()
+            finished = self.store.finish(job.id, self.worker_id, status, error=str(e))
+        
+        finally:
+            with self._lock:
+                self._active.pop(job.id, None)
+        
+        if finished:
+            self._count(status)
+    
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
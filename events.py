@@ -0,0 +1,85 @@
+"""
+Events - Progress events for crew runs
+Buffered, thread-safe event streams consumed by the Server-Sent Events endpoint
+"""
+
+import time
+import threading
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, Iterator
+
+# Stream of the crew run executing in the current thread, used to route LLM tokens
+current_stream: ContextVar[Optional['EventStream']] = ContextVar('current_stream', default=None)
+
+class EventStream:
+    """Ordered event buffer for one crew run
+    
+    Events are kept (up to max_events) so late subscribers can replay them.
+    """
+    
+    def __init__(self, max_events: int = 5000):
+        self.max_events = max_events
+        self._events = []
+        self._first_seq = 0
+        self._condition = threading.Condition()
+        self.closed = False
+    
+    def emit(self, event_type: str, **data):
+        """Append an event and wake up subscribers"""
+        with self._condition:
+            if self.closed:
+                return
+            self._events.append({
+                'seq': self._first_seq + len(self._events),
+                'type': event_type,
+                'time': time.time(),
+                'data': data
+            })
+            
+            # Drop the oldest quarter in one go once the buffer overflows
+            if len(self._events) > self.max_events:
+                dropped = max(1, self.max_events // 4)
+                del self._events[:dropped]
+                self._first_seq += dropped
+            
+            self._condition.notify_all()
+    
+    def close(self):
+        """Mark the stream finished; subscribers drain and stop"""
+        with self._condition:
+            self.closed = True
+            self._condition.notify_all()
+    
+    def iter_events(self, start: int = 0, keepalive: float = 15) -> Iterator[Optional[Dict[str, Any]]]:
+        """Yield events from sequence number start until the stream closes
+        
+        None is yielded after keepalive seconds without events so callers
+        can send a heartbeat.
+        """
+        position = start
+        while True:
+            with self._condition:
+                pending = self._pending(position)
+                if not pending and not self.closed:
+                    self._condition.wait(keepalive)
+                    pending = self._pending(position)
+                closed = self.closed
+            
+            if pending:
+                for event in pending:
+                    yield event
+                position = pending[-1]['seq'] + 1
+            elif closed:
+                return
+            else:
+                yield None
+    
+    def _pending(self, position: int):
+        """Events at or after a sequence number (condition held)"""
+        return self._events[max(0, position - self._first_seq):]
+
+def emit(event_type: str, **data):
+    """Emit an event on the stream bound to the current thread, if any"""
+    stream = current_stream.get()
+    if stream is not None:
+        stream.emit(event_type, **data)
@@ -0,0 +1,185 @@
+"""
+Execution Context - Request-scoped crew state
+Holds the LLM configuration and results of a single crew run
+"""
+
+import time
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional
+
+class CrewCancelledError(Exception):
+    """Raised inside a crew run once its request has been cancelled"""
+
+class CrewDeadlineExceeded(CrewCancelledError):
+    """Raised inside a crew run once its deadline has passed"""
+
+class CrewExecutionError(Exception):
+    """A crew run failed; stage says where (analysis, crew_build or execution)"""
+    
+    def __init__(self, message: str, stage: str = None, provider: str = None):
+        super().__init__(message)
+        self.stage = stage
+        self.provider = provider
+
+@dataclass
+class ExecutionContext:
+    """LLM configuration and tracking data for one request"""
+    provider: str
+    model: str
+    llm: Any
+    temperature: Optional[float] = None
+    execution_mode: str = 'sequential'
+    analysis_llm: Any = None
+    analysis_model: Optional[str] = None
+    summary_llm: Any = None
+    latency_budget: Optional[float] = None
+    cost_budget: Optional[float] = None
+    # Seconds a run may take; process_task turns it into an absolute deadline
+    timeout: Optional[float] = None
+    deadline: Optional[float] = None
+    plan: Dict[str, Any] = field(default_factory=dict)
+    # Stage the run is in (analysis, crew_build or execution), for errors and partial results
+    stage: str = 'analysis'
+    agents: List[Dict[str, str]] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+    usage: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    # LLM spend outside agent turns (task analysis, context summaries)
+    overhead_cost: float = 0.0
+    agent_timings: List[Dict[str, Any]] = field(default_factory=list)
+    compaction: Dict[str, int] = field(default_factory=dict)
+    # CrewAI agents leased from the spawner's agent pool for this request
+    crew_agents: List[Any] = field(default_factory=list, repr=False)
+    events: Any = None
+    progress: Any = None
+    cancel_event: threading.Event = field(default_factory=threading.Event)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+    
+    def reset_run(self):
+        """Drop the state of an earlier run, so a reused context reports only the next one
+        
+        The cancel event is kept: a cancel requested before the run starts
+        still applies.
+        """
+        with self._lock:
+            self.deadline = None
+            self.plan = {}
+            self.stage = 'analysis'
+            self.agents = []
+            self.timings = {}
+            self.usage = {}
+            self.overhead_cost = 0.0
+            self.agent_timings = []
+            self.compaction = {}
+            self.progress = None
+    
+    def emit(self, event_type: str, **data):
+        """Publish a progress event if someone is listening"""
+        if self.events is not None:
+            self.events.emit(event_type, **data)
+    
+    def check_cancelled(self):
+        """Abort the run between steps once cancelled or past its deadline"""
+        if self.cancel_event.is_set():
+            raise CrewCancelledError("Crew run was cancelled")
+        if self.deadline is not None and time.time() >= self.deadline:
+            limit = f" of {self.timeout:g}s" if self.timeout else ""
+            raise CrewDeadlineExceeded(f"Crew run exceeded its deadline{limit}")
+    
+    def time_remaining(self) -> Optional[float]:
+        """Seconds left before the deadline, None without one"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.time())
+    
+    def record_rate_limit_wait(self, seconds: float):
+        """Add time this request spent waiting on provider rate limits"""
+        with self._lock:
+            self.timings['rate_limit_wait'] = self.timings.get('rate_limit_wait', 0) + seconds
+        self.emit('rate_limited', wait=seconds)
+
+    def record_llm_usage(self, provider: str, model: str, prompt_tokens: int, completion_tokens: int,
+                         cost: float, seconds: float, overhead: bool = False):
+        """Add one LLM call to this request's usage breakdown
+        
+        Calls made during analysis, or flagged overhead, also count toward
+        overhead_cost.
+        """
+        with self._lock:
+            usage = self.usage.setdefault(f'{provider}/{model}', {
+                'requests': 0, 'prompt_tokens': 0, 'completion_tokens': 0, 'cost_usd': 0.0, 'seconds': 0.0
+            })
+            usage['requests'] += 1
+            usage['prompt_tokens'] += prompt_tokens
+            usage['completion_tokens'] += completion_tokens
+            usage['cost_usd'] += cost
+            usage['seconds'] += seconds
+            if overhead or self.stage == 'analysis':
+                self.overhead_cost += cost
+    
+    def record_overhead_usage(self, provider: str, model: str, prompt_tokens: int, completion_tokens: int,
+                              cost: float, seconds: float):
+        """record_llm_usage for clients that never run agent turns (analysis, summaries)"""
+        self.record_llm_usage(provider, model, prompt_tokens, completion_tokens, cost, seconds, overhead=True)
+    
+    def record_compaction(self, tokens_before: int, tokens_after: int, tokens_saved: int):
+        """Add one compacted task output to this request's totals"""
+        with self._lock:
+            for key, value in (('outputs', 1), ('tokens_before', tokens_before),
+                               ('tokens_after', tokens_after), ('prompt_tokens_saved', tokens_saved)):
+                self.compaction[key] = self.compaction.get(key, 0) + value
+    
+    def record_agent_time(self, index: int, agent: str, seconds: float):
+        """Record how long an agent spent on its task"""
+        with self._lock:
+            self.agent_timings.append({'index': index, 'agent': agent, 'seconds': seconds})
+
+@dataclass
+class CrewResult:
+    """Outcome of MetaCrewSpawner.process_task"""
+    result: str
+    agents: List[Dict[str, str]]
+    execution_time: float
+    timings: Dict[str, float]
+    provider: str
+    model: str
+    cached: bool = False
+    execution_mode: str = 'sequential'
+    usage: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    # The part of usage's cost spent outside agent turns (analysis, summaries)
+    overhead_cost: float = 0.0
+    agent_timings: List[Dict[str, Any]] = field(default_factory=list)
+    compaction: Dict[str, int] = field(default_factory=dict)
+    plan: Dict[str, Any] = field(default_factory=dict)
+    # "completed", or "deadline_exceeded" with the outputs of the tasks that finished
+    status: str = 'completed'
+    error: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for API responses and job records"""
+        return {
+            'status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'agents_created': self.agents,
+            'execution_time': self.execution_time,
+            'timings': self.timings,
+            'llm_provider': self.provider,
+            'model': self.model,
+            'cached': self.cached,
+            'execution_mode': self.execution_mode,
+            'plan': self.plan,
+            'metrics': self.metrics()
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        """Per-request breakdown: stage timings, agent timings, tokens and cost"""
+        return {
+            'stages': self.timings,
+            'agents': self.agent_timings,
+            'llm': self.usage,
+            'prompt_tokens': sum(u['prompt_tokens'] for u in self.usage.values()),
+            'completion_tokens': sum(u['completion_tokens'] for u in self.usage.values()),
+            'cost_usd': sum(u['cost_usd'] for u in self.usage.values()),
+            'context_compaction': self.compaction
+        }
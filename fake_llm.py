@@ -0,0 +1,194 @@
+"""
+Fake LLM - Deterministic offline chat model
+Scripted or schema-valid replies with configurable latency, token rate and error injection, for benchmarks and tests
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.pydantic_v1 import PrivateAttr
+
+FILLER_WORDS = (
+    'the team reviewed the request and prepared a structured answer covering the main points '
+    'key findings recommendations and next steps with supporting detail for each item'
+).split()
+
+class FakeLLMError(Exception):
+    """Injected provider error; status_code drives the router's retry handling"""
+    
+    def __init__(self, message: str, status_code: int = 500):
+        super().__init__(message)
+        self.status_code = status_code
+
+class FakeChatModel(BaseChatModel):
+    """Chat model that answers locally without any API calls
+    
+    Replies cycle through responses when given. Otherwise task analysis
+    prompts get a valid analysis JSON object and everything else gets a
+    CrewAI-style "Final Answer" of completion_tokens words. Each call
+    sleeps latency +/- jitter plus completion_tokens / tokens_per_second,
+    and fails with probability error_rate. A call slower than its
+    timeout (per call or on the model) fails with a 408 after timeout
+    seconds. Random draws come from a generator seeded with seed.
+    """
+    
+    model: str = 'fake'
+    temperature: Optional[float] = None
+    max_tokens: Optional[int] = None
+    max_retries: int = 0
+    streaming: bool = False
+    responses: List[str] = []
+    latency: float = 0.05
+    jitter: float = 0.0
+    tokens_per_second: float = 0.0
+    completion_tokens: int = 200
+    error_rate: float = 0.0
+    error_status: int = 500
+    timeout: Optional[float] = None
+    seed: int = 0
+    
+    _rng: Any = PrivateAttr(default=None)
+    _lock: Any = PrivateAttr(default=None)
+    _calls: int = PrivateAttr(default=0)
+    
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+        self._calls = 0
+    
+    @classmethod
+    def from_env(cls, **kwargs: Any) -> 'FakeChatModel':
+        """Build a fake model configured from the FAKE_LLM_* environment variables"""
+        settings = {
+            'latency': float(os.getenv('FAKE_LLM_LATENCY', 0.05)),
+            'jitter': float(os.getenv('FAKE_LLM_JITTER', 0)),
+            'tokens_per_second': float(os.getenv('FAKE_LLM_TOKENS_PER_SECOND', 0)),
+            'completion_tokens': int(os.getenv('FAKE_LLM_COMPLETION_TOKENS', 200)),
+            'error_rate': float(os.getenv('FAKE_LLM_ERROR_RATE', 0)),
+            'error_status': int(os.getenv('FAKE_LLM_ERROR_STATUS', 500)),
+            'seed': int(os.getenv('FAKE_LLM_SEED', 0))
+        }
+        
+        responses_path = os.getenv('FAKE_LLM_RESPONSES')
+        if responses_path:
+            with open(responses_path, 'r', encoding='utf-8') as f:
+                responses = json.load(f)
+            if not isinstance(responses, list) or not all(isinstance(r, str) for r in responses):
+                raise ValueError(f"{responses_path} must contain a JSON list of strings")
+            settings['responses'] = responses
+        
+        settings.update(kwargs)
+        return cls(**settings)
+    
+    @property
+    def _llm_type(self) -> str:
+        return 'fake'
+    
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {'model': self.model, 'seed': self.seed}
+    
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        call, delay, failed = self._next_call()
+        timeout = kwargs.get('timeout', self.timeout)
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise FakeLLMError(f"Fake LLM request timed out after {timeout:g}s", status_code=408)
+        
+        time.sleep(delay)
+        if failed:
+            raise FakeLLMError(f"Injected fake LLM error ({self.error_status})", status_code=self.error_status)
+        
+        content = self._reply(messages, call)
+        words = content.split(' ')
+        token_delay = 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0
+        if self.streaming and run_manager:
+            for i, word in enumerate(words):
+                if token_delay:
+                    time.sleep(token_delay)
+                run_manager.on_llm_new_token(word if i == len(words) - 1 else word + ' ')
+        elif token_delay:
+            time.sleep(len(words) * token_delay)
+        
+        return self._result(messages, content)
+    
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        call, delay, failed = self._next_call()
+        timeout = kwargs.get('timeout', self.timeout)
+        if timeout is not None and delay > timeout:
+            await asyncio.sleep(timeout)
+            raise FakeLLMError(f"Fake LLM request timed out after {timeout:g}s", status_code=408)
+        
+        await asyncio.sleep(delay)
+        if failed:
+            raise FakeLLMError(f"Injected fake LLM error ({self.error_status})", status_code=self.error_status)
+        
+        content = self._reply(messages, call)
+        words = content.split(' ')
+        token_delay = 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0
+        if self.streaming and run_manager:
+            for i, word in enumerate(words):
+                if token_delay:
+                    await asyncio.sleep(token_delay)
+                await run_manager.on_llm_new_token(word if i == len(words) - 1 else word + ' ')
+        elif token_delay:
+            await asyncio.sleep(len(words) * token_delay)
+        
+        return self._result(messages, content)
+    
+    def _next_call(self) -> Tuple[int, float, bool]:
+        """Call number, latency and whether to fail, drawn under the lock"""
+        with self._lock:
+            call = self._calls
+            self._calls += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+            failed = self.error_rate > 0 and self._rng.random() < self.error_rate
+        return call, delay, failed
+    
+    def _result(self, messages: List[BaseMessage], content: str) -> ChatResult:
+        prompt_tokens = sum(len(str(message.content)) for message in messages) // 4 + 1
+        completion_tokens = len(content.split(' '))
+        message = AIMessage(
+            content=content,
+            response_metadata={
+                'model_name': self.model,
+                'token_usage': {
+                    'prompt_tokens': prompt_tokens,
+                    'completion_tokens': completion_tokens,
+                    'total_tokens': prompt_tokens + completion_tokens
+                }
+            }
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+    
+    def _reply(self, messages: List[BaseMessage], call: int) -> str:
+        """Scripted reply, analysis JSON or a CrewAI final answer"""
+        if self.responses:
+            return self.responses[call % len(self.responses)]
+        
+        prompt = '\n'.join(str(message.content) for message in messages)
+        if 'specific_requirements' in prompt and 'Analyze this task:' in prompt:
+            task = prompt.rsplit('Analyze this task:', 1)[1].strip().split('\n')[0][:120]
+            return json.dumps({
+                'specific_requirements': [f'Address the request: {task}'],
+                'key_skills_needed': ['research', 'analysis', 'writing'],
+                'deliverables': ['A written summary with recommendations'],
+                'challenges': ['Limited source material'],
+                'success_criteria': ['Every part of the request is answered']
+            })
+        
+        count = max(1, self.completion_tokens - 6)
+        body = ' '.join(FILLER_WORDS[i % len(FILLER_WORDS)] for i in range(count))
+        return f"Thought: I now know the final answer\nFinal Answer: {body}"
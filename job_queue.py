@@ -0,0 +1,328 @@
+"""
+Job Queue - Background crew execution
+Runs submitted tasks on a bounded worker pool and tracks their status
+"""
+
+import os
+import time
+import uuid
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Callable, Iterator
+
+from events import EventStream, current_stream
+from execution_context import CrewCancelledError
+
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+# Stopped by its timeout; result holds the outputs of the tasks that finished
+JOB_DEADLINE_EXCEEDED = 'deadline_exceeded'
+
+FINISHED_STATES = (JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED, JOB_DEADLINE_EXCEEDED)
+
+@dataclass
+class Job:
+    """A single crew run submitted to the queue"""
+    id: str
+    task: str
+    llm_provider: str
+    model: str = ''
+    options: Dict[str, Any] = field(default_factory=dict)
+    status: str = JOB_QUEUED
+    result: Optional[str] = None
+    error: Optional[str] = None
+    agents_created: List[Dict[str, str]] = field(default_factory=list)
+    execution_time: float = 0
+    timings: Dict[str, float] = field(default_factory=dict)
+    metrics: Dict[str, Any] = field(default_factory=dict)
+    plan: Dict[str, Any] = field(default_factory=dict)
+    cached: bool = False
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    events: EventStream = field(default_factory=EventStream, repr=False)
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    
+    @property
+    def wait_time(self) -> float:
+        """Seconds spent waiting for a free worker"""
+        end = self.started_at if self.started_at is not None else time.time()
+        return end - self.submitted_at
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize job state for API responses"""
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'task': self.task,
+            'llm_provider': self.llm_provider,
+            'model': self.model,
+            'result': self.result,
+            'error': self.error,
+            'agents_created': self.agents_created,
+            'execution_time': self.execution_time,
+            'timings': self.timings,
+            'metrics': self.metrics,
+            'plan': self.plan,
+            'cached': self.cached,
+            'wait_time': self.wait_time,
+            'submitted_at': self.submitted_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+def get_max_concurrent_crews() -> int:
+    """Read the crew concurrency cap from MAX_CONCURRENT_CREWS"""
+    try:
+        value = int(os.getenv('MAX_CONCURRENT_CREWS', 5))
+    except ValueError:
+        print("Warning: invalid MAX_CONCURRENT_CREWS, falling back to 5")
+        value = 5
+    return max(1, value)
+
+def run_crew_job(spawner, job: Job) -> Dict[str, Any]:
+    """Run a job's crew with its own request-scoped context; returns the crew result as a dict"""
+    # Request-scoped context keeps concurrent jobs from sharing LLM state
+    context = spawner.create_context(
+        job.llm_provider,
+        job.model,
+        job.options.get('execution_mode'),
+        streaming=job.options.get('stream', False),
+        latency_budget=job.options.get('latency_budget'),
+        cost_budget=job.options.get('cost_budget'),
+        timeout=job.options.get('timeout')
+    )
+    context.events = job.events
+    context.cancel_event = job.cancel_event
+    
+    # Route streamed tokens from this worker thread to the job's events
+    stream_token = current_stream.set(job.events)
+    try:
+        crew_result = spawner.process_task(
+            job.task,
+            context,
+            analysis=job.options.get('analysis'),
+            use_cache=not job.options.get('bypass_cache', False)
+        )
+    finally:
+        current_stream.reset(stream_token)
+    
+    return crew_result.to_dict()
+
+def create_job_manager(runner: Callable[[Job], Dict[str, Any]]):
+    """Create the job manager selected by JOB_BACKEND
+    
+    "memory" (default) runs crews on this process's worker pool; "durable"
+    queues them in the JOB_STORE_PATH SQLite file for `main.py worker`
+    processes.
+    """
+    backend = os.getenv('JOB_BACKEND', 'memory').lower()
+    
+    if backend == 'durable':
+        from durable_queue import DurableJobManager
+        return DurableJobManager()
+    
+    if backend != 'memory':
+        print(f"Warning: unknown JOB_BACKEND {backend}, using memory")
+    
+    return JobManager(runner)
+
+class JobManager:
+    """Queues crew runs and executes them with bounded concurrency"""
+    
+    def __init__(self, runner: Callable[[Job], Dict[str, Any]], max_workers: int = None,
+                 max_retained: int = 1000):
+        self.runner = runner
+        self.max_workers = max_workers or get_max_concurrent_crews()
+        self.max_retained = max_retained
+        
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='crew-worker')
+        self._lock = threading.Lock()
+        self._finished = threading.Condition(self._lock)
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._done_events: Dict[str, threading.Event] = {}
+        
+        # Recent wait times, used for the queue statistics
+        self._recent_waits = deque(maxlen=100)
+        self._completed_count = 0
+        self._failed_count = 0
+        self._cancelled_count = 0
+        self._deadline_exceeded_count = 0
+    
+    def submit(self, task: str, llm_provider: str, model: str = '', **options) -> Job:
+        """Queue a task and return its job immediately"""
+        job = Job(
+            id=uuid.uuid4().hex,
+            task=task,
+            llm_provider=llm_provider,
+            model=model or '',
+            options=options
+        )
+        
+        with self._lock:
+            self._jobs[job.id] = job
+            self._done_events[job.id] = threading.Event()
+            self._prune()
+        
+        self._executor.submit(self._run, job)
+        return job
+    
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by id"""
+        with self._lock:
+            return self._jobs.get(job_id)
+    
+    def wait(self, job_id: str, timeout: float = None) -> Optional[Job]:
+        """Block until a job has finished (or the timeout expires)"""
+        with self._lock:
+            event = self._done_events.get(job_id)
+        
+        if event is None:
+            return None
+        
+        event.wait(timeout)
+        return self.get(job_id)
+    
+    def as_completed(self, job_ids: List[str]) -> Iterator[Job]:
+        """Yield the given jobs as they finish, in completion order"""
+        pending = set(job_ids)
+        
+        while pending:
+            with self._finished:
+                done = [
+                    job_id for job_id in pending
+                    if job_id not in self._jobs or self._jobs[job_id].status in FINISHED_STATES
+                ]
+                if not done:
+                    self._finished.wait()
+                    continue
+                finished_jobs = [self._jobs.get(job_id) for job_id in done]
+            
+            pending.difference_update(done)
+            for job in finished_jobs:
+                if job is not None:
+                    yield job
+    
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Request cancellation; queued jobs never start, running crews stop at their next step or LLM call"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED_STATES:
+                return job
+            
+            job.cancel_event.set()
+            if job.status != JOB_QUEUED:
+                return job
+            
+            job.status = JOB_CANCELLED
+            job.error = 'Job was cancelled before it started'
+            job.finished_at = time.time()
+            self._cancelled_count += 1
+        
+        self._finish(job)
+        return job
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue depth, running count and wait time statistics"""
+        with self._lock:
+            queued = [job for job in self._jobs.values() if job.status == JOB_QUEUED]
+            running = sum(1 for job in self._jobs.values() if job.status == JOB_RUNNING)
+            recent_waits = list(self._recent_waits)
+            completed = self._completed_count
+            failed = self._failed_count
+            cancelled = self._cancelled_count
+            deadline_exceeded = self._deadline_exceeded_count
+        
+        return {
+            'max_concurrent_crews': self.max_workers,
+            'queue_depth': len(queued),
+            'running': running,
+            'completed': completed,
+            'failed': failed,
+            'cancelled': cancelled,
+            'deadline_exceeded': deadline_exceeded,
+            'oldest_queued_wait': max((job.wait_time for job in queued), default=0),
+            'avg_wait_time': sum(recent_waits) / len(recent_waits) if recent_waits else 0,
+            'max_wait_time': max(recent_waits, default=0)
+        }
+    
+    def shutdown(self, wait: bool = True):
+        """Stop accepting jobs and release the worker pool"""
+        self._executor.shutdown(wait=wait)
+    
+    def _run(self, job: Job):
+        """Execute a job on a worker thread"""
+        with self._lock:
+            if job.status == JOB_CANCELLED:
+                return
+            job.status = JOB_RUNNING
+            job.started_at = time.time()
+            self._recent_waits.append(job.wait_time)
+        
+        job.events.emit('job_started', job_id=job.id, wait_time=job.wait_time)
+        
+        try:
+            outcome = self.runner(job)
+            
+            with self._lock:
+                job.result = outcome.get('result')
+                job.agents_created = outcome.get('agents_created', [])
+                job.execution_time = outcome.get('execution_time', 0)
+                job.timings = outcome.get('timings', {})
+                job.metrics = outcome.get('metrics', {})
+                job.plan = outcome.get('plan', {})
+                job.cached = outcome.get('cached', False)
+                job.error = outcome.get('error')
+                if outcome.get('status') == JOB_DEADLINE_EXCEEDED:
+                    job.status = JOB_DEADLINE_EXCEEDED
+                    self._deadline_exceeded_count += 1
+                else:
+                    job.status = JOB_COMPLETED
+                    self._completed_count += 1
+        
+        except CrewCancelledError as e:
+            with self._lock:
+                job.error = str(e)
+                job.status = JOB_CANCELLED
+                self._cancelled_count += 1
+        
+        except Exception as e:
+            with self._lock:
+                job.error = str(e)
+                job.status = JOB_FAILED
+                self._failed_count += 1
+        
+        finally:
+            with self._lock:
+                job.finished_at = time.time()
+            self._finish(job)
+    
+    def _finish(self, job: Job):
+        """Publish the final state and wake up waiters"""
+        job.events.emit('job_finished', **job.to_dict())
+        job.events.close()
+        
+        with self._lock:
+            event = self._done_events.get(job.id)
+            self._finished.notify_all()
+        if event:
+            event.set()
+    
+    def _prune(self):
+        """Drop the oldest finished jobs beyond the retention limit (lock held)"""
+        excess = len(self._jobs) - self.max_retained
+        if excess <= 0:
+            return
+        
+        for job_id in list(self._jobs.keys()):
+            if excess <= 0:
+                break
+            if self._jobs[job_id].status in FINISHED_STATES:
+                del self._jobs[job_id]
+                self._done_events.pop(job_id, None)
+                excess -= 1
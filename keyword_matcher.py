@@ -0,0 +1,144 @@
+"""
+Keyword Matcher - Precompiled keyword classification
+First-match classification rules, and single-pass hit counts for every keyword category
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+TOKEN_PATTERN = re.compile(r'[^\W_]+')
+
+def tokenize(text: str) -> List[str]:
+    """Split text into case-folded word tokens ("in-depth" -> ["in", "depth"])"""
+    return TOKEN_PATTERN.findall(text.casefold())
+
+def inflections(word: str) -> List[str]:
+    """Common English inflections of a keyword (plural, -ing, -ed, -ion...)"""
+    # Abbreviations such as "ai" are matched exactly
+    if len(word) <= 2:
+        return [word]
+    
+    if word.endswith('e'):
+        stem = word[:-1]
+        variants = [word, word + 's', word + 'd', word + 'r', word + 'rs',
+                    stem + 'ing', stem + 'ion', stem + 'ions', stem + 'ation']
+        if word.endswith('yze'):
+            # analyze -> analysis
+            variants += [word[:-3] + 'ysis', word[:-3] + 'yses']
+    elif word.endswith('y') and word[-2] not in 'aeiou':
+        stem = word[:-1]
+        variants = [word, word + 'ing', stem + 'ies', stem + 'ied']
+    else:
+        variants = [word, word + 's', word + 'es', word + 'er', word + 'ers', word + 'ing', word + 'ed']
+        if (len(word) <= 4 and word[-1] not in 'aeiouwxy'
+                and word[-2] in 'aeiou' and word[-3] not in 'aeiou'):
+            # plan -> planning, planned
+            variants += [word + word[-1] + 'ing', word + word[-1] + 'ed', word + word[-1] + 'er']
+    
+    return variants
+
+def first_match_rules(categories: Dict[str, List[str]]) -> Tuple[Tuple[str, str], ...]:
+    """Flatten categories into (keyword, category) pairs in priority order
+    
+    A keyword already listed under an earlier category is dropped: it can
+    never be the first hit for a later one.
+    """
+    seen = set()
+    rules = []
+    for category, keywords in categories.items():
+        for keyword in keywords:
+            if keyword not in seen:
+                seen.add(keyword)
+                rules.append((keyword, category))
+    return tuple(rules)
+
+def first_match(rules: Tuple[Tuple[str, str], ...], text: str, default: str) -> str:
+    """Category of the first keyword found as a substring of text"""
+    for keyword, category in rules:
+        if keyword in text:
+            return category
+    return default
+
+def _trie_pattern(keys: List[str]) -> str:
+    """Regex alternation of keys factored into a character trie
+    
+    Sharing prefixes lets the regex engine reject a position after one or
+    two characters instead of trying every keyword there. Spaces in keys
+    match any run of non-word characters.
+    """
+    trie: Dict[str, dict] = {}
+    for key in keys:
+        node = trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[''] = {}
+    
+    def build(node: Dict[str, dict]) -> str:
+        branches = [
+            (r'[\W_]+' if char == ' ' else re.escape(char)) + build(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ''
+        
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        # Greedy optional suffix: the longest keyword at a position wins
+        return '(?:' + body + ')?' if '' in node else body
+    
+    return build(trie)
+
+class KeywordMatcher:
+    """Precompiled matcher scoring keyword categories
+    
+    groups maps a group name (e.g. "domain") to its categories and their
+    keywords. Every keyword form is compiled into one trie-shaped regex, so
+    a single scan of the text finds all hits. Keywords match on whole
+    words, multi-word keywords match as phrases, and single words also
+    match their common inflections.
+    """
+    
+    def __init__(self, groups: Dict[str, Dict[str, List[str]]], inflect: bool = True):
+        self.groups = {group: list(categories) for group, categories in groups.items()}
+        
+        # keyword form ("planning", "machine learning") -> (group, category) pairs
+        index: Dict[str, set] = {}
+        
+        for group, categories in groups.items():
+            for category, keywords in categories.items():
+                for keyword in keywords:
+                    tokens = tokenize(keyword)
+                    if not tokens:
+                        continue
+                    
+                    if len(tokens) == 1 and inflect:
+                        forms = inflections(tokens[0])
+                    else:
+                        forms = [' '.join(tokens)]
+                    
+                    for form in forms:
+                        index.setdefault(form, set()).add((group, category))
+        
+        self._index: Dict[str, Tuple[Tuple[str, str], ...]] = {
+            form: tuple(sorted(targets)) for form, targets in index.items()
+        }
+        self._pattern = re.compile(r'\b(?:' + _trie_pattern(list(self._index)) + r')\b')
+    
+    def score(self, text: str) -> Dict[str, Dict[str, int]]:
+        """Count keyword hits per group and category (only groups and categories with hits)"""
+        scores: Dict[str, Dict[str, int]] = {}
+        index = self._index
+        
+        for hit in self._pattern.findall(text.casefold()):
+            targets = index.get(hit)
+            if targets is None:
+                # Phrase matched across punctuation, e.g. "in-depth"
+                targets = index[' '.join(tokenize(hit))]
+            
+            for group, category in targets:
+                group_scores = scores.get(group)
+                if group_scores is None:
+                    scores[group] = {category: 1}
+                else:
+                    group_scores[category] = group_scores.get(category, 0) + 1
+        
+        return scores
@@ -0,0 +1,21 @@
+"""
+LLM Callbacks - LangChain callback handlers attached to provider clients
+Imported only when clients are built, since it pulls in LangChain
+"""
+
+from typing import Any
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from events import emit
+
+class TokenStreamHandler(BaseCallbackHandler):
+    """Forwards streamed LLM tokens to the current thread's event stream
+    
+    Shared by every cached streaming client; the target stream comes from
+    the current_stream context variable.
+    """
+    
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        if token:
+            emit('token', token=token)
@@ -0,0 +1,112 @@
+"""
+LLM Memo - Content-addressed memoization of individual LLM calls
+Records responses on disk keyed by provider, model, parameters and messages for read-through or offline replay
+"""
+
+import os
+import json
+import threading
+from typing import Dict, Any, List
+
+from cache import SQLiteCache, make_cache_key
+
+# off: always call the provider; read_through: reuse recorded calls, record new ones;
+# record: always call and overwrite recordings; replay: recorded calls only, never the network
+MEMO_MODES = ('off', 'read_through', 'record', 'replay')
+
+class MemoMissError(Exception):
+    """Raised in replay mode when a call has no recording"""
+
+class LLMMemo:
+    """On-disk memo of LLM responses
+    
+    A key covers the requested provider and model, the call parameters
+    and the full message list, so any change to a prompt is a new entry.
+    Responses are stored as plain JSON (content and metadata) in a SQLite
+    file that can be copied between machines.
+    """
+    
+    def __init__(self, mode: str = None, path: str = None, max_size: int = None):
+        mode = (mode or os.getenv('LLM_MEMO_MODE', 'off')).lower()
+        if mode not in MEMO_MODES:
+            raise ValueError(f"Unsupported LLM_MEMO_MODE: {mode}")
+        
+        self.mode = mode
+        self.path = path or os.getenv('LLM_MEMO_PATH', 'meta_crew_llm_memo.db')
+        self.max_size = max_size if max_size is not None else int(os.getenv('LLM_MEMO_MAX_ENTRIES', 100000))
+        self._store = None
+        self._stats = {'replayed': 0, 'recorded': 0, 'missed': 0}
+        self._lock = threading.Lock()
+        
+        if self.enabled:
+            # Recordings never expire; the oldest unused ones are evicted past max_size
+            self._store = SQLiteCache(self.path, namespace='llm_calls', max_size=self.max_size, ttl=0)
+    
+    @property
+    def enabled(self) -> bool:
+        return self.mode != 'off'
+    
+    def key(self, provider: str, model: str, params: Dict[str, Any], messages: List[Any]) -> str:
+        """Content address of one call"""
+        return make_cache_key('llm_call', provider, model, params, serialize_messages(messages))
+    
+    def lookup(self, key: str):
+        """Recorded response for key, or None when the call should go to the provider
+        
+        Raises MemoMissError in replay mode when nothing was recorded.
+        """
+        if self.mode not in ('read_through', 'replay'):
+            return None
+        
+        record = self._store.get(key)
+        if record is not None:
+            self._count('replayed')
+            return deserialize_response(record)
+        
+        self._count('missed')
+        if self.mode == 'replay':
+            raise MemoMissError(f"No recorded LLM response for call {key[:12]} (LLM_MEMO_MODE=replay)")
+        return None
+    
+    def store(self, key: str, response: Any):
+        """Record a live response"""
+        if self.mode in ('read_through', 'record'):
+            self._store.set(key, serialize_response(response))
+            self._count('recorded')
+    
+    def _count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Mode, replay/record counts and the size of the recording"""
+        with self._lock:
+            stats = {'mode': self.mode, **self._stats}
+        if self._store is not None:
+            stats['size'] = len(self._store)
+            stats['path'] = self.path
+        return stats
+
+def serialize_messages(messages: Any) -> List[List[Any]]:
+    """Message types and contents; ids and callbacks don't affect the answer"""
+    if isinstance(messages, str):
+        return [['human', messages]]
+    return [[getattr(message, 'type', 'human'), getattr(message, 'content', message)] for message in messages]
+
+def serialize_response(response: Any) -> Dict[str, Any]:
+    """JSON-safe copy of a chat response (provider metadata may hold SDK objects)"""
+    record = {
+        'content': getattr(response, 'content', str(response)),
+        'response_metadata': getattr(response, 'response_metadata', None) or {},
+        'additional_kwargs': getattr(response, 'additional_kwargs', None) or {}
+    }
+    return json.loads(json.dumps(record, default=str))
+
+def deserialize_response(record: Dict[str, Any]):
+    from langchain_core.messages import AIMessage
+    
+    return AIMessage(
+        content=record['content'],
+        response_metadata={**record.get('response_metadata', {}), 'memoized': True},
+        additional_kwargs=record.get('additional_kwargs', {})
+    )
@@ -0,0 +1,651 @@
+"""
+LLM Router - Provider failover and hedged requests
+Circuit breakers, rate limits and latency/error statistics for every configured provider
+"""
+
+import os
+import time
+import asyncio
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Any, Optional, Tuple
+
+import metrics
+from events import emit
+from llm_memo import LLMMemo
+from rate_limiter import (
+    RateLimiter, RateLimitWaitExceeded, is_rate_limit_error, is_retryable_error, retry_after_seconds,
+    estimate_tokens, response_token_counts
+)
+
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half_open'
+
+class LLMUnavailableError(Exception):
+    """Raised when every candidate provider failed or has an open circuit"""
+
+class LLMDeadlineExceeded(TimeoutError):
+    """Raised when a call's deadline passes before any provider answered"""
+
+class CircuitBreaker:
+    """Stops sending requests to a provider after repeated failures
+    
+    After failure_threshold consecutive failures the circuit opens for
+    reset_timeout seconds; then a single trial request is let through and
+    its outcome closes or re-opens the circuit.
+    """
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+    
+    def allow(self) -> bool:
+        """Whether a request may be sent now"""
+        with self._lock:
+            state = self._state()
+            if state == CIRCUIT_CLOSED:
+                return True
+            if state == CIRCUIT_HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+    
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+    
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.time()
+            self._trial_in_flight = False
+    
+    def release(self):
+        """Give back a half-open trial that ended without a verdict"""
+        with self._lock:
+            self._trial_in_flight = False
+    
+    def _state(self) -> str:
+        if self.opened_at is None:
+            return CIRCUIT_CLOSED
+        if time.time() - self.opened_at >= self.reset_timeout:
+            return CIRCUIT_HALF_OPEN
+        return CIRCUIT_OPEN
+
+class ProviderStats:
+    """Request counts and recent latencies for one provider"""
+    
+    def __init__(self, window: int = 200):
+        self.requests = 0
+        self.failures = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.last_error = None
+        self.latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+    
+    def record(self, latency: float, error: Exception = None):
+        with self._lock:
+            self.requests += 1
+            if error is None:
+                self.latencies.append(latency)
+            else:
+                self.failures += 1
+                self.last_error = str(error)
+    
+    def record_hedge(self, won: bool = False):
+        with self._lock:
+            if won:
+                self.hedge_wins += 1
+            else:
+                self.hedges += 1
+    
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Latency percentile of recent successful requests (seconds)"""
+        with self._lock:
+            ordered = sorted(self.latencies)
+        if not ordered:
+            return None
+        return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            requests, failures = self.requests, self.failures
+            hedges, hedge_wins, last_error = self.hedges, self.hedge_wins, self.last_error
+        return {
+            'requests': requests,
+            'failures': failures,
+            'error_rate': failures / requests if requests else 0,
+            'latency_p50': self.percentile(0.5),
+            'latency_p95': self.percentile(0.95),
+            'hedges': hedges,
+            'hedge_wins': hedge_wins,
+            'last_error': last_error
+        }
+
+class LLMRouter:
+    """Routes LLM calls across providers with failover and optional hedging
+    
+    A request is sent to the preferred provider first. If it fails, or
+    its circuit is open, the next configured provider (with its default
+    or analysis model) is tried. Hedged requests start a second provider
+    once the first has been slower than its recent p95 and return
+    whichever answers first.
+    """
+    
+    def __init__(self, llm_selector, failure_threshold: int = None, reset_timeout: float = None):
+        self.llm_selector = llm_selector
+        
+        if failure_threshold is None:
+            failure_threshold = int(os.getenv('CIRCUIT_FAILURE_THRESHOLD', 5))
+        if reset_timeout is None:
+            reset_timeout = float(os.getenv('CIRCUIT_RESET_TIMEOUT', 30))
+        
+        self.failover_enabled = os.getenv('LLM_FAILOVER', 'True').lower() == 'true'
+        self.hedge_analysis = os.getenv('HEDGE_ANALYSIS', 'False').lower() == 'true'
+        # Fixed hedge delay in seconds; by default the primary's recent p95 is used
+        self.hedge_delay = float(os.getenv('HEDGE_DELAY')) if os.getenv('HEDGE_DELAY') else None
+        self.default_hedge_delay = 2.0
+        # Per-attempt timeout in seconds (0 keeps the SDK default); a call's deadline can shorten it
+        self.request_timeout = float(os.getenv('LLM_REQUEST_TIMEOUT', 0)) or None
+        
+        self.breakers = {
+            provider: CircuitBreaker(failure_threshold, reset_timeout)
+            for provider in llm_selector.providers
+        }
+        self.stats = {provider: ProviderStats() for provider in llm_selector.providers}
+        self.limiter = RateLimiter()
+        self.memo = LLMMemo()
+        self._hedge_executor = None
+        self._executor_lock = threading.Lock()
+    
+    def candidates(self, provider: str, model: str = None, analysis: bool = False) -> List[Tuple[str, str]]:
+        """(provider, model) pairs to try, preferred first"""
+        if analysis:
+            model = model or self.llm_selector.get_analysis_model(provider)
+        else:
+            model = model or self.llm_selector.providers[provider]['default_model']
+        
+        candidates = [(provider, model)]
+        if not self.failover_enabled or not self._can_failover(provider):
+            return candidates
+        
+        for other in self.llm_selector.providers:
+            if other != provider and self._can_failover(other) and self.llm_selector.validate_provider(other):
+                config = self.llm_selector.providers[other]
+                other_model = self.llm_selector.get_analysis_model(other) if analysis else config['default_model']
+                candidates.append((other, other_model))
+        
+        return candidates
+    
+    def _can_failover(self, provider: str) -> bool:
+        return self.llm_selector.providers[provider].get('failover', True)
+    
+    def invoke(self, candidates: List[Tuple[str, str]], messages: List[Any], analysis: bool = False,
+               streaming: bool = False, hedge: bool = False, wait_callback=None, usage_callback=None,
+               timeout: float = None, **kwargs):
+        """Send messages to the first healthy candidate, failing over on errors
+        
+        wait_callback receives the seconds spent waiting on rate limits and
+        usage_callback the tokens, cost and latency of each successful call.
+        timeout bounds the whole call, rate limit waits, retries and
+        failover included; LLMDeadlineExceeded is raised once it runs out.
+        With LLM_MEMO_MODE set, calls are memoized under the preferred
+        candidate, whichever provider actually answered.
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        
+        memo_key, response = self._memo_lookup(candidates, messages, analysis, streaming, kwargs)
+        if response is not None:
+            return response
+        
+        response = self._invoke(
+            candidates, messages, analysis, streaming, hedge, wait_callback, usage_callback, deadline, **kwargs
+        )
+        if memo_key:
+            self.memo.store(memo_key, response)
+        return response
+    
+    async def ainvoke(self, candidates: List[Tuple[str, str]], messages: List[Any], analysis: bool = False,
+                      streaming: bool = False, hedge: bool = False, wait_callback=None, usage_callback=None,
+                      timeout: float = None, **kwargs):
+        """Async invoke: awaits the clients' ainvoke, so waiting calls don't hold a thread
+        
+        Attempts are bounded with asyncio timeouts, which also covers SDKs
+        without a per-request timeout, and losing hedged requests are
+        cancelled instead of left running.
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        
+        memo_key, response = self._memo_lookup(candidates, messages, analysis, streaming, kwargs)
+        if response is not None:
+            return response
+        
+        response = await self._ainvoke(
+            candidates, messages, analysis, streaming, hedge, wait_callback, usage_callback, deadline, **kwargs
+        )
+        if memo_key:
+            self.memo.store(memo_key, response)
+        return response
+    
+    def _memo_lookup(self, candidates: List[Tuple[str, str]], messages: List[Any], analysis: bool,
+                     streaming: bool, kwargs: Dict[str, Any]) -> Tuple[Optional[str], Any]:
+        """Memo key of a call (None when memoization is off) and its recorded response"""
+        if not self.memo.enabled or not candidates:
+            return None, None
+        
+        provider, model = candidates[0]
+        memo_key = self.memo.key(provider, model, {'analysis': analysis, **kwargs}, messages)
+        response = self.memo.lookup(memo_key)
+        if response is not None:
+            metrics.llm_memo_hits.inc(provider=provider, model=model)
+            if streaming:
+                # Streaming clients still see the reply, in one chunk
+                emit('token', token=response.content)
+        return memo_key, response
+        
+    def _candidate_picker(self, candidates: List[Tuple[str, str]], errors: List[str]):
+        """Function returning the next candidate whose circuit lets a request through"""
+        remaining = iter(candidates)
+        
+        def next_candidate() -> Optional[Tuple[str, str]]:
+            # Breakers are consulted only right before use, so a half-open
+            # provider's single trial is not claimed by a request that never reaches it
+            for candidate in remaining:
+                if self.breakers[candidate[0]].allow():
+                    return candidate
+                errors.append(f'{candidate[0]}: circuit open')
+            return None
+        
+        return next_candidate
+    
+    def _invoke(self, candidates: List[Tuple[str, str]], messages: List[Any], analysis: bool,
+                streaming: bool, hedge: bool, wait_callback=None, usage_callback=None,
+                deadline: float = None, **kwargs):
+        """Failover loop behind invoke"""
+        errors = []
+        next_candidate = self._candidate_picker(candidates, errors)
+        candidate = next_candidate()
+        
+        if hedge and candidate:
+            try:
+                return self._hedged(
+                    candidate, next_candidate, messages, analysis, streaming, wait_callback, usage_callback,
+                    deadline, **kwargs
+                )
+            except Exception as e:
+                errors.append(str(e))
+            candidate = next_candidate()
+        
+        while candidate:
+            try:
+                return self._call(
+                    candidate, messages, analysis, streaming, wait_callback, usage_callback, deadline, **kwargs
+                )
+            except LLMDeadlineExceeded:
+                # Out of time: the other providers can't answer in time either
+                raise
+            except Exception as e:
+                errors.append(f'{candidate[0]}: {e}')
+                print(f"Warning: {candidate[0]} request failed, trying next provider: {e}")
+            candidate = next_candidate()
+        
+        raise LLMUnavailableError('All LLM providers failed: ' + '; '.join(errors))
+    
+    async def _ainvoke(self, candidates: List[Tuple[str, str]], messages: List[Any], analysis: bool,
+                       streaming: bool, hedge: bool, wait_callback=None, usage_callback=None,
+                       deadline: float = None, **kwargs):
+        """Failover loop behind ainvoke"""
+        errors = []
+        next_candidate = self._candidate_picker(candidates, errors)
+        candidate = next_candidate()
+        
+        if hedge and candidate:
+            try:
+                return await self._ahedged(
+                    candidate, next_candidate, messages, analysis, streaming, wait_callback, usage_callback,
+                    deadline, **kwargs
+                )
+            except Exception as e:
+                errors.append(str(e))
+            candidate = next_candidate()
+        
+        while candidate:
+            try:
+                return await self._acall(
+                    candidate, messages, analysis, streaming, wait_callback, usage_callback, deadline, **kwargs
+                )
+            except LLMDeadlineExceeded:
+                raise
+            except Exception as e:
+                errors.append(f'{candidate[0]}: {e}')
+                print(f"Warning: {candidate[0]} request failed, trying next provider: {e}")
+            candidate = next_candidate()
+        
+        raise LLMUnavailableError('All LLM providers failed: ' + '; '.join(errors))
+    
+    def _call(self, candidate: Tuple[str, str], messages: List[Any], analysis: bool,
+              streaming: bool, wait_callback=None, usage_callback=None, deadline: float = None, **kwargs):
+        """Invoke one provider within its rate limits and record the outcome
+        
+        Rate limits and transient errors are retried here with jittered
+        backoff (429s honor Retry-After) before the call counts as a
+        failure for the circuit breaker. Waits and attempt timeouts are cut
+        to the time left before deadline.
+        """
+        provider, model = candidate
+        estimated_tokens = estimate_tokens(messages)
+        start_time = time.time()
+        attempt = 0
+        
+        try:
+            client = self._client(provider, model, analysis, streaming)
+            
+            while True:
+                waited = self._reserve(provider, model, estimated_tokens, deadline)
+                try:
+                    if waited > 0:
+                        time.sleep(waited)
+                        if wait_callback:
+                            wait_callback(waited)
+                
+                    call_kwargs = kwargs
+                    timeout = self._attempt_timeout(provider, deadline)
+                    if timeout is not None and self.llm_selector.providers[provider].get('call_timeout'):
+                        call_kwargs = {**kwargs, 'timeout': timeout}
+                except BaseException:
+                    # The request never went out
+                    self.limiter.refund(provider, model, estimated_tokens)
+                    raise
+                
+                try:
+                    response = client.invoke(messages, **call_kwargs)
+                    break
+                except Exception as e:
+                    time.sleep(self._retry_delay(provider, model, attempt, e, deadline))
+                    attempt += 1
+        except Exception as e:
+            failure = self._record_failure(provider, model, start_time, e, deadline)
+            if failure is e:
+                raise
+            raise failure from e
+            
+        return self._record_success(provider, model, start_time, response, estimated_tokens, usage_callback)
+    
+    async def _acall(self, candidate: Tuple[str, str], messages: List[Any], analysis: bool,
+                     streaming: bool, wait_callback=None, usage_callback=None, deadline: float = None, **kwargs):
+        """Async _call: same retries and accounting, sleeping and waiting on the event loop"""
+        provider, model = candidate
+        estimated_tokens = estimate_tokens(messages)
+        start_time = time.time()
+        attempt = 0
+        
+        try:
+            client = self._client(provider, model, analysis, streaming)
+            
+            while True:
+                waited = self._reserve(provider, model, estimated_tokens, deadline)
+                try:
+                    if waited > 0:
+                        await asyncio.sleep(waited)
+                        if wait_callback:
+                            wait_callback(waited)
+                    timeout = self._attempt_timeout(provider, deadline)
+                except BaseException:
+                    # Cancelled (e.g. a losing hedge) or out of time before the request went out
+                    self.limiter.refund(provider, model, estimated_tokens)
+                    raise
+                
+                try:
+                    response = await asyncio.wait_for(client.ainvoke(messages, **kwargs), timeout)
+                    break
+                except Exception as e:
+                    await asyncio.sleep(self._retry_delay(provider, model, attempt, e, deadline))
+                    attempt += 1
+        except asyncio.CancelledError:
+            # A hedge that lost, or a caller that went away: no verdict on the provider
+            self.breakers[provider].release()
+            raise
+        except Exception as e:
+            failure = self._record_failure(provider, model, start_time, e, deadline)
+            if failure is e:
+                raise
+            raise failure from e
+        
+        return self._record_success(provider, model, start_time, response, estimated_tokens, usage_callback)
+    
+    def _client(self, provider: str, model: str, analysis: bool, streaming: bool):
+        if analysis:
+            return self.llm_selector.create_analysis_llm(provider)
+        return self.llm_selector.create_llm_instance(provider, model, streaming=streaming)
+    
+    def _retry_delay(self, provider: str, model: str, attempt: int, error: Exception,
+                     deadline: Optional[float]) -> float:
+        """Seconds to wait before retrying error; re-raises it when it can't be retried"""
+        if not is_retryable_error(error) or attempt >= self.limiter.max_retries:
+            raise error
+        
+        if is_rate_limit_error(error):
+            # Shared cooldown: every thread using this model waits it out in reserve
+            self.limiter.backoff(provider, model, attempt, retry_after_seconds(error))
+            return 0.0
+        
+        delay = self.limiter.backoff_delay(attempt)
+        time_left = self._time_left(provider, deadline)
+        return delay if time_left is None else min(delay, time_left)
+    
+    def _record_failure(self, provider: str, model: str, start_time: float, error: Exception,
+                        deadline: Optional[float]) -> Exception:
+        """Account for a failed call; returns the exception to raise"""
+        latency = time.time() - start_time
+        metrics.record_llm_call(provider, model, latency, error=error)
+        
+        if isinstance(error, LLMDeadlineExceeded) or (deadline is not None and time.time() >= deadline):
+            # Cut short by the caller's deadline, which says nothing about the provider's health
+            self.breakers[provider].release()
+            if isinstance(error, LLMDeadlineExceeded):
+                return error
+            return LLMDeadlineExceeded(f'{provider}: deadline passed during the call: {error}')
+        
+        self.stats[provider].record(latency, error)
+        self.breakers[provider].record_failure()
+        return error
+    
+    def _record_success(self, provider: str, model: str, start_time: float, response: Any,
+                        estimated_tokens: int, usage_callback=None):
+        """Account for a successful call's latency, tokens and cost; returns the response"""
+        latency = time.time() - start_time
+        prompt_tokens, completion_tokens = response_token_counts(response)
+        if not prompt_tokens and not completion_tokens:
+            # Streamed replies usually carry no usage; estimate from the text
+            prompt_tokens = estimated_tokens
+            completion_tokens = estimate_tokens(getattr(response, 'content', '') or '')
+        
+        self.limiter.record_tokens(provider, model, prompt_tokens + completion_tokens, estimated_tokens)
+        self.stats[provider].record(latency)
+        self.breakers[provider].record_success()
+        
+        cost = metrics.record_llm_call(provider, model, latency, prompt_tokens, completion_tokens)
+        if usage_callback:
+            usage_callback(provider, model, prompt_tokens, completion_tokens, cost, latency)
+        return response
+    
+    def _reserve(self, provider: str, model: str, estimated_tokens: int, deadline: Optional[float]) -> float:
+        """Claim a rate limit slot; returns the seconds to wait before sending
+        
+        Raises LLMDeadlineExceeded, without using quota, when the slot is
+        further away than the time left before deadline.
+        """
+        try:
+            return self.limiter.reserve(
+                provider, model, estimated_tokens, max_wait=self._time_left(provider, deadline)
+            )
+        except RateLimitWaitExceeded as e:
+            raise LLMDeadlineExceeded(str(e)) from e
+    
+    def _time_left(self, provider: str, deadline: Optional[float]) -> Optional[float]:
+        """Seconds left before deadline (None without one); raises once it has passed"""
+        if deadline is None:
+            return None
+        time_left = deadline - time.time()
+        if time_left <= 0:
+            raise LLMDeadlineExceeded(f'{provider}: deadline passed before the provider answered')
+        return time_left
+    
+    def _attempt_timeout(self, provider: str, deadline: Optional[float]) -> Optional[float]:
+        """Seconds one provider attempt may take: the time left, capped by LLM_REQUEST_TIMEOUT"""
+        time_left = self._time_left(provider, deadline)
+        if time_left is None:
+            return self.request_timeout
+        return min(time_left, self.request_timeout) if self.request_timeout else time_left
+    
+    def _hedged(self, primary: Tuple[str, str], next_candidate, messages: List[Any],
+                analysis: bool, streaming: bool, wait_callback=None, usage_callback=None,
+                deadline: float = None, **kwargs):
+        """Start a second provider if the primary is slower than its p95; first answer wins"""
+        executor = self._get_hedge_executor()
+        delay = self.hedge_delay or self.stats[primary[0]].percentile(0.95) or self.default_hedge_delay
+        
+        def submit(candidate):
+            context = contextvars.copy_context()
+            return executor.submit(
+                context.run, self._call, candidate, messages, analysis, streaming,
+                wait_callback, usage_callback, deadline, **kwargs
+            )
+        
+        futures = {submit(primary): primary}
+        pending = set(futures)
+        done, pending = wait(pending, timeout=delay)
+        
+        errors = []
+        secondary = None
+        if done:
+            future = next(iter(done))
+            if future.exception() is None:
+                return future.result()
+            # A fast failure is plain failover, not a hedge
+            errors.append(f'{primary[0]}: {future.exception()}')
+            replacement = next_candidate()
+            if replacement:
+                future = submit(replacement)
+                futures[future] = replacement
+                pending.add(future)
+        else:
+            secondary = next_candidate()
+            if secondary:
+                self.stats[secondary[0]].record_hedge()
+                future = submit(secondary)
+                futures[future] = secondary
+                pending.add(future)
+        
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        if futures[future] == secondary:
+                            self.stats[secondary[0]].record_hedge(won=True)
+                        return future.result()
+                    errors.append(f'{futures[future][0]}: {future.exception()}')
+                
+                    # Replace a failed request with the next provider
+                    replacement = next_candidate()
+                    if replacement:
+                        future = submit(replacement)
+                        futures[future] = replacement
+                        pending.add(future)
+        finally:
+            # A request that hasn't started yet is dropped; one in flight runs to completion
+            for future in pending:
+                future.cancel()
+        
+        raise LLMUnavailableError('; '.join(errors))
+    
+    async def _ahedged(self, primary: Tuple[str, str], next_candidate, messages: List[Any],
+                       analysis: bool, streaming: bool, wait_callback=None, usage_callback=None,
+                       deadline: float = None, **kwargs):
+        """Async _hedged; the slower request is cancelled once one has answered"""
+        delay = self.hedge_delay or self.stats[primary[0]].percentile(0.95) or self.default_hedge_delay
+        
+        def start(candidate):
+            return asyncio.ensure_future(self._acall(
+                candidate, messages, analysis, streaming, wait_callback, usage_callback, deadline, **kwargs
+            ))
+        
+        tasks = {start(primary): primary}
+        pending = set(tasks)
+        errors = []
+        secondary = None
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                task = next(iter(done))
+                if task.exception() is None:
+                    return task.result()
+                # A fast failure is plain failover, not a hedge
+                errors.append(f'{primary[0]}: {task.exception()}')
+                replacement = next_candidate()
+                if replacement:
+                    task = start(replacement)
+                    tasks[task] = replacement
+                    pending.add(task)
+            else:
+                secondary = next_candidate()
+                if secondary:
+                    self.stats[secondary[0]].record_hedge()
+                    task = start(secondary)
+                    tasks[task] = secondary
+                    pending.add(task)
+        
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if tasks[task] == secondary:
+                            self.stats[secondary[0]].record_hedge(won=True)
+                        return task.result()
+                    errors.append(f'{tasks[task][0]}: {task.exception()}')
+                    
+                    # Replace a failed request with the next provider
+                    replacement = next_candidate()
+                    if replacement:
+                        task = start(replacement)
+                        tasks[task] = replacement
+                        pending.add(task)
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        raise LLMUnavailableError('; '.join(errors))
+    
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='llm-hedge')
+            return self._hedge_executor
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-provider circuit state, latency and error statistics"""
+        return {
+            provider: {
+                'circuit': self.breakers[provider].state,
+                'configured': self.llm_selector.validate_provider(provider),
+                **self.stats[provider].to_dict()
+            }
+            for provider in self.llm_selector.providers
+        }
@@ -4,9 +4,14 @@ Handles configuration and initialization of different LLM providers
 """
 
 import os
-from typing import Dict, List, Optional, Any
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 
+from llm_router import LLMRouter
+
 @dataclass
 class LLMConfig:
     """Configuration for LLM providers"""
@@ -20,36 +25,84 @@ class LLMConfig:
 class LLMSelector:
     """Manages multiple LLM providers and configurations"""
     
-    def __init__(self):
+    def __init__(self, client_cache_size: int = None):
         self.providers = {
             'openai': {
                 'models': ['gpt-4o', 'gpt-4o-mini', 'gpt-3.5-turbo'],
                 'api_key_env': 'OPENAI_API_KEY',
-                'default_model': 'gpt-4o'  # the newest OpenAI model is "gpt-4o" which was released May 13, 2024
+                'default_model': 'gpt-4o',  # the newest OpenAI model is "gpt-4o" which was released May 13, 2024
+                'analysis_model': 'gpt-4o-mini',
+                'json_mode': True,
+                # The SDK accepts a timeout on each request, so deadlines can shorten it
+                'call_timeout': True
             },
             'anthropic': {
                 'models': ['claude-3-5-sonnet-20241022', 'claude-3-haiku-20240307', 'claude-3-opus-20240229'],
                 'api_key_env': 'ANTHROPIC_API_KEY',
-                'default_model': 'claude-3-5-sonnet-20241022'  # the newest Anthropic model is "claude-3-5-sonnet-20241022" which was released October 22, 2024
+                'default_model': 'claude-3-5-sonnet-20241022',  # the newest Anthropic model is "claude-3-5-sonnet-20241022" which was released October 22, 2024
+                'analysis_model': 'claude-3-haiku-20240307',
+                'json_mode': False,
+                'call_timeout': True
             },
             'groq': {
                 'models': ['llama-3.1-70b-versatile', 'llama-3.1-8b-instant', 'mixtral-8x7b-32768'],
                 'api_key_env': 'GROQ_API_KEY',
-                'default_model': 'llama-3.1-70b-versatile'
+                'default_model': 'llama-3.1-70b-versatile',
+                'analysis_model': 'llama-3.1-8b-instant',
+                'json_mode': True,
+                'call_timeout': True
             },
             'mistral': {
                 'models': ['mistral-large-latest', 'mistral-medium-latest', 'mistral-small-latest'],
                 'api_key_env': 'MISTRAL_API_KEY',
-                'default_model': 'mistral-large-latest'
+                'default_model': 'mistral-large-latest',
+                'analysis_model': 'mistral-small-latest',
+                'json_mode': True,
+                # Only the client-wide LLM_REQUEST_TIMEOUT applies
+                'call_timeout': False
             }
         }
+        
+        # Offline provider with scripted latency and errors, for benchmarks and tests
+        if os.getenv('ENABLE_FAKE_LLM', 'False').lower() == 'true':
+            self.providers['fake'] = {
+                'models': ['fake'],
+                'api_key_env': None,
+                'default_model': 'fake',
+                'analysis_model': 'fake',
+                'json_mode': True,
+                'call_timeout': True,
+                # Never mix fake answers into real runs (or the reverse)
+                'failover': False
+            }
+        
+        # Task analysis is a short one-shot JSON answer, so it runs on the
+        # provider's small model with a tight token limit
+        self.analysis_max_tokens = int(os.getenv('ANALYSIS_MAX_TOKENS', 512))
+        
+        # Failover, circuit breakers and hedging across the providers above
+        self.router = LLMRouter(self)
+        
+        # LRU cache of constructed clients so HTTP connections are reused
+        if client_cache_size is None:
+            client_cache_size = int(os.getenv('LLM_CLIENT_CACHE_SIZE', 16))
+        self.client_cache_size = max(0, client_cache_size)
+        self._client_cache: 'OrderedDict[Tuple, Any]' = OrderedDict()
+        self._client_lock = threading.Lock()
+        self._client_stats = {
+            'hits': 0,
+            'misses': 0,
+            'constructions': 0,
+            'evictions': 0,
+            'construction_time': 0.0
+        }
     
     def get_available_providers(self) -> List[Dict[str, Any]]:
         """Get list of available providers with their models"""
         available = []
         
         for provider, config in self.providers.items():
-            api_key = os.getenv(config['api_key_env'])
+            api_key = self._api_key(provider)
             if api_key:
                 available.append({
                     'name': provider,
@@ -74,7 +127,7 @@ class LLMSelector:
             raise ValueError(f"Unsupported provider: {provider}")
         
         config = self.providers[provider]
-        api_key = os.getenv(config['api_key_env'])
+        api_key = self._api_key(provider)
         
         if not api_key:
             raise ValueError(f"Missing API key for {provider}. Set {config['api_key_env']} environment variable.")
@@ -91,17 +144,117 @@ class LLMSelector:
             api_key=api_key
         )
     
-    def create_llm_instance(self, provider: str, model: str = None, **kwargs):
-        """Create LLM instance for CrewAI"""
+    def create_llm_instance(self, provider: str, model: str = None, streaming: bool = False, **kwargs):
+        """Get a (cached) LLM instance for CrewAI
+        
+        Streaming clients forward tokens to the current event stream.
+        """
         config = self.get_llm_config(provider, model)
         
         # Set default parameters
         llm_kwargs = {
             'model': config.model,
             'temperature': kwargs.get('temperature', config.temperature),
-            'max_tokens': kwargs.get('max_tokens', config.max_tokens)
+            'max_tokens': kwargs.get('max_tokens', config.max_tokens),
+            # Retries are scheduled by the router's rate limiter, not by each SDK
+            'max_retries': 0
         }
         
+        if self.router.request_timeout:
+            llm_kwargs['timeout'] = self.router.request_timeout
+        
+        if streaming:
+            from llm_callbacks import TokenStreamHandler
+            llm_kwargs['streaming'] = True
+            llm_kwargs['callbacks'] = [TokenStreamHandler()]
+        
+        cache_key = (provider, config.model, llm_kwargs['temperature'], llm_kwargs['max_tokens'], streaming)
+        
+        with self._client_lock:
+            client = self._client_cache.get(cache_key)
+            if client is not None:
+                self._client_cache.move_to_end(cache_key)
+                self._client_stats['hits'] += 1
+                return client
+            self._client_stats['misses'] += 1
+        
+        start_time = time.time()
+        client = self._build_client(provider, config, llm_kwargs)
+        construction_time = time.time() - start_time
+        
+        with self._client_lock:
+            self._client_stats['constructions'] += 1
+            self._client_stats['construction_time'] += construction_time
+            
+            if self.client_cache_size == 0:
+                return client
+            
+            # Another thread may have built the same client in the meantime
+            if cache_key in self._client_cache:
+                self._client_cache.move_to_end(cache_key)
+                return self._client_cache[cache_key]
+            
+            self._client_cache[cache_key] = client
+            while len(self._client_cache) > self.client_cache_size:
+                self._client_cache.popitem(last=False)
+                self._client_stats['evictions'] += 1
+        
+        return client
+    
+    def create_analysis_llm(self, provider: str):
+        """Get the cheaper client used for task analysis
+        
+        Uses the provider's analysis_model at temperature 0 with
+        ANALYSIS_MAX_TOKENS, and requests JSON output where supported.
+        """
+        config = self.providers.get(provider)
+        if config is None:
+            raise ValueError(f"Unsupported provider: {provider}")
+        
+        llm = self.create_llm_instance(
+            provider,
+            self.get_analysis_model(provider),
+            temperature=0,
+            max_tokens=self.analysis_max_tokens
+        )
+        
+        if config.get('json_mode'):
+            llm = llm.bind(response_format={'type': 'json_object'})
+        
+        return llm
+    
+    def create_routed_llm(self, provider: str, model: str = None, streaming: bool = False,
+                          analysis: bool = False):
+        """Get a chat model that fails over to the other configured providers
+        
+        The preferred provider's client is built right away so configuration
+        errors surface immediately; the others are built on first failover.
+        analysis=True routes between the analysis models and hedges the
+        request when HEDGE_ANALYSIS is enabled.
+        """
+        from routed_llm import RoutedChatModel
+        
+        if analysis:
+            primary = self.create_analysis_llm(provider)
+        else:
+            primary = self.create_llm_instance(provider, model, streaming=streaming)
+        
+        return RoutedChatModel(
+            router=self.router,
+            candidates=self.router.candidates(provider, model, analysis=analysis),
+            analysis=analysis,
+            streaming=streaming,
+            hedge=analysis and self.router.hedge_analysis,
+            temperature=getattr(primary, 'temperature', None)
+        )
+    
+    def get_analysis_model(self, provider: str) -> str:
+        """Model used for task analysis by a provider"""
+        config = self.providers[provider]
+        return config.get('analysis_model') or config['default_model']
+    
+    def _build_client(self, provider: str, config: LLMConfig, llm_kwargs: Dict[str, Any]):
+        """Construct a new LLM client for the provider"""
         if provider == 'openai':
             from langchain_openai import ChatOpenAI
             return ChatOpenAI(
@@ -130,20 +283,54 @@ class LLMSelector:
                 **llm_kwargs
             )
         
+        elif provider == 'fake':
+            from fake_llm import FakeChatModel
+            return FakeChatModel.from_env(**llm_kwargs)
+        
         else:
             raise ValueError(f"LLM instance creation not implemented for provider: {provider}")
     
+    def get_client_cache_stats(self) -> Dict[str, Any]:
+        """Get client cache size, hit/miss counts and construction cost"""
+        with self._client_lock:
+            stats = dict(self._client_stats)
+            size = len(self._client_cache)
+        
+        lookups = stats['hits'] + stats['misses']
+        constructions = stats.pop('constructions')
+        construction_time = stats.pop('construction_time')
+        
+        return {
+            **stats,
+            'size': size,
+            'max_size': self.client_cache_size,
+            'hit_rate': stats['hits'] / lookups if lookups else 0,
+            'constructions': constructions,
+            'avg_construction_ms': construction_time / constructions * 1000 if constructions else 0
+        }
+    
+    def clear_client_cache(self):
+        """Drop all cached clients"""
+        with self._client_lock:
+            self._client_cache.clear()
+    
     def validate_provider(self, provider: str) -> bool:
         """Validate if provider is available and configured"""
         if provider not in self.providers:
             return False
         
-        api_key = os.getenv(self.providers[provider]['api_key_env'])
-        return bool(api_key)
+        return bool(self._api_key(provider))
+    
+    def _api_key(self, provider: str) -> Optional[str]:
+        """API key of a provider; providers without one (fake) always have a placeholder"""
+        api_key_env = self.providers[provider]['api_key_env']
+        if api_key_env is None:
+            return provider
+        return os.getenv(api_key_env)
     
     def get_default_provider(self) -> str:
         """Get the first available provider as default"""
-        for provider in ['openai', 'anthropic', 'groq', 'mistral']:
+        for provider in ['openai', 'anthropic', 'groq', 'mistral', 'fake']:
             if self.validate_provider(provider):
                 return provider
         
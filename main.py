@@ -6,29 +6,104 @@ Dynamic AI crew generator using CrewAI framework
 
 import os
 import sys
+import signal
+import argparse
 from dotenv import load_dotenv
 from crew_generator import MetaCrewSpawner
 
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description='Meta-Crew Spawner - generate and run AI crews from natural language tasks'
+    )
+    parser.add_argument('task', nargs='*',
+                        help='Task to run (interactive mode when omitted), or "worker" to serve the durable job queue')
+    parser.add_argument('--batch', metavar='FILE',
+                        help='Run JSONL tasks from FILE ("-" for stdin), one {"id", "task", ...} object per line')
+    parser.add_argument('--output', metavar='FILE',
+                        help='Write batch results as JSONL to FILE (default: stdout)')
+    parser.add_argument('--concurrency', type=int, default=int(os.getenv('MAX_CONCURRENT_CREWS', 5)),
+                        help='Number of crews run at the same time in batch and worker mode')
+    parser.add_argument('--resume', action='store_true',
+                        help='Skip tasks already completed in --output and append to it')
+    return parser.parse_args(argv)
+
+def run_batch(spawner: MetaCrewSpawner, args: argparse.Namespace):
+    """Run a JSONL batch and stream results as they complete"""
+    from batch import BatchRunner, read_tasks, load_completed_ids, write_records
+    
+    if args.resume and not args.output:
+        sys.exit("Error: --resume requires --output")
+    
+    skip_ids = set()
+    if args.resume and os.path.exists(args.output):
+        with open(args.output) as existing:
+            skip_ids = load_completed_ids(existing)
+        print(f"Resuming: skipping {len(skip_ids)} completed tasks", file=sys.stderr)
+    
+    source = sys.stdin if args.batch == '-' else open(args.batch)
+    output = open(args.output, 'a' if args.resume else 'w') if args.output else sys.stdout
+    
+    try:
+        runner = BatchRunner(spawner, concurrency=args.concurrency)
+        counts = write_records(runner.run(read_tasks(source), skip_ids=skip_ids), output)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+    
+    summary = ', '.join(f"{count} {status}" for status, count in sorted(counts.items())) or 'no tasks'
+    print(f"Batch finished: {summary}", file=sys.stderr)
+
+def run_worker(spawner: MetaCrewSpawner, args: argparse.Namespace):
+    """Run crews from the durable job queue until interrupted"""
+    from durable_queue import DurableJobStore, DurableWorker
+    from job_queue import run_crew_job
+    
+    store = DurableJobStore()
+    worker = DurableWorker(store, lambda job: run_crew_job(spawner, job), concurrency=args.concurrency)
+    
+    # SIGTERM (container stop) hands running jobs back to the queue like Ctrl+C
+    signal.signal(signal.SIGTERM, lambda signum, frame: worker.stop())
+    
+    print(f"Worker {worker.worker_id} running up to {worker.concurrency} crews from {store.path}", file=sys.stderr)
+    worker.run()
+    
+    stats = worker.get_stats()
+    print(f"Worker stopped: {stats['completed']} completed, {stats['failed']} failed, "
+          f"{stats['released']} handed back to the queue", file=sys.stderr)
+
 def main():
     """Main entry point for CLI usage"""
+    # Before parsing, so argparse defaults such as --concurrency see .env
     load_dotenv()
+    args = parse_args()
     
     # Check for required environment variables
     required_vars = ['OPENAI_API_KEY', 'ANTHROPIC_API_KEY', 'GROQ_API_KEY', 'MISTRAL_API_KEY']
     missing_vars = [var for var in required_vars if not os.getenv(var)]
     
     if missing_vars:
-        print(f"Warning: Missing API keys for: {', '.join(missing_vars)}")
-        print("Some LLM providers may not be available.")
+        # Batch mode keeps stdout clean for JSONL results; workers log to stderr
+        warning_stream = sys.stderr if args.batch or args.task == ['worker'] else sys.stdout
+        print(f"Warning: Missing API keys for: {', '.join(missing_vars)}", file=warning_stream)
+        print("Some LLM providers may not be available.", file=warning_stream)
     
     spawner = MetaCrewSpawner()
     
-    if len(sys.argv) > 1:
+    if args.task == ['worker']:
+        run_worker(spawner, args)
+    elif args.batch:
+        run_batch(spawner, args)
+    elif args.task:
         # CLI mode with task as argument
-        task = ' '.join(sys.argv[1:])
+        task = ' '.join(args.task)
         print(f"Processing task: {task}")
-        result = spawner.process_task(task)
-        print(f"\nResult:\n{result}")
+        crew_result = spawner.process_task(task)
+        if crew_result.error:
+            print(f"\n{crew_result.error}")
+        print(f"\nResult:\n{crew_result.result}")
     else:
         # Interactive CLI mode
         print("Meta-Crew Spawner - Interactive Mode")
@@ -43,8 +118,10 @@ def main():
                     continue
                     
                 print(f"\nProcessing: {task}")
-                result = spawner.process_task(task)
-                print(f"\nResult:\n{result}")
+                crew_result = spawner.process_task(task)
+                if crew_result.error:
+                    print(f"\n{crew_result.error}")
+                print(f"\nResult:\n{crew_result.result}")
                 
             except KeyboardInterrupt:
                 print("\nGoodbye!")
@@ -0,0 +1,179 @@
+"""
+Metrics - Latency, token and cost instrumentation
+Process-wide counters and histograms rendered in the Prometheus text format
+"""
+
+import threading
+from typing import Dict, List, Any, Optional, Tuple
+
+# Seconds; covers quick rule-based analyses up to multi-minute crews
+DEFAULT_BUCKETS = (0.005, 0.025, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+# USD per million (prompt, completion) tokens, used for cost estimates
+MODEL_PRICES = {
+    'gpt-4o': (2.50, 10.00),
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-3.5-turbo': (0.50, 1.50),
+    'claude-3-5-sonnet-20241022': (3.00, 15.00),
+    'claude-3-haiku-20240307': (0.25, 1.25),
+    'claude-3-opus-20240229': (15.00, 75.00),
+    'llama-3.1-70b-versatile': (0.59, 0.79),
+    'llama-3.1-8b-instant': (0.05, 0.08),
+    'mixtral-8x7b-32768': (0.24, 0.24),
+    'mistral-large-latest': (2.00, 6.00),
+    'mistral-medium-latest': (0.40, 2.00),
+    'mistral-small-latest': (0.20, 0.60)
+}
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Estimated USD cost of a call; 0 for models without a known price"""
+    prompt_price, completion_price = MODEL_PRICES.get(model, (0, 0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+class Counter:
+    """Monotonic counter with labels"""
+    
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+    
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(label, '')) for label in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.labels, key)} {_format_value(value)}')
+        return lines
+
+class Histogram:
+    """Cumulative-bucket histogram with labels"""
+    
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(label, '')) for label in self.labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+                self._series[key] = series
+            
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series['counts'][i] += 1
+            series['sum'] += value
+            series['count'] += 1
+    
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series['counts']):
+                    labels = _format_labels(self.labels + ('le',), key + (_format_value(bound),))
+                    lines.append(f'{self.name}_bucket{labels} {count}')
+                labels = _format_labels(self.labels + ('le',), key + ('+Inf',))
+                lines.append(f'{self.name}_bucket{labels} {series["count"]}')
+                lines.append(f'{self.name}_sum{_format_labels(self.labels, key)} {_format_value(series["sum"])}')
+                lines.append(f'{self.name}_count{_format_labels(self.labels, key)} {series["count"]}')
+        return lines
+
+class MetricsRegistry:
+    """Collection of metrics rendered together"""
+    
+    def __init__(self):
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+    
+    def counter(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labels))
+    
+    def histogram(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labels, buckets))
+    
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+    
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{escaped}"')
+    return '{' + ','.join(pairs) + '}'
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+registry = MetricsRegistry()
+
+crew_requests = registry.counter(
+    'meta_crew_requests_total', 'Crew runs by outcome', ('status',)
+)
+stage_seconds = registry.histogram(
+    'meta_crew_stage_seconds', 'Time spent per crew stage (analysis, crew_build, execution, total)', ('stage',)
+)
+analysis_seconds = registry.histogram(
+    'meta_crew_task_analysis_seconds', 'TaskParser.parse_task latency by analysis source', ('source',)
+)
+agent_task_seconds = registry.histogram(
+    'meta_crew_agent_task_seconds', 'Time each agent spent on its task', ('agent',)
+)
+llm_requests = registry.counter(
+    'meta_crew_llm_requests_total', 'LLM calls by provider, model and outcome', ('provider', 'model', 'status')
+)
+llm_request_seconds = registry.histogram(
+    'meta_crew_llm_request_seconds', 'LLM call latency', ('provider', 'model')
+)
+llm_tokens = registry.counter(
+    'meta_crew_llm_tokens_total', 'LLM tokens by provider, model and type', ('provider', 'model', 'type')
+)
+llm_cost = registry.counter(
+    'meta_crew_llm_cost_usd_total', 'Estimated LLM cost in USD', ('provider', 'model')
+)
+context_tokens_saved = registry.counter(
+    'meta_crew_context_tokens_saved_total', 'Prompt tokens saved by compacting task outputs handed between agents'
+)
+llm_memo_hits = registry.counter(
+    'meta_crew_llm_memo_hits_total', 'LLM calls answered from the on-disk memo', ('provider', 'model')
+)
+
+def record_llm_call(provider: str, model: str, seconds: float, prompt_tokens: int = 0,
+                    completion_tokens: int = 0, error: Optional[Exception] = None) -> float:
+    """Record one LLM call; returns its estimated cost"""
+    llm_requests.inc(provider=provider, model=model, status='error' if error else 'success')
+    llm_request_seconds.observe(seconds, provider=provider, model=model)
+    
+    if error is not None:
+        return 0.0
+    
+    cost = estimate_cost(model, prompt_tokens, completion_tokens)
+    llm_tokens.inc(prompt_tokens, provider=provider, model=model, type='prompt')
+    llm_tokens.inc(completion_tokens, provider=provider, model=model, type='completion')
+    llm_cost.inc(cost, provider=provider, model=model)
+    return cost
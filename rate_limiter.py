@@ -0,0 +1,229 @@
+"""
+Rate Limiter - Client-side request and token throttling
+Shared token buckets per provider and model, plus Retry-After aware backoff
+"""
+
+import os
+import time
+import random
+import threading
+from typing import Dict, Any, Optional, Tuple
+
+class RateLimitWaitExceeded(TimeoutError):
+    """Raised when the next request slot is further away than the caller can wait"""
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at rate_per_minute"""
+    
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0
+        # A small burst allowance keeps throughput smooth instead of front-loading a minute's budget
+        self.capacity = capacity if capacity is not None else max(1.0, rate_per_minute / 10.0)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def charge(self, amount: float) -> float:
+        """Tokens reserve() takes for amount: capped at capacity, so an oversized request can still go out"""
+        return min(amount, self.capacity)
+    
+    def reserve(self, amount: float) -> float:
+        """Take charge(amount) tokens, going into debt if needed; returns seconds to wait"""
+        amount = self.charge(amount)
+        
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= amount
+            
+            # Reserving up front queues callers fairly: each waits for its own slot
+            return -self.tokens / self.rate if self.tokens < 0 else 0.0
+    
+    def adjust(self, amount: float):
+        """Correct an earlier reservation (negative amount refunds tokens)"""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+class RateLimiter:
+    """Request and token budgets per (provider, model)
+    
+    MAX_REQUESTS_PER_MINUTE and MAX_TOKENS_PER_MINUTE (0 disables) apply
+    to each provider/model pair. A 429 puts the pair in a shared cooldown,
+    so every thread backs off together instead of retrying on its own.
+    """
+    
+    def __init__(self, requests_per_minute: float = None, tokens_per_minute: float = None):
+        if requests_per_minute is None:
+            requests_per_minute = float(os.getenv('MAX_REQUESTS_PER_MINUTE', 60))
+        if tokens_per_minute is None:
+            tokens_per_minute = float(os.getenv('MAX_TOKENS_PER_MINUTE', 0))
+        
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = int(os.getenv('RATE_LIMIT_MAX_RETRIES', 3))
+        self.backoff_base = float(os.getenv('RATE_LIMIT_BACKOFF_BASE', 1))
+        self.backoff_max = float(os.getenv('RATE_LIMIT_BACKOFF_MAX', 60))
+        
+        self._buckets: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def acquire(self, provider: str, model: str, estimated_tokens: int = 0, max_wait: float = None) -> float:
+        """Block until a request may be sent; returns the seconds waited
+        
+        Callers with a deadline pass the time left as max_wait; see reserve.
+        """
+        delay = self.reserve(provider, model, estimated_tokens, max_wait)
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+    
+    def reserve(self, provider: str, model: str, estimated_tokens: int = 0, max_wait: float = None) -> float:
+        """Claim a request slot without sleeping; returns the seconds to wait before sending
+        
+        For async callers, which wait on the event loop instead of blocking a
+        thread. When the slot is more than max_wait away the reservation is
+        given back and RateLimitWaitExceeded raised, so a call that can't go
+        out in time uses no quota.
+        """
+        state = self._state(provider, model)
+        
+        delay = 0.0
+        if state['requests'] is not None:
+            delay = max(delay, state['requests'].reserve(1))
+        if state['tokens'] is not None and estimated_tokens:
+            delay = max(delay, state['tokens'].reserve(estimated_tokens))
+        
+        with self._lock:
+            delay = max(delay, state['blocked_until'] - time.monotonic(), 0.0)
+            if max_wait is None or delay <= max_wait:
+                state['requests_sent'] += 1
+                if delay > 0:
+                    state['throttled'] += 1
+                    state['wait_time'] += delay
+                return delay
+        
+        self._give_back(state, estimated_tokens)
+        raise RateLimitWaitExceeded(
+            f'{provider}/{model}: next request slot is {delay:.1f}s away, more than the {max_wait:.1f}s left'
+        )
+    
+    def refund(self, provider: str, model: str, estimated_tokens: int = 0):
+        """Give back a reservation whose request was never sent (e.g. a cancelled hedge)"""
+        state = self._state(provider, model)
+        self._give_back(state, estimated_tokens)
+        with self._lock:
+            state['requests_sent'] -= 1
+    
+    def record_tokens(self, provider: str, model: str, actual_tokens: int, estimated_tokens: int = 0):
+        """Charge the difference between actual usage and what the estimate reserved"""
+        state = self._state(provider, model)
+        if state['tokens'] is not None and actual_tokens:
+            bucket = state['tokens']
+            bucket.adjust(actual_tokens - bucket.charge(estimated_tokens))
+    
+    def backoff(self, provider: str, model: str, attempt: int, retry_after: float = None) -> float:
+        """Put the pair in cooldown after a 429; returns the delay applied
+        
+        Retry-After is honored when given, otherwise exponential backoff
+        with full jitter is used.
+        """
+        delay = self.backoff_delay(attempt, retry_after)
+        
+        state = self._state(provider, model)
+        with self._lock:
+            state['blocked_until'] = max(state['blocked_until'], time.monotonic() + delay)
+            state['rate_limited'] += 1
+        return delay
+    
+    def backoff_delay(self, attempt: int, retry_after: float = None) -> float:
+        """Retry-After plus a little jitter, or exponential backoff with full jitter"""
+        if retry_after is not None:
+            return retry_after + random.uniform(0, min(1.0, retry_after * 0.1))
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+    
+    @staticmethod
+    def _give_back(state: Dict[str, Any], estimated_tokens: int):
+        if state['requests'] is not None:
+            state['requests'].adjust(-1)
+        if state['tokens'] is not None and estimated_tokens:
+            state['tokens'].adjust(-state['tokens'].charge(estimated_tokens))
+    
+    def _state(self, provider: str, model: str) -> Dict[str, Any]:
+        key = (provider, model)
+        with self._lock:
+            state = self._buckets.get(key)
+            if state is None:
+                state = {
+                    'requests': TokenBucket(self.requests_per_minute) if self.requests_per_minute > 0 else None,
+                    'tokens': TokenBucket(self.tokens_per_minute) if self.tokens_per_minute > 0 else None,
+                    'blocked_until': 0.0,
+                    'requests_sent': 0,
+                    'throttled': 0,
+                    'rate_limited': 0,
+                    'wait_time': 0.0
+                }
+                self._buckets[key] = state
+            return state
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Throttling and 429 counts per provider/model"""
+        with self._lock:
+            return {
+                f'{provider}/{model}': {
+                    'requests': state['requests_sent'],
+                    'throttled': state['throttled'],
+                    'rate_limited': state['rate_limited'],
+                    'wait_time': state['wait_time'],
+                    'cooldown': max(0.0, state['blocked_until'] - time.monotonic())
+                }
+                for (provider, model), state in self._buckets.items()
+            }
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """Whether a provider SDK error is an HTTP 429"""
+    response = getattr(error, 'response', None)
+    status = getattr(error, 'status_code', None) or getattr(response, 'status_code', None)
+    if status is not None:
+        return status == 429
+    message = str(error).lower()
+    return '429' in message or 'rate limit' in message
+
+def is_retryable_error(error: Exception) -> bool:
+    """Rate limits, timeouts, connection errors and 5xx responses"""
+    response = getattr(error, 'response', None)
+    status = getattr(error, 'status_code', None) or getattr(response, 'status_code', None)
+    if isinstance(status, int):
+        return status in (408, 409, 429) or status >= 500
+    name = type(error).__name__
+    return 'Timeout' in name or 'Connection' in name or is_rate_limit_error(error)
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Retry-After (or retry-after-ms) from a provider error response, if any"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    if not headers:
+        return None
+    
+    try:
+        if headers.get('retry-after-ms'):
+            return float(headers['retry-after-ms']) / 1000
+        if headers.get('retry-after'):
+            return float(headers['retry-after'])
+    except (TypeError, ValueError):
+        # HTTP-date values are rare for these APIs; fall back to backoff
+        return None
+    return None
+
+def estimate_tokens(messages: Any) -> int:
+    """Rough prompt size (4 characters per token) used to reserve token budget"""
+    if isinstance(messages, str):
+        return len(messages) // 4 + 1
+    return sum(len(str(getattr(message, 'content', message))) for message in messages) // 4 + 1
+
+def response_token_counts(response: Any) -> Tuple[int, int]:
+    """(prompt, completion) tokens reported in a LangChain chat response, zeros if unknown"""
+    metadata = getattr(response, 'response_metadata', None) or {}
+    usage = metadata.get('token_usage') or metadata.get('usage') or {}
+    prompt_tokens = usage.get('prompt_tokens') or usage.get('input_tokens') or 0
+    completion_tokens = usage.get('completion_tokens') or usage.get('output_tokens') or 0
+    return prompt_tokens, completion_tokens
@@ -0,0 +1,64 @@
+"""
+Routed LLM - Chat model backed by the LLM router
+Gives CrewAI agents and the task parser provider failover without code changes
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+class RoutedChatModel(BaseChatModel):
+    """LangChain chat model that sends each call through an LLMRouter
+    
+    ainvoke goes through the router's async path, so awaiting callers
+    don't tie up a thread while the provider answers.
+    """
+    
+    router: Any
+    candidates: List[Tuple[str, str]]
+    analysis: bool = False
+    streaming: bool = False
+    hedge: bool = False
+    temperature: Optional[float] = None
+    wait_callback: Any = None
+    usage_callback: Any = None
+    # Raises once the request is cancelled or out of time; returns the seconds left
+    abort_callback: Any = None
+    time_left_callback: Any = None
+    
+    @property
+    def _llm_type(self) -> str:
+        return 'routed'
+    
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        message = self.router.invoke(self.candidates, messages, **self._route_options(stop, kwargs))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+    
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        message = await self.router.ainvoke(self.candidates, messages, **self._route_options(stop, kwargs))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+    
+    def _route_options(self, stop: Optional[List[str]], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Router arguments for one call"""
+        if stop is not None:
+            kwargs['stop'] = stop
+        
+        # Cancelled or expired requests stop here instead of paying for another call
+        if self.abort_callback:
+            self.abort_callback()
+        timeout = self.time_left_callback() if self.time_left_callback else None
+        
+        return {
+            'analysis': self.analysis,
+            'streaming': self.streaming,
+            'hedge': self.hedge,
+            'wait_callback': self.wait_callback,
+            'usage_callback': self.usage_callback,
+            'timeout': timeout,
+            **kwargs
+        }
@@ -9,6 +9,10 @@ class MetaCrewSpawner {
         this.currentTask = '';
         this.isProcessing = false;
         
+        // Analysis from /api/task-analysis, reused when the task is processed
+        this.analysisId = null;
+        this.analysisTask = null;
+        
         this.init();
     }
 
@@ -158,13 +162,17 @@ class MetaCrewSpawner {
                     'Content-Type': 'application/json'
                 },
                 body: JSON.stringify({
-                    task: this.currentTask
+                    task: this.currentTask,
+                    llm_provider: document.getElementById('llmProvider').value,
+                    model: document.getElementById('llmModel').value
                 })
             });
             
             const data = await response.json();
             
             if (data.success) {
+                this.analysisId = data.analysis_id;
+                this.analysisTask = this.currentTask;
                 this.displayAnalysis(data.analysis);
             } else {
                 this.showError('Analysis failed: ' + data.error);
@@ -183,8 +191,8 @@ class MetaCrewSpawner {
         this.updateUIState();
         
         try {
-            this.showLoading('Processing task...');
-            this.startProgressAnimation();
+            this.showLoading('Submitting task...');
+            this.setProgress(0);
             
             const response = await fetch('/api/process-task', {
                 method: 'POST',
@@ -194,14 +202,28 @@ class MetaCrewSpawner {
                 body: JSON.stringify({
                     task: this.currentTask,
                     llm_provider: document.getElementById('llmProvider').value,
-                    model: document.getElementById('llmModel').value
+                    model: document.getElementById('llmModel').value,
+                    analysis_id: this.analysisTask === this.currentTask ? this.analysisId : null,
+                    async: true,
+                    stream: true
                 })
             });
             
-            const data = await response.json();
+            const submitted = await response.json();
             
-            if (data.success) {
+            if (!submitted.success) {
+                this.showError('Processing failed: ' + submitted.error);
+                return;
+            }
+            
+            const data = await this.streamJob(submitted.job_id);
+            
+            if (data.status === 'completed') {
                 this.displayResults(data);
+            } else if (data.status === 'deadline_exceeded') {
+                // Show what the tasks that finished in time produced
+                this.displayResults(data);
+                this.showError(data.error);
             } else {
                 this.showError('Processing failed: ' + data.error);
             }
@@ -214,6 +236,86 @@ class MetaCrewSpawner {
         }
     }
 
+    async waitForJob(jobId, interval = 1000) {
+        // Poll the job endpoint until the crew has finished
+        while (true) {
+            const response = await fetch(`/api/jobs/${jobId}`);
+            const data = await response.json();
+            
+            if (!data.success) {
+                return { status: 'failed', error: data.error };
+            }
+            
+            if (['completed', 'failed', 'cancelled', 'deadline_exceeded'].includes(data.status)) {
+                return data;
+            }
+            
+            if (data.status === 'queued') {
+                this.showLoading(`Waiting for a free crew slot (${data.wait_time.toFixed(0)}s)...`);
+            } else {
+                this.showLoading('Processing task...');
+            }
+            
+            await new Promise(resolve => setTimeout(resolve, interval));
+        }
+    }
+
+    streamJob(jobId) {
+        // Follow real progress events from the crew; fall back to polling
+        if (!window.EventSource) {
+            return this.waitForJob(jobId);
+        }
+        
+        const liveOutput = document.getElementById('liveOutput');
+        liveOutput.textContent = '';
+        
+        return new Promise((resolve) => {
+            // Closing the page cancels the crew so no further LLM calls are made
+            const source = new EventSource(`/api/jobs/${jobId}/events?cancel_on_disconnect=1`);
+            const on = (type, handler) => source.addEventListener(type, (e) => handler(JSON.parse(e.data)));
+            
+            on('job_started', () => {
+                this.showLoading('Analyzing task...');
+                this.setProgress(5);
+            });
+            
+            on('analysis_complete', (data) => {
+                this.showLoading(`Building ${this.capitalize(data.task_type || 'general')} crew...`);
+                this.setProgress(10);
+            });
+            
+            on('crew_built', (data) => {
+                this.showLoading(`Running ${data.agents.length} agents...`);
+                this.setProgress(15);
+            });
+            
+            on('task_started', (data) => {
+                this.showLoading(`${data.agent} is working (task ${data.index + 1} of ${data.total})...`);
+            });
+            
+            on('task_completed', (data) => {
+                this.setProgress(15 + 80 * data.completed / data.total);
+            });
+            
+            on('token', (data) => {
+                liveOutput.textContent += data.token;
+                liveOutput.scrollTop = liveOutput.scrollHeight;
+            });
+            
+            on('job_finished', (data) => {
+                source.close();
+                this.setProgress(100);
+                resolve(data);
+            });
+            
+            source.onerror = () => {
+                if (source.readyState === EventSource.CLOSED) {
+                    resolve(this.waitForJob(jobId));
+                }
+            };
+        });
+    }
+
     displayAnalysis(analysis) {
         const card = document.getElementById('analysisCard');
         const content = document.getElementById('analysisContent');
@@ -274,7 +376,11 @@ class MetaCrewSpawner {
         
         // Display execution time
         if (data.execution_time) {
-            executionTime.textContent = `Completed in ${data.execution_time.toFixed(1)}s`;
+            const verb = data.status === 'deadline_exceeded' ? 'Stopped at the time limit after' : 'Completed in';
+            executionTime.textContent = `${verb} ${data.execution_time.toFixed(1)}s`;
+            if (data.cached) {
+                executionTime.textContent += ' (cached)';
+            }
         }
         
         // Display agents
@@ -283,7 +389,7 @@ class MetaCrewSpawner {
         }
         
         // Display result
-        resultContent.textContent = data.result;
+        resultContent.textContent = data.result || 'No task finished before the time limit.';
         
         // Show results card
         card.style.display = 'block';
@@ -338,26 +444,11 @@ class MetaCrewSpawner {
         const overlay = document.getElementById('loadingOverlay');
         overlay.style.display = 'none';
         overlay.classList.remove('fade-in');
+        this.setProgress(0);
     }
 
-    startProgressAnimation() {
-        const progressBar = document.getElementById('progressBar');
-        let progress = 0;
-        
-        const interval = setInterval(() => {
-            progress += Math.random() * 15;
-            if (progress > 90) progress = 90;
-            
-            progressBar.style.width = progress + '%';
-            
-            if (!this.isProcessing) {
-                clearInterval(interval);
-                progressBar.style.width = '100%';
-                setTimeout(() => {
-                    progressBar.style.width = '0%';
-                }, 500);
-            }
-        }, 500);
+    setProgress(percent) {
+        document.getElementById('progressBar').style.width = percent + '%';
     }
 
     showError(message) {
@@ -3,15 +3,40 @@ Task Parser - Natural language task analysis
 Analyzes user input to determine appropriate crew configuration
 """
 
+import os
 import json
 import re
-from typing import Dict, Any, List
-from langchain.schema import HumanMessage, SystemMessage
+import time
+import heapq
+from typing import Dict, Any, List, Iterable, Optional, Tuple
+
+import metrics
+from cache import create_cache, cache_enabled, make_cache_key
+from keyword_matcher import KeywordMatcher, first_match_rules, first_match
+
+# full: always call the LLM; auto: skip it when the rules are confident; rules: never call it
+ANALYSIS_MODES = ('full', 'auto', 'rules')
+
+# Fields returned by the LLM analysis
+LLM_ANALYSIS_FIELDS = (
+    'specific_requirements', 'key_skills_needed', 'deliverables', 'challenges', 'success_criteria'
+)
 
 class TaskParser:
     """Parses natural language tasks and extracts structured information"""
     
-    def __init__(self):
+    def __init__(self, cache=None):
+        # Cache of full analyses keyed on normalized task text, provider and model
+        if cache is None and cache_enabled():
+            cache = create_cache('analysis')
+        self.cache = cache
+        
+        self.analysis_mode = os.getenv('ANALYSIS_MODE', 'full').lower()
+        if self.analysis_mode not in ANALYSIS_MODES:
+            print(f"Warning: unknown ANALYSIS_MODE {self.analysis_mode}, using full")
+            self.analysis_mode = 'full'
+        self.confidence_threshold = float(os.getenv('ANALYSIS_CONFIDENCE_THRESHOLD', 0.5))
+        
         self.task_types = {
             'research': ['research', 'investigate', 'study', 'analyze', 'explore', 'examine'],
             'content_creation': ['write', 'create', 'generate', 'produce', 'draft', 'compose'],
@@ -36,41 +61,110 @@ class TaskParser:
             'health': ['health', 'medical', 'wellness', 'fitness', 'healthcare']
         }
     
-    def parse_task(self, task_description: str, llm) -> Dict[str, Any]:
-        """Parse task description and extract structured information"""
-        # Basic rule-based analysis
-        basic_analysis = self._basic_analysis(task_description)
+        # Classification: the first category (in the order above) with a keyword in the text
+        self.task_type_rules = first_match_rules(self.task_types)
+        self.complexity_rules = first_match_rules(self.complexity_indicators)
+        self.domain_rules = first_match_rules(self.domain_keywords)
+        
+        # Confidence for auto mode: whole-word hit counts for every category in one pass
+        self.matcher = KeywordMatcher({
+            'task_type': self.task_types,
+            'complexity': self.complexity_indicators,
+            'domain': self.domain_keywords
+        })
+    
+    def parse_task(self, task_description: str, llm, provider: str = None, model: str = None,
+                   mode: str = None) -> Dict[str, Any]:
+        """Parse task description and extract structured information
+        
+        mode overrides ANALYSIS_MODE. In "auto" mode the LLM call is skipped
+        when the rule-based confidence clears the threshold; the enriched
+        fields can be fetched later with enrich_analysis. LLM analyses are
+        cached when provider and model are given.
+        """
+        start_time = time.time()
+        analysis, cache_key, done = self._quick_analysis(task_description, provider, model, mode, start_time)
+        if done:
+            return analysis
         
         # Enhanced analysis using LLM
         enhanced_analysis = self._llm_analysis(task_description, llm)
+        return self._combine_analysis(analysis, enhanced_analysis, cache_key, start_time)
+    
+    async def aparse_task(self, task_description: str, llm, provider: str = None, model: str = None,
+                          mode: str = None) -> Dict[str, Any]:
+        """Async parse_task: the LLM analysis awaits the model's ainvoke"""
+        start_time = time.time()
+        analysis, cache_key, done = self._quick_analysis(task_description, provider, model, mode, start_time)
+        if done:
+            return analysis
+        
+        enhanced_analysis = await self._allm_analysis(task_description, llm)
+        return self._combine_analysis(analysis, enhanced_analysis, cache_key, start_time)
+    
+    def enrich_analysis(self, task_description: str, llm, provider: str = None, model: str = None) -> Dict[str, Any]:
+        """Full analysis including the LLM fields, for consumers that need them"""
+        return self.parse_task(task_description, llm, provider=provider, model=model, mode='full')
+    
+    async def aenrich_analysis(self, task_description: str, llm, provider: str = None,
+                               model: str = None) -> Dict[str, Any]:
+        """Async enrich_analysis"""
+        return await self.aparse_task(task_description, llm, provider=provider, model=model, mode='full')
+    
+    def _quick_analysis(self, task_description: str, provider: Optional[str], model: Optional[str],
+                        mode: Optional[str], start_time: float) -> Tuple[Dict[str, Any], Optional[str], bool]:
+        """Cached or rule-based analysis, its cache key, and whether it is final (no LLM call needed)"""
+        mode = mode or self.analysis_mode
+        if mode not in ANALYSIS_MODES:
+            raise ValueError(f"Unsupported analysis mode: {mode}")
         
-        # Combine both analyses
-        return {**basic_analysis, **enhanced_analysis}
+        cache_key = None
+        if self.cache is not None and provider:
+            cache_key = make_cache_key('analysis', self.normalize_task_text(task_description), provider, model)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                metrics.analysis_seconds.observe(time.time() - start_time, source='cache')
+                return dict(cached), cache_key, True
+        
+        # Basic rule-based analysis
+        basic_analysis = self._basic_analysis(task_description)
+        if mode == 'auto':
+            basic_analysis['confidence'] = self.rule_confidence(self.matcher.score(task_description))
+        
+        if mode == 'rules' or (mode == 'auto' and basic_analysis['confidence'] >= self.confidence_threshold):
+            metrics.analysis_seconds.observe(time.time() - start_time, source='rules')
+            return {**basic_analysis, 'analysis_source': 'rules'}, cache_key, True
+        
+        return basic_analysis, cache_key, False
+        
+    def _combine_analysis(self, basic_analysis: Dict[str, Any], enhanced_analysis: Dict[str, Any],
+                          cache_key: Optional[str], start_time: float) -> Dict[str, Any]:
+        """Merge the rule-based and LLM analyses and cache the result"""
+        analysis = {**basic_analysis, **enhanced_analysis, 'analysis_source': 'llm'}
+        metrics.analysis_seconds.observe(time.time() - start_time, source='llm')
+        
+        # Don't cache failed LLM calls
+        if cache_key and 'llm_analysis_error' not in analysis:
+            self.cache.set(cache_key, analysis)
+        
+        return analysis
+    
+    @staticmethod
+    def normalize_task_text(task_description: str) -> str:
+        """Normalize case and whitespace so near-identical tasks share a cache entry"""
+        return ' '.join(task_description.split()).casefold()
+    
+    def classify_many(self, task_descriptions: Iterable[str]) -> List[Dict[str, Any]]:
+        """Rule-based analysis of many tasks at once, without LLM calls"""
+        return [self._basic_analysis(task_description) for task_description in task_descriptions]
     
     def _basic_analysis(self, task_description: str) -> Dict[str, Any]:
         """Perform basic rule-based task analysis"""
         task_lower = task_description.lower()
         
-        # Determine task type
-        task_type = 'general'
-        for t_type, keywords in self.task_types.items():
-            if any(keyword in task_lower for keyword in keywords):
-                task_type = t_type
-                break
-        
-        # Determine complexity
-        complexity = 'medium'  # default
-        for comp_level, indicators in self.complexity_indicators.items():
-            if any(indicator in task_lower for indicator in indicators):
-                complexity = comp_level
-                break
-        
-        # Determine domain
-        domain = 'general'
-        for dom, keywords in self.domain_keywords.items():
-            if any(keyword in task_lower for keyword in keywords):
-                domain = dom
-                break
+        task_type = first_match(self.task_type_rules, task_lower, 'general')
+        complexity = first_match(self.complexity_rules, task_lower, 'medium')
+        domain = first_match(self.domain_rules, task_lower, 'general')
         
         # Estimate time based on complexity and length
         word_count = len(task_description.split())
@@ -89,11 +183,71 @@ class TaskParser:
             'word_count': word_count
         }
     
+    @staticmethod
+    def rule_confidence(scores: Dict[str, Dict[str, int]]) -> float:
+        """Confidence (0-1) in the keyword classification of task type and domain
+        
+        Each group scores (top - runner-up) / (top + 1): a single clear hit
+        gives 0.5, more agreeing hits approach 1 and a tie gives 0. The
+        weaker of the two groups is returned.
+        """
+        confidence = 1.0
+        for group in ('task_type', 'domain'):
+            counts = scores.get(group)
+            if not counts:
+                return 0.0
+            if len(counts) == 1:
+                top, runner_up = next(iter(counts.values())), 0
+            else:
+                top, runner_up = heapq.nlargest(2, counts.values())
+            confidence = min(confidence, (top - runner_up) / (top + 1))
+        return round(confidence, 2)
+    
     def _llm_analysis(self, task_description: str, llm) -> Dict[str, Any]:
-        """Use LLM for enhanced task analysis"""
+        """Use LLM for enhanced task analysis
+        
+        The reply must be a JSON object; an invalid reply gets one retry
+        that shows the model its parse error.
+        """
         try:
-            system_prompt = """You are an expert task analyzer for AI crew generation. 
-            Analyze the given task and provide a JSON response with the following structure:
+            messages = self._analysis_messages(task_description)
+            response = llm.invoke(messages)
+        
+            try:
+                return self.parse_analysis_json(response.content)
+            except ValueError as e:
+                # One bounded retry with the parse error as feedback
+                messages += self._retry_messages(response.content, e)
+                response = llm.invoke(messages)
+                return self.parse_analysis_json(response.content)
+        
+        except Exception as e:
+            print(f"Warning: LLM analysis failed: {e}")
+            return {'llm_analysis_error': str(e)}
+    
+    async def _allm_analysis(self, task_description: str, llm) -> Dict[str, Any]:
+        """Async _llm_analysis"""
+        try:
+            messages = self._analysis_messages(task_description)
+            response = await llm.ainvoke(messages)
+            
+            try:
+                return self.parse_analysis_json(response.content)
+            except ValueError as e:
+                messages += self._retry_messages(response.content, e)
+                response = await llm.ainvoke(messages)
+                return self.parse_analysis_json(response.content)
+        
+        except Exception as e:
+            print(f"Warning: LLM analysis failed: {e}")
+            return {'llm_analysis_error': str(e)}
+    
+    @staticmethod
+    def _analysis_messages(task_description: str) -> List[Any]:
+        from langchain.schema import HumanMessage, SystemMessage
+        
+        system_prompt = """You are an expert task analyzer for AI crew generation. 
+            Analyze the given task and reply with only a JSON object with the following structure:
             {
                 "specific_requirements": ["list", "of", "specific", "requirements"],
                 "key_skills_needed": ["skill1", "skill2", "skill3"],
@@ -102,35 +256,53 @@ class TaskParser:
                 "success_criteria": ["how", "to", "measure", "success"]
             }
             
-            Focus on practical aspects that would help determine what types of AI agents would be most effective."""
+            Keep every list short (at most 5 items). Focus on practical aspects that would help determine what types of AI agents would be most effective."""
             
-            user_prompt = f"Analyze this task: {task_description}"
+        user_prompt = f"Analyze this task: {task_description}"
             
-            messages = [
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=user_prompt)
-            ]
+        return [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=user_prompt)
+        ]
             
-            response = llm.invoke(messages)
+    @staticmethod
+    def _retry_messages(content: str, error: ValueError) -> List[Any]:
+        from langchain.schema import AIMessage, HumanMessage
             
-            # Try to parse JSON from response
-            try:
-                # Extract JSON from response content
-                content = response.content
-                # Find JSON in the response
-                json_match = re.search(r'\{.*\}', content, re.DOTALL)
-                if json_match:
-                    analysis = json.loads(json_match.group())
-                    return analysis
-                else:
-                    # Fallback if no JSON found
-                    return {'llm_analysis': content}
-            except json.JSONDecodeError:
-                return {'llm_analysis': response.content}
-                
-        except Exception as e:
-            print(f"Warning: LLM analysis failed: {e}")
-            return {'llm_analysis_error': str(e)}
+        return [
+            AIMessage(content=content),
+            HumanMessage(content=f"That reply was not valid: {error}. Reply with only the JSON object.")
+        ]
+    
+    @staticmethod
+    def parse_analysis_json(content: str) -> Dict[str, Any]:
+        """Strictly parse an LLM analysis reply
+        
+        The reply must be a single JSON object (optionally in a ```json
+        fence) whose known fields are lists of strings; unknown fields are
+        dropped. Raises ValueError otherwise.
+        """
+        text = content.strip()
+        fence = re.fullmatch(r'```(?:json)?\s*(.*?)\s*```', text, re.DOTALL)
+        if fence:
+            text = fence.group(1)
+        
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"invalid JSON ({e})")
+        
+        if not isinstance(data, dict):
+            raise ValueError("expected a JSON object")
+        
+        analysis = {}
+        for field in LLM_ANALYSIS_FIELDS:
+            value = data.get(field, [])
+            if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+                raise ValueError(f'"{field}" must be a list of strings')
+            analysis[field] = value
+        
+        return analysis
     
     def extract_requirements(self, task_description: str) -> List[str]:
         """Extract specific requirements from task description"""
@@ -0,0 +1,8 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Tests drive providers far faster than the default 60 requests per minute
+os.environ.setdefault('MAX_REQUESTS_PER_MINUTE', '0')
+os.environ.setdefault('LLM_MEMO_MODE', 'off')
@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('dotenv')
+
+import app as app_module
+from job_queue import JobManager
+
+@pytest.fixture
+def client(monkeypatch):
+    # Jobs echo the options they were submitted with instead of running a crew
+    jobs = JobManager(lambda job: {'result': json.dumps(job.options, default=str)}, max_workers=2)
+    monkeypatch.setattr(app_module, 'jobs', jobs)
+    app_module.app.config['TESTING'] = True
+    yield app_module.app.test_client()
+    jobs.shutdown()
+
+def batch_records(response):
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+def test_batch_rejects_non_numeric_concurrency(client):
+    response = client.post('/api/batch', json={'tasks': ['Write a poem'], 'concurrency': 'many'})
+    assert response.status_code == 400
+    
+    response = client.post('/api/batch?concurrency=x', data='"Write a poem"\n',
+                           content_type='application/x-ndjson')
+    assert response.status_code == 400
+
+def test_batch_items_are_validated_like_single_tasks(client):
+    response = client.post('/api/batch', json={'tasks': [
+        {'id': 'a', 'task': 'Write a poem', 'execution_mode': 'sideways'},
+        {'id': 'b', 'task': 'Write a poem', 'timeout': 'soon'},
+        {'id': 'c', 'task': ''}
+    ]})
+    
+    records = {record['id']: record for record in batch_records(response)}
+    assert records['a']['status'] == 'failed' and 'execution mode' in records['a']['error']
+    assert records['b']['error'] == 'timeout must be a positive number'
+    assert records['c']['error'] == 'Task description is required'
+
+def test_batch_forwards_limits_and_cache_bypass(client):
+    response = client.post('/api/batch', json={'tasks': [{
+        'id': 'a', 'task': 'Write a poem', 'latency_budget': '30', 'cost_budget': 0.5,
+        'timeout': 60, 'bypass_cache': True, 'execution_mode': 'parallel'
+    }]})
+    
+    record, = batch_records(response)
+    options = json.loads(record['result'])
+    assert options['latency_budget'] == 30.0
+    assert options['cost_budget'] == 0.5
+    assert options['timeout'] == 60.0
+    assert options['bypass_cache'] is True
+    assert options['execution_mode'] == 'parallel'
+
+@pytest.mark.parametrize('last_event_id', ['abc', '-7', ''])
+def test_events_replay_from_start_on_bad_last_event_id(client, last_event_id):
+    job = app_module.jobs.submit('Write a poem', 'openai')
+    app_module.jobs.wait(job.id, timeout=5)
+    
+    response = client.get(f'/api/jobs/{job.id}/events', headers={'Last-Event-ID': last_event_id})
+    body = response.get_data(as_text=True)
+    
+    assert response.status_code == 200
+    assert body.startswith('id: 0\n')
+    assert 'event: job_finished' in body
+
+def test_events_resume_after_last_event_id(client):
+    job = app_module.jobs.submit('Write a poem', 'openai')
+    app_module.jobs.wait(job.id, timeout=5)
+    
+    body = client.get(f'/api/jobs/{job.id}/events', headers={'Last-Event-ID': '0'}).get_data(as_text=True)
+    assert body.startswith('id: 1\n')
+
+def test_process_task_queues_by_default(client):
+    response = client.post('/api/process-task', json={'task': 'Write a poem'})
+    
+    assert response.status_code == 202
+    body = response.get_json()
+    assert body['status_url'] == f"/api/jobs/{body['job_id']}"
+    assert app_module.jobs.wait(body['job_id'], timeout=5).status == 'completed'
+
+def test_process_task_blocks_only_when_asked(client):
+    response = client.post('/api/process-task', json={'task': 'Write a poem', 'wait': True})
+    assert response.status_code == 200
+    assert json.loads(response.get_json()['result'])['bypass_cache'] is False
+    
+    response = client.post('/api/process-task', json={'task': 'Write a poem', 'wait': True, 'async': True})
+    assert response.status_code == 202
+
+@pytest.mark.parametrize('body', [['Write a poem'], {'task': 42}, {'task': None}, {'task': '  '}])
+def test_process_task_rejects_malformed_bodies(client, body):
+    response = client.post('/api/process-task', json=body)
+    
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+def test_process_task_rejects_non_json_body(client):
+    response = client.post('/api/process-task', data='Write a poem', content_type='text/plain')
+    assert response.status_code == 400
@@ -0,0 +1,74 @@
+import asyncio
+import json
+import types
+
+import pytest
+
+pytest.importorskip('asgiref')
+pytest.importorskip('flask')
+pytest.importorskip('dotenv')
+
+import asgi
+
+def request(body):
+    """ASGI receive for one POST body, then a client that stays connected"""
+    messages = [{'type': 'http.request', 'body': json.dumps(body).encode(), 'more_body': False}]
+    
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.Event().wait()
+    
+    return receive
+
+async def call(body):
+    sent = []
+    
+    async def send(message):
+        sent.append(message)
+    
+    scope = {'type': 'http', 'method': 'POST', 'path': '/api/process-task'}
+    await asgi.app(scope, request(body), send)
+    return sent[0]['status'], json.loads(sent[1]['body'])
+
+def crew_result():
+    return types.SimpleNamespace(status='completed', to_dict=lambda: {
+        'result': 'done', 'agents_created': [], 'execution_time': 0.05, 'timings': {},
+        'metrics': {}, 'plan': {}, 'cached': False
+    })
+
+def test_native_crews_are_capped_by_max_concurrent_crews(monkeypatch):
+    running = []
+    peak = []
+    
+    async def aprocess_task(task, context, **kwargs):
+        running.append(task)
+        peak.append(len(running))
+        await asyncio.sleep(0.05)
+        running.remove(task)
+        return crew_result()
+    
+    monkeypatch.setattr(asgi.spawner, 'create_context', lambda *args, **kwargs: None)
+    monkeypatch.setattr(asgi.spawner, 'aprocess_task', aprocess_task)
+    
+    async def run():
+        monkeypatch.setattr(asgi, 'crew_slots', asyncio.Semaphore(2))
+        return await asyncio.gather(*(call({'task': f'task {i}', 'wait': True}) for i in range(5)))
+    
+    responses = asyncio.run(run())
+    assert [status for status, _ in responses] == [200] * 5
+    assert max(peak) == 2
+    assert max(body['wait_time'] for _, body in responses) > 0.05
+
+def test_streamed_and_queued_requests_go_to_the_job_queue(monkeypatch):
+    handled = []
+    
+    async def wsgi_app(scope, receive, send):
+        handled.append(json.loads((await receive())['body']))
+        await asgi._send_json(send, 202, {'success': True})
+    
+    monkeypatch.setattr(asgi, 'wsgi_app', wsgi_app)
+    
+    for body in ({'task': 'a', 'wait': True, 'stream': True}, {'task': 'b'}):
+        assert asyncio.run(call(body))[0] == 202
+    assert [body['task'] for body in handled] == ['a', 'b']
@@ -0,0 +1,45 @@
+import pytest
+
+from context_compactor import ContextCompactor, extractive_trim
+from rate_limiter import estimate_tokens
+
+REPORT = '\n'.join(
+    f"Finding {i}: the market grew by {i} percent. Supporting detail follows here. "
+    f"More background on item {i} that a later agent can live without."
+    for i in range(40)
+)
+
+def test_off_by_default(monkeypatch):
+    monkeypatch.delenv('CONTEXT_COMPACTION', raising=False)
+    compactor = ContextCompactor()
+    
+    assert not compactor.enabled
+    assert compactor.compact(REPORT, 50) == REPORT
+
+def test_zero_budget_disables_compaction():
+    assert not ContextCompactor(mode='extractive', budget_tokens=0).enabled
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        ContextCompactor(mode='squeeze')
+
+def test_extractive_keeps_leads_within_budget():
+    trimmed = ContextCompactor(mode='extractive', budget_tokens=300).compact(REPORT, 300)
+    
+    assert estimate_tokens(trimmed) <= 300
+    assert trimmed.startswith('Finding 0: the market grew by 0 percent.')
+    assert '[...]' in trimmed
+    assert 'Condensed from about' in trimmed
+
+def test_text_within_budget_is_unchanged():
+    assert extractive_trim('Short note.', 100) == 'Short note.'
+
+def test_summary_falls_back_to_trimming_on_errors():
+    class BrokenLLM:
+        def invoke(self, messages):
+            raise RuntimeError('provider down')
+    
+    compactor = ContextCompactor(mode='summary', budget_tokens=200)
+    
+    trimmed = compactor.compact(REPORT, 200, llm=BrokenLLM())
+    assert estimate_tokens(trimmed) <= 200
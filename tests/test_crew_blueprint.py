@@ -0,0 +1,105 @@
+import types
+
+import pytest
+
+from config.agent_templates import AgentTemplateManager
+from config.task_templates import TaskTemplateManager
+from crew_blueprint import AgentPool, BlueprintCache, compile_blueprint
+
+@pytest.fixture(scope='module')
+def agent_templates():
+    return AgentTemplateManager(template_dirs=[])
+
+@pytest.fixture(scope='module')
+def task_templates():
+    return TaskTemplateManager()
+
+AGENTS = ['strategist', 'coordinator', 'analyst']
+
+def test_parallel_blueprint_keeps_template_dependencies(agent_templates, task_templates):
+    parallel = compile_blueprint(agent_templates, task_templates, 'planning', AGENTS, 'parallel')
+    sequential = compile_blueprint(agent_templates, task_templates, 'planning', AGENTS)
+    
+    assert parallel.dependencies == ((), (0,), (0,))
+    assert sequential.dependencies == ((), (0,), (1,))
+    assert parallel.roles == [agent_templates.get_template(t)['role'] for t in AGENTS]
+
+def test_extra_agents_build_on_the_template_sinks(agent_templates, task_templates):
+    blueprint = compile_blueprint(
+        agent_templates, task_templates, 'research', ['researcher', 'analyst', 'writer'], 'parallel'
+    )
+    
+    extra = blueprint.tasks[2]
+    assert extra.depends_on == (1,)
+    assert extra.render('Map the EV market') == 'Support the team in completing: Map the EV market'
+    assert blueprint.tasks[0].render('Map the EV market').endswith('Original request: Map the EV market')
+
+def test_invalid_templates_are_rejected(agent_templates, task_templates):
+    with pytest.raises(ValueError):
+        compile_blueprint(agent_templates, task_templates, 'research', [])
+    with pytest.raises(ValueError):
+        compile_blueprint(agent_templates, task_templates, 'research', ['astronaut'])
+    
+    forward = types.SimpleNamespace(get_template=lambda task_type: {'subtasks': [
+        {'description': 'a', 'expected_output': 'a', 'depends_on': [1]},
+        {'description': 'b', 'expected_output': 'b'}
+    ]})
+    with pytest.raises(ValueError, match='invalid depends_on'):
+        compile_blueprint(agent_templates, forward, 'research', ['researcher', 'analyst'])
+
+def test_blueprint_cache_compiles_each_shape_once(agent_templates, task_templates):
+    cache = BlueprintCache(agent_templates, task_templates)
+    
+    first = cache.get('research', ['researcher', 'analyst'])
+    assert cache.get('research', ['researcher', 'analyst']) is first
+    assert cache.get('research', ['researcher', 'analyst'], 'parallel') is not first
+    assert cache.get_stats() == {'hits': 1, 'misses': 2, 'size': 2}
+    
+    cache.clear()
+    assert cache.get('research', ['researcher', 'analyst']) is not first
+
+class BuildCounter:
+    """Stands in for AgentPool._build without CrewAI"""
+    
+    def __init__(self):
+        self.built = 0
+    
+    def __call__(self, spec, llm, step_callback=None):
+        self.built += 1
+        return types.SimpleNamespace(spec=spec, llm=llm, step_callback=step_callback, crew=None)
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = AgentPool(max_idle=1)
+    monkeypatch.setattr(pool, '_build', BuildCounter())
+    return pool
+
+@pytest.fixture
+def spec(agent_templates, task_templates):
+    return compile_blueprint(agent_templates, task_templates, 'research', ['researcher']).agents[0]
+
+def test_released_agent_is_reused_with_the_new_llm(pool, spec):
+    agent = pool.acquire(spec, 'openai', 'gpt', llm='first-llm')
+    pool.release([agent])
+    assert agent.llm is None and agent.crew is None
+    
+    again = pool.acquire(spec, 'openai', 'gpt', llm='second-llm', step_callback=print)
+    assert again is agent
+    assert (again.llm, again.step_callback) == ('second-llm', print)
+    assert pool._build.built == 1
+    
+    # Another model gets its own agents
+    assert pool.acquire(spec, 'groq', 'llama', llm='third-llm') is not agent
+    assert pool._build.built == 2
+
+def test_pool_caps_idle_agents_and_drops_discarded_ones(pool, spec):
+    agents = [pool.acquire(spec, 'openai', 'gpt', llm=None) for _ in range(2)]
+    pool.release(agents)
+    stats = pool.get_stats()
+    assert (stats['idle'], stats['leased'], stats['discarded']) == (1, 0, 1)
+    
+    failed = pool.acquire(spec, 'openai', 'gpt', llm=None)
+    pool.discard([failed])
+    pool.release([failed])
+    assert pool.get_stats()['idle'] == 0
+    assert pool.acquire(spec, 'openai', 'gpt', llm=None) is not failed
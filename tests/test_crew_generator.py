@@ -0,0 +1,116 @@
+import threading
+import time
+import types
+
+import pytest
+
+from crew_generator import MetaCrewSpawner
+from execution_context import ExecutionContext, CrewCancelledError, CrewExecutionError
+
+ANALYSIS = {
+    'task_type': 'research',
+    'complexity': 'simple',
+    'domain': 'general',
+    'suggested_agents': [{'type': 'researcher'}, {'type': 'analyst'}]
+}
+
+def parallel_crew(context, before_abort=None):
+    """Crew whose first task runs on its own thread, as CrewAI's async tasks do
+    
+    The abort raised in that thread is swallowed, as CrewAI does, and the
+    dependent task then fails on the missing output.
+    """
+    def kickoff():
+        outputs = []
+        
+        def first_task():
+            try:
+                if before_abort:
+                    before_abort()
+                context.check_cancelled()
+                outputs.append('research notes')
+            except Exception:
+                pass
+        
+        worker = threading.Thread(target=first_task)
+        worker.start()
+        worker.join()
+        return outputs[0].upper()
+    
+    return types.SimpleNamespace(kickoff=kickoff, tasks=[1, 2])
+
+@pytest.fixture
+def spawner():
+    spawner = MetaCrewSpawner()
+    spawner.result_cache = None
+    return spawner
+
+def make_context(**kwargs):
+    kwargs.setdefault('execution_mode', 'parallel')
+    return ExecutionContext(provider='openai', model='gpt-4o', llm=object(), **kwargs)
+
+def test_parallel_cancel_in_task_thread_reports_cancelled(spawner):
+    context = make_context()
+    spawner.generate_crew = lambda task, analysis, ctx: parallel_crew(ctx, before_abort=ctx.cancel_event.set)
+    
+    with pytest.raises(CrewCancelledError):
+        spawner.process_task('Research solar panels', context, analysis=dict(ANALYSIS))
+
+def test_parallel_deadline_in_task_thread_reports_deadline(spawner):
+    context = make_context(timeout=0.05)
+    spawner.generate_crew = lambda task, analysis, ctx: parallel_crew(ctx, before_abort=lambda: time.sleep(0.1))
+    
+    result = spawner.process_task('Research solar panels', context, analysis=dict(ANALYSIS))
+    assert result.status == 'deadline_exceeded'
+
+def test_unrelated_failure_is_still_an_error(spawner):
+    context = make_context()
+    spawner.generate_crew = lambda task, analysis, ctx: parallel_crew(ctx, before_abort=lambda: 1 / 0)
+    
+    with pytest.raises(CrewExecutionError):
+        spawner.process_task('Research solar panels', context, analysis=dict(ANALYSIS))
+
+def metered_crew(context, cost):
+    """Crew that makes one agent LLM call costing cost"""
+    def kickoff():
+        context.record_llm_usage('openai', 'gpt-4o', 100, 50, cost, 0.01)
+        context.record_agent_time(0, 'Researcher', 0.01)
+        context.record_compaction(200, 100, 100)
+        return 'report'
+    
+    return types.SimpleNamespace(kickoff=kickoff, tasks=[1])
+
+def test_reused_context_reports_each_run_on_its_own(spawner):
+    context = make_context(execution_mode='sequential')
+    costs = iter([0.5, 0.25])
+    spawner.generate_crew = lambda task, analysis, ctx: metered_crew(ctx, next(costs))
+    
+    spawner.process_task('Research solar panels', context, analysis=dict(ANALYSIS))
+    second = spawner.process_task('Research wind farms', context, analysis=dict(ANALYSIS))
+    
+    metrics = second.metrics()
+    assert metrics['cost_usd'] == 0.25
+    assert metrics['prompt_tokens'] == 100
+    assert len(metrics['agents']) == 1
+    assert metrics['context_compaction']['outputs'] == 1
+    assert second.plan['actual_cost_usd'] == 0.25
+    assert context.overhead_cost == 0.0
+
+def test_planner_learns_from_each_run_alone(spawner):
+    context = make_context(execution_mode='sequential')
+    
+    def analyze(task, ctx):
+        ctx.record_llm_usage('openai', 'gpt-4o', 10, 10, 0.2, 0.01)
+        return dict(ANALYSIS)
+    
+    spawner.analyze_task = analyze
+    spawner.generate_crew = lambda task, analysis, ctx: metered_crew(ctx, 1.0)
+    
+    for _ in range(3):
+        result = spawner.process_task('Research solar panels', context)
+    
+    assert result.overhead_cost == 0.2
+    assert result.plan['actual_cost_usd'] == pytest.approx(1.2)
+    estimate = spawner.planner.history.estimate('openai', 'gpt-4o')
+    assert estimate['samples'] == 3
+    assert estimate['cost_usd'] == pytest.approx(1.0)
@@ -0,0 +1,73 @@
+import types
+
+import pytest
+
+from config.agent_templates import AgentTemplateManager
+from config.task_templates import TaskTemplateManager
+from crew_blueprint import BlueprintCache
+from crew_planner import AgentCostHistory, CrewPlanner
+
+AGENTS = [{'type': agent_type} for agent_type in ('researcher', 'analyst', 'writer', 'quality_assurance', 'strategist')]
+
+@pytest.fixture
+def planner():
+    blueprints = BlueprintCache(AgentTemplateManager(template_dirs=[]), TaskTemplateManager())
+    history = AgentCostHistory(alpha=0.5, default_seconds=10)
+    return CrewPlanner(blueprints, history)
+
+def analysis(agents=AGENTS):
+    return {'task_type': 'research', 'complexity': 'simple', 'suggested_agents': list(agents)}
+
+def test_without_budget_keeps_every_suggested_agent(planner):
+    plan = planner.plan(analysis(), 'openai', 'gpt-4o')
+    
+    assert plan['suggested_agents'] == AGENTS
+    assert plan['fits_budget']
+
+def test_latency_budget_trims_lowest_priority_agents(planner):
+    # Sequential crew: one 10s turn per agent, 5s already spent on analysis
+    plan = planner.plan(analysis(), 'openai', 'gpt-4o', latency_budget=35, elapsed=5)
+    
+    assert [agent['type'] for agent in plan['suggested_agents']] == ['researcher', 'analyst', 'writer']
+    assert plan['estimated_seconds'] == 35
+    assert plan['fits_budget']
+
+def test_budget_that_never_fits_keeps_one_agent(planner):
+    plan = planner.plan(analysis(), 'openai', 'gpt-4o', latency_budget=1)
+    
+    assert plan['agents'] == 1
+    assert not plan['fits_budget']
+
+def test_cost_budget_counts_spend_so_far(planner):
+    planner.history.record('openai', 'gpt-4o', [10], 1.0)
+    
+    plan = planner.plan(analysis(), 'openai', 'gpt-4o', cost_budget=3.5, spent=0.5)
+    assert plan['agents'] == 3
+    assert plan['estimated_cost_usd'] == 3.5
+
+def test_record_keeps_overhead_out_of_agent_history(planner):
+    result = types.SimpleNamespace(
+        agent_timings=[{'seconds': 4}, {'seconds': 6}],
+        usage={'openai/gpt-4o': {'cost_usd': 2.5}},
+        overhead_cost=0.5,
+        execution_time=12,
+        cached=False
+    )
+    
+    actual = planner.record('openai', 'gpt-4o', result)
+    estimate = planner.history.estimate('openai', 'gpt-4o')
+    
+    assert actual['actual_cost_usd'] == 2.5
+    assert estimate['cost_usd'] == 1.0
+    assert estimate['seconds'] == 5
+    assert estimate['source'] == 'history'
+
+def test_history_is_a_moving_average():
+    history = AgentCostHistory(alpha=0.5)
+    history.record('p', 'm', [10], 1.0)
+    history.record('p', 'm', [20], 3.0)
+    
+    estimate = history.estimate('p', 'm')
+    assert estimate['seconds'] == 15
+    assert estimate['cost_usd'] == 2.0
+    assert estimate['samples'] == 2
@@ -0,0 +1,155 @@
+import threading
+import time
+
+import pytest
+
+from durable_queue import DurableJobStore, DurableJobManager, DurableWorker, DurableEventStream, job_from_row
+from execution_context import CrewCancelledError
+from job_queue import JOB_QUEUED, JOB_RUNNING, JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED
+
+@pytest.fixture
+def store(tmp_path):
+    return DurableJobStore(path=str(tmp_path / 'jobs.db'), lease_seconds=60, max_attempts=2)
+
+def test_claim_leases_oldest_job_once(store):
+    first = store.enqueue('first', 'openai')
+    store.enqueue('second', 'openai')
+    
+    row = store.claim('w1')
+    assert row['id'] == first and row['status'] == JOB_RUNNING and row['attempts'] == 1
+    assert store.claim('w2')['task'] == 'second'
+    assert store.claim('w3') is None
+
+def test_expired_lease_is_retried_then_failed(store):
+    store.lease_seconds = 0.01
+    job_id = store.enqueue('task', 'openai')
+    store.claim('w1')
+    time.sleep(0.02)
+    
+    row = store.claim('w2')
+    assert row['id'] == job_id and row['worker_id'] == 'w2' and row['attempts'] == 2
+    # The first worker lost its lease and can no longer renew or finish the job
+    assert store.heartbeat(job_id, 'w1') is None
+    assert not store.finish(job_id, 'w1', JOB_COMPLETED)
+    
+    time.sleep(0.02)
+    assert store.claim('w3') is None
+    assert store.get(job_id)['status'] == JOB_FAILED
+
+def test_release_requeues_without_counting_the_attempt(store):
+    job_id = store.enqueue('task', 'openai')
+    store.claim('w1')
+    store.release(job_id, 'w1')
+    
+    row = store.get(job_id)
+    assert row['status'] == JOB_QUEUED and row['attempts'] == 0
+
+def test_cancel_queued_and_running_jobs(store):
+    queued = store.enqueue('queued', 'openai')
+    running = store.enqueue('running', 'openai')
+    store.claim('w1')
+    store.claim('w1')
+    
+    store.release(queued, 'w1')
+    row, cancelled = store.cancel(queued)
+    assert cancelled and row['status'] == JOB_CANCELLED
+    
+    row, cancelled = store.cancel(running)
+    assert not cancelled and row['status'] == JOB_RUNNING
+    assert store.heartbeat(running, 'w1') is True
+
+def test_event_sequence_is_shared_between_processes(store):
+    other = DurableJobStore(path=store.path)
+    job_id = store.enqueue('task', 'openai')
+    
+    store.add_event(job_id, 'job_started', {})
+    other.add_event(job_id, 'agent_step', {})
+    store.add_event(job_id, 'task_completed', {})
+    
+    events = store.events_since(job_id)
+    assert [event['seq'] for event in events] == [0, 1, 2]
+    assert [event['type'] for event in events] == ['job_started', 'agent_step', 'task_completed']
+
+def test_tokens_are_merged_into_few_writes(store):
+    job_id = store.enqueue('task', 'openai')
+    stream = DurableEventStream(store, job_id, token_flush_interval=60)
+    
+    for word in ['Hello', ' ', 'world']:
+        stream.emit('token', token=word)
+    stream.emit('task_completed', index=0)
+    
+    events = store.events_since(job_id)
+    assert [event['type'] for event in events] == ['token', 'task_completed']
+    assert events[0]['data'] == {'token': 'Hello world'}
+
+def test_worker_runs_jobs_and_honors_cancel(store):
+    started = threading.Event()
+    
+    def runner(job):
+        if job.task == 'slow':
+            started.set()
+            while not job.cancel_event.wait(0.01):
+                pass
+            raise CrewCancelledError('cancelled')
+        return {'result': job.task.upper(), 'status': 'completed'}
+    
+    store.lease_seconds = 0.3
+    manager = DurableJobManager(store, poll_interval=0.05)
+    worker = DurableWorker(store, runner, concurrency=2, poll_interval=0.05)
+    thread = threading.Thread(target=worker.run)
+    thread.start()
+    try:
+        done = manager.submit('quick', 'openai')
+        slow = manager.submit('slow', 'openai')
+        
+        assert manager.wait(done.id, timeout=5).result == 'QUICK'
+        assert started.wait(5)
+        manager.cancel(slow.id)
+        assert manager.wait(slow.id, timeout=5).status == JOB_CANCELLED
+        
+        events = [event['type'] for event in store.events_since(done.id)]
+        assert events[0] == 'job_started' and events[-1] == 'job_finished'
+    finally:
+        worker.stop()
+        thread.join()
+
+def test_reader_that_sees_the_final_status_gets_every_event(store):
+    """A stream reader polling right as the worker finishes still sees the last tokens and job_finished"""
+    seen = []
+    finish = store.finish
+    
+    def finish_then_read(job_id, *args, **kwargs):
+        finished = finish(job_id, *args, **kwargs)
+        # Poll as a concurrent SSE reader would, between the status update and anything after it
+        seen.extend(event['type'] for event in DurableEventStream(store, job_id, poll_interval=0.01).iter_events())
+        return finished
+    
+    store.finish = finish_then_read
+    
+    def runner(job):
+        job.events.token_flush_interval = 60
+        job.events.emit('token', token='partial answer')
+        return {'result': 'done', 'status': 'completed'}
+    
+    store.enqueue('task', 'openai')
+    worker = DurableWorker(store, runner, concurrency=1, poll_interval=0.05)
+    row = store.claim(worker.worker_id)
+    worker._execute(job_from_row(store, row), row['attempts'])
+    
+    assert seen == ['job_started', 'token', 'job_finished']
+
+def test_jobs_finished_outside_a_worker_get_job_finished(store):
+    store.lease_seconds = 0.01
+    store.max_attempts = 1
+    lost = store.enqueue('lost', 'openai')
+    store.claim('w1')
+    time.sleep(0.02)
+    queued = store.enqueue('queued', 'openai')
+    store.cancel(queued)
+    store.claim('w2')
+    
+    assert store.get(lost)['status'] == JOB_FAILED
+    for job_id in (lost, queued):
+        finished = store.events_since(job_id)[-1]
+        assert finished['type'] == 'job_finished'
+        assert finished['data']['status'] == store.get(job_id)['status']
@@ -0,0 +1,96 @@
+import threading
+
+from execution_context import CrewCancelledError
+from job_queue import (
+    JobManager, JOB_COMPLETED, JOB_FAILED, JOB_CANCELLED, JOB_DEADLINE_EXCEEDED
+)
+
+def make_manager(runner, max_workers=1) -> JobManager:
+    return JobManager(runner, max_workers=max_workers)
+
+def test_submit_runs_job_and_wait_returns_result():
+    jobs = make_manager(lambda job: {'result': job.task.upper(), 'cached': True})
+    
+    job = jobs.wait(jobs.submit('write a poem', 'openai').id, timeout=5)
+    
+    assert job.status == JOB_COMPLETED
+    assert job.result == 'WRITE A POEM'
+    assert job.cached is True
+    assert job.finished_at >= job.started_at >= job.submitted_at
+    jobs.shutdown()
+
+def test_as_completed_yields_in_completion_order():
+    release = {name: threading.Event() for name in ('first', 'second')}
+    
+    def runner(job):
+        release[job.task].wait(5)
+        return {'result': job.task}
+    
+    jobs = make_manager(runner, max_workers=2)
+    ids = [jobs.submit(name, 'openai').id for name in ('first', 'second')]
+    release['second'].set()
+    
+    finished = jobs.as_completed(ids)
+    assert next(finished).result == 'second'
+    release['first'].set()
+    assert next(finished).result == 'first'
+    jobs.shutdown()
+
+def test_queued_job_cancelled_before_it_starts():
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    
+    def runner(job):
+        calls.append(job.task)
+        started.set()
+        release.wait(5)
+        return {'result': job.task}
+    
+    jobs = make_manager(runner)
+    running = jobs.submit('running', 'openai')
+    started.wait(5)
+    queued = jobs.submit('queued', 'openai')
+    
+    assert jobs.cancel(queued.id).status == JOB_CANCELLED
+    assert jobs.get_stats()['queue_depth'] == 0
+    release.set()
+    
+    assert jobs.wait(running.id, timeout=5).status == JOB_COMPLETED
+    jobs.shutdown()
+    assert calls == ['running']
+    assert jobs.get(queued.id).status == JOB_CANCELLED
+
+def test_runner_outcomes_map_to_job_states():
+    def runner(job):
+        if job.task == 'cancel':
+            raise CrewCancelledError('stopped')
+        if job.task == 'fail':
+            raise ValueError('boom')
+        if job.task == 'late':
+            return {'status': JOB_DEADLINE_EXCEEDED, 'result': 'partial', 'error': 'timed out'}
+        return {'result': 'done'}
+    
+    jobs = make_manager(runner)
+    ids = {task: jobs.submit(task, 'openai').id for task in ('ok', 'cancel', 'fail', 'late')}
+    states = {job.task: job for job in jobs.as_completed(list(ids.values()))}
+    
+    assert states['ok'].status == JOB_COMPLETED
+    assert states['cancel'].status == JOB_CANCELLED
+    assert states['fail'].status == JOB_FAILED and states['fail'].error == 'boom'
+    assert states['late'].status == JOB_DEADLINE_EXCEEDED and states['late'].result == 'partial'
+    
+    stats = jobs.get_stats()
+    assert (stats['completed'], stats['cancelled'], stats['failed'], stats['deadline_exceeded']) == (1, 1, 1, 1)
+    jobs.shutdown()
+
+def test_finished_jobs_beyond_retention_are_pruned():
+    jobs = JobManager(lambda job: {'result': job.task}, max_workers=1, max_retained=2)
+    first = jobs.submit('first', 'openai')
+    jobs.wait(first.id, timeout=5)
+    for task in ('second', 'third'):
+        jobs.wait(jobs.submit(task, 'openai').id, timeout=5)
+    
+    assert jobs.get(first.id) is None
+    assert jobs.wait(first.id) is None
+    jobs.shutdown()
@@ -0,0 +1,209 @@
+import time
+import asyncio
+import threading
+import types
+from concurrent.futures import Future
+
+import pytest
+
+from llm_router import (
+    LLMRouter, LLMUnavailableError, LLMDeadlineExceeded, CircuitBreaker,
+    CIRCUIT_CLOSED, CIRCUIT_OPEN, CIRCUIT_HALF_OPEN
+)
+
+class FakeClient:
+    """Sync and async chat client that answers after delay, or fails"""
+    
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.finished = 0
+        self._lock = threading.Lock()
+    
+    def _reply(self):
+        if self.fail:
+            raise ValueError(f'{self.name} failed')
+        return types.SimpleNamespace(content=self.name, response_metadata={})
+    
+    def invoke(self, messages, **kwargs):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        with self._lock:
+            self.finished += 1
+        return self._reply()
+    
+    async def ainvoke(self, messages, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        self.finished += 1
+        return self._reply()
+
+class FakeSelector:
+    def __init__(self, **clients):
+        self.clients = clients
+        self.providers = {name: {'default_model': 'm'} for name in clients}
+    
+    def create_llm_instance(self, provider, model, streaming=False):
+        return self.clients[provider]
+    
+    def create_analysis_llm(self, provider):
+        return self.clients[provider]
+    
+    def get_analysis_model(self, provider):
+        return 'm'
+    
+    def validate_provider(self, provider):
+        return True
+
+def make_router(**clients) -> LLMRouter:
+    router = LLMRouter(FakeSelector(**clients), failure_threshold=2, reset_timeout=60)
+    router.limiter.max_retries = 0
+    router.hedge_delay = 0.05
+    return router
+
+CANDIDATES = [('a', 'm'), ('b', 'm'), ('c', 'm')]
+
+def test_circuit_breaker_opens_and_half_opens():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_CLOSED
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_OPEN
+    assert not breaker.allow()
+    
+    time.sleep(0.06)
+    assert breaker.state == CIRCUIT_HALF_OPEN
+    assert breaker.allow()
+    # Only one trial request while half open
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CIRCUIT_CLOSED
+
+def test_failover_skips_failed_provider():
+    router = make_router(a=FakeClient('a', fail=True), b=FakeClient('b'), c=FakeClient('c'))
+    
+    assert router.invoke(CANDIDATES, ['hi']).content == 'b'
+    assert router.stats['a'].failures == 1
+    assert router.llm_selector.clients['c'].calls == 0
+
+def test_open_circuit_is_not_called():
+    router = make_router(a=FakeClient('a', fail=True), b=FakeClient('b'), c=FakeClient('c'))
+    for _ in range(2):
+        router.invoke(CANDIDATES, ['hi'])
+    assert router.breakers['a'].state == CIRCUIT_OPEN
+    
+    router.invoke(CANDIDATES, ['hi'])
+    assert router.llm_selector.clients['a'].calls == 2
+
+def test_all_providers_failing_raises():
+    router = make_router(a=FakeClient('a', fail=True), b=FakeClient('b', fail=True))
+    with pytest.raises(LLMUnavailableError):
+        router.invoke([('a', 'm'), ('b', 'm')], ['hi'])
+
+def test_hedge_wins_when_primary_is_slow():
+    router = make_router(a=FakeClient('a', delay=0.5), b=FakeClient('b'), c=FakeClient('c'))
+    
+    assert router.invoke(CANDIDATES, ['hi'], hedge=True).content == 'b'
+    assert router.stats['b'].to_dict()['hedges'] == 1
+    assert router.stats['b'].to_dict()['hedge_wins'] == 1
+    assert router.llm_selector.clients['c'].calls == 0
+
+def test_fast_primary_failure_is_failover_not_hedge():
+    clients = dict(a=FakeClient('a', fail=True), b=FakeClient('b', delay=0.1), c=FakeClient('c'))
+    router = make_router(**clients)
+    
+    assert router.invoke(CANDIDATES, ['hi'], hedge=True).content == 'b'
+    assert clients['c'].calls == 0
+    assert router.stats['b'].to_dict()['hedges'] == 0
+
+class SaturatedExecutor:
+    """Runs the first submission on a thread and queues the rest, like a busy pool"""
+    
+    def __init__(self):
+        self.futures = []
+    
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        if not self.futures:
+            def run():
+                future.set_running_or_notify_cancel()
+                try:
+                    future.set_result(fn(*args, **kwargs))
+                except Exception as e:
+                    future.set_exception(e)
+            threading.Thread(target=run).start()
+        self.futures.append(future)
+        return future
+
+def test_queued_hedge_is_cancelled_when_primary_answers():
+    router = make_router(a=FakeClient('a', delay=0.2), b=FakeClient('b'), c=FakeClient('c'))
+    executor = router._hedge_executor = SaturatedExecutor()
+    
+    assert router.invoke(CANDIDATES, ['hi'], hedge=True).content == 'a'
+    assert len(executor.futures) == 2
+    assert executor.futures[1].cancelled()
+
+def test_async_hedge_wins_and_cancels_primary():
+    clients = dict(a=FakeClient('a', delay=0.5), b=FakeClient('b'), c=FakeClient('c'))
+    router = make_router(**clients)
+    
+    async def run():
+        response = await router.ainvoke(CANDIDATES, ['hi'], hedge=True)
+        await asyncio.sleep(0.01)
+        return response
+    
+    assert asyncio.run(run()).content == 'b'
+    assert clients['a'].calls == 1 and clients['a'].finished == 0
+    assert router.stats['b'].to_dict()['hedge_wins'] == 1
+
+def test_async_fast_primary_failure_is_failover_not_hedge():
+    clients = dict(a=FakeClient('a', fail=True), b=FakeClient('b', delay=0.1), c=FakeClient('c'))
+    router = make_router(**clients)
+    
+    assert asyncio.run(router.ainvoke(CANDIDATES, ['hi'], hedge=True)).content == 'b'
+    assert clients['c'].calls == 0
+    assert router.stats['b'].to_dict()['hedges'] == 0
+
+def throttle(router, provider):
+    """Use up provider's request bucket so its next slot is about a minute away"""
+    router.limiter.requests_per_minute = 1
+    state = router.limiter._state(provider, 'm')
+    state['requests'].tokens = 0
+    return state['requests']
+
+def test_call_that_cannot_get_a_slot_in_time_uses_no_quota():
+    clients = dict(a=FakeClient('a'))
+    router = make_router(**clients)
+    bucket = throttle(router, 'a')
+    
+    started = time.time()
+    with pytest.raises(LLMDeadlineExceeded):
+        router.invoke([('a', 'm')], ['hi'], timeout=0.5)
+    
+    assert time.time() - started < 0.2
+    assert clients['a'].calls == 0
+    assert bucket.tokens == pytest.approx(0, abs=0.05)
+    assert router.breakers['a'].state == CIRCUIT_CLOSED
+    assert router.stats['a'].failures == 0
+
+def test_cancelled_async_call_refunds_its_reservation():
+    clients = dict(a=FakeClient('a'))
+    router = make_router(**clients)
+    router.limiter.requests_per_minute = 120
+    bucket = router.limiter._state('a', 'm')['requests']
+    bucket.tokens = 0
+    
+    async def run():
+        call = asyncio.ensure_future(router.ainvoke([('a', 'm')], ['hi']))
+        await asyncio.sleep(0.05)
+        call.cancel()
+        await asyncio.gather(call, return_exceptions=True)
+    
+    asyncio.run(run())
+    assert clients['a'].calls == 0
+    # The slot half a second away was given back instead of leaving the bucket in debt
+    assert bucket.tokens == pytest.approx(0, abs=0.05)
+    assert router.limiter.get_stats()['a/m']['requests'] == 0
@@ -0,0 +1,68 @@
+import pytest
+
+from rate_limiter import RateLimiter, RateLimitWaitExceeded, TokenBucket
+
+def test_token_bucket_reserve_goes_into_debt():
+    bucket = TokenBucket(60, capacity=1)
+    assert bucket.reserve(1) == 0.0
+    # One request per second: the next caller waits for its own slot
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+    bucket.adjust(-1)
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+
+def test_reserve_within_max_wait_counts_the_request():
+    limiter = RateLimiter(requests_per_minute=60)
+    limiter._state('p', 'm')['requests'].capacity = 1
+    
+    assert limiter.reserve('p', 'm', max_wait=5) == 0.0
+    assert limiter.reserve('p', 'm', max_wait=5) > 0
+    stats = limiter.get_stats()['p/m']
+    assert stats['requests'] == 2
+    assert stats['throttled'] == 1
+
+def test_reserve_past_max_wait_leaves_quota_untouched():
+    limiter = RateLimiter(requests_per_minute=6, tokens_per_minute=600)
+    state = limiter._state('p', 'm')
+    limiter.reserve('p', 'm', estimated_tokens=60)
+    before = (state['requests'].tokens, state['tokens'].tokens)
+    
+    with pytest.raises(RateLimitWaitExceeded):
+        limiter.reserve('p', 'm', estimated_tokens=60, max_wait=0.5)
+    
+    assert state['requests'].tokens == pytest.approx(before[0], abs=0.01)
+    assert state['tokens'].tokens == pytest.approx(before[1], abs=1)
+    assert limiter.get_stats()['p/m']['requests'] == 1
+
+def test_refund_gives_back_a_reservation():
+    limiter = RateLimiter(requests_per_minute=6)
+    state = limiter._state('p', 'm')
+    
+    limiter.reserve('p', 'm')
+    limiter.refund('p', 'm')
+    
+    assert state['requests'].tokens == pytest.approx(state['requests'].capacity, abs=0.01)
+    assert limiter.get_stats()['p/m']['requests'] == 0
+
+def test_backoff_cooldown_applies_to_every_caller():
+    limiter = RateLimiter(requests_per_minute=0)
+    limiter.backoff('p', 'm', attempt=0, retry_after=2)
+    
+    assert limiter.get_stats()['p/m']['cooldown'] > 1.5
+    assert limiter.reserve('p', 'm') > 1.5
+    with pytest.raises(RateLimitWaitExceeded):
+        limiter.reserve('p', 'm', max_wait=0.1)
+    assert limiter.reserve('q', 'm', max_wait=0.1) == 0.0
+
+def test_oversized_estimates_are_charged_and_refunded_at_capacity():
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=600)
+    bucket = limiter._state('p', 'm')['tokens']
+    assert bucket.capacity == 60
+    
+    limiter.reserve('p', 'm', estimated_tokens=500)
+    limiter.refund('p', 'm', estimated_tokens=500)
+    assert bucket.tokens == pytest.approx(60, abs=1)
+    
+    # The call used 100 tokens; only the 60 reserved up front were charged so far
+    limiter.reserve('p', 'm', estimated_tokens=500)
+    limiter.record_tokens('p', 'm', actual_tokens=100, estimated_tokens=500)
+    assert bucket.tokens == pytest.approx(-40, abs=1)
@@ -0,0 +1,70 @@
+import pytest
+
+from task_parser import TaskParser
+from benchmarks.classify import generate_corpus, legacy_classify
+
+class NoLLM:
+    """Fails the test if the parser asks the LLM anything"""
+    
+    def invoke(self, messages):
+        raise AssertionError('LLM called')
+
+@pytest.fixture
+def parser():
+    return TaskParser(cache=False)
+
+def test_default_mode_is_full(monkeypatch):
+    monkeypatch.delenv('ANALYSIS_MODE', raising=False)
+    assert TaskParser(cache=False).analysis_mode == 'full'
+
+def test_rules_mode_classifies_without_llm(parser):
+    analysis = parser.parse_task('Investigate the healthcare market for wellness apps', NoLLM(), mode='rules')
+    
+    assert analysis['task_type'] == 'research'
+    assert analysis['domain'] == 'health'
+    assert analysis['analysis_source'] == 'rules'
+
+def test_auto_mode_skips_llm_when_confident(parser):
+    analysis = parser.parse_task('Write a blog post about our marketing campaign', NoLLM(), mode='auto')
+    
+    assert analysis['confidence'] >= parser.confidence_threshold
+    assert analysis['analysis_source'] == 'rules'
+
+def test_rule_confidence():
+    assert TaskParser.rule_confidence({'task_type': {'research': 1}, 'domain': {'business': 1}}) == 0.5
+    assert TaskParser.rule_confidence({'task_type': {'research': 3}, 'domain': {'business': 1}}) == 0.5
+    assert TaskParser.rule_confidence({'task_type': {'research': 2, 'analysis': 2}, 'domain': {'tech': 4}}) == 0
+    # No domain keyword at all
+    assert TaskParser.rule_confidence({'task_type': {'research': 3}}) == 0
+
+def test_classify_many_matches_single_analysis(parser):
+    tasks = ['Fix the login bug in our software', 'Plan a simple team offsite', 'Summarize this report']
+    
+    analyses = parser.classify_many(tasks)
+    assert analyses == [parser._basic_analysis(task) for task in tasks]
+    assert [analysis['task_type'] for analysis in analyses] == ['problem_solving', 'planning', 'general']
+    # Batch classification doesn't pay for the auto-mode confidence
+    assert all('confidence' not in analysis for analysis in analyses)
+
+@pytest.mark.parametrize('task', [
+    # First listed category wins, not the one with the most hits
+    'Research, analyze and evaluate the options',
+    # Plain substrings: "art" in "startup", "tech" in "technical"
+    'Summarize the startup pitch for a non-technical audience',
+    # Keywords are matched against the lowercased text, so "AI" never matches
+    'Build an AI assistant',
+    'Write an in-depth, complex and simple guide'
+])
+def test_classification_matches_legacy_rules(parser, task):
+    expected = legacy_classify(parser, task)
+    assert parser._basic_analysis(task) == expected
+
+def test_classify_many_matches_legacy_rules_on_corpus(parser):
+    corpus = generate_corpus(2000, seed=3)
+    assert parser.classify_many(corpus) == [legacy_classify(parser, task) for task in corpus]
+
+def test_keyword_matcher_whole_words_and_inflections(parser):
+    scores = parser.matcher.score('Planning and scheduling, not a planet or a plane')
+    
+    assert scores['task_type']['planning'] == 2
+    assert 'domain' not in scores
@@ -0,0 +1,97 @@
+import os
+import json
+
+import pytest
+
+from config.agent_templates import AgentTemplateManager
+from config.template_registry import TemplateRegistry, normalize_term
+
+BUILTIN = {
+    'researcher': {
+        'role': 'Researcher', 'goal': 'Find facts', 'backstory': 'Curious',
+        'skills': ['market research', 'data_collection'], 'best_for': ['research']
+    },
+    'writer': {
+        'role': 'Writer', 'goal': 'Write', 'backstory': 'Wordy',
+        'skills': ['copywriting', 'research writing'], 'best_for': ['content']
+    }
+}
+
+def template(role, skills, best_for=()):
+    return {'role': role, 'goal': f'{role} goal', 'backstory': f'{role} backstory',
+            'skills': list(skills), 'best_for': list(best_for)}
+
+def write(path, data):
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(data, handle)
+
+def test_normalize_term():
+    assert normalize_term('Data_Collection') == 'data collection'
+    assert normalize_term('  machine--learning ') == 'machine learning'
+
+def test_file_templates_extend_and_override_builtins(tmp_path):
+    write(tmp_path / 'a.json', {'writer': template('Editor', ['editing'])})
+    (tmp_path / 'b.yaml').write_text(
+        '- type: lawyer\n  role: Lawyer\n  goal: Advise\n  backstory: Bar exam\n'
+        '  skills: [contract review]\n  best_for: [legal]\n'
+    )
+    
+    registry = TemplateRegistry(BUILTIN, [str(tmp_path)], reload_interval=0)
+    templates = registry.snapshot.templates
+    
+    assert templates['writer']['role'] == 'Editor'
+    assert templates['lawyer']['skills'] == ['contract review']
+    assert registry.best_for('Legal') == {'lawyer'}
+    assert registry.get_stats()['from_files'] == 2
+
+def test_invalid_file_is_skipped_with_a_warning(tmp_path, capsys):
+    write(tmp_path / 'bad.json', {'lawyer': {'role': 'Lawyer'}})
+    write(tmp_path / 'good.json', {'doctor': template('Doctor', ['diagnosis'])})
+    
+    registry = TemplateRegistry(BUILTIN, [str(tmp_path)], reload_interval=0)
+    
+    assert 'bad.json' in capsys.readouterr().out
+    assert 'lawyer' not in registry.snapshot.templates
+    assert 'doctor' in registry.snapshot.templates
+    assert registry.get_stats()['errors'] == 1
+
+def test_changed_files_are_reloaded(tmp_path):
+    path = tmp_path / 'agents.json'
+    write(path, {'doctor': template('Doctor', ['diagnosis'])})
+    registry = TemplateRegistry(BUILTIN, [str(tmp_path)], reload_interval=0)
+    reloads = []
+    registry.on_reload(lambda: reloads.append(True))
+    
+    assert registry.check_for_changes() is False
+    
+    write(path, {'doctor': template('Surgeon', ['surgery'])})
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 5))
+    
+    assert registry.check_for_changes() is True
+    assert registry.snapshot.templates['doctor']['role'] == 'Surgeon'
+    assert reloads == [True]
+
+def test_rank_by_skills_prefers_exact_matches():
+    registry = TemplateRegistry(BUILTIN, [], reload_interval=0)
+    
+    ranked = registry.rank_by_skills(['Market Research', 'data collection'], limit=2)
+    assert ranked[0] == ('researcher', 2.0, ['Market Research', 'data collection'])
+    # "research" is a word of one of the writer's skills
+    assert ranked[1] == ('writer', 0.5, ['Market Research'])
+    
+    assert registry.rank_by_skills(['market research'], limit=3, exclude=['researcher']) == [
+        ('writer', 0.5, ['market research'])
+    ]
+
+def test_agent_manager_suggests_file_templates_by_skill(tmp_path):
+    write(tmp_path / 'agents.json', {'lawyer': template('Lawyer', ['contract review'], ['legal'])})
+    manager = AgentTemplateManager(template_dirs=[str(tmp_path)])
+    
+    suggested = manager.suggest_agents({
+        'task_type': 'research', 'domain': 'general', 'key_skills_needed': ['contract review']
+    })
+    assert 'lawyer' in [agent['type'] for agent in suggested]
+    assert manager.get_template('lawyer')['role'] == 'Lawyer'
+    with pytest.raises(ValueError):
+        manager.get_template('astronaut')